@@ -0,0 +1,44 @@
+"""
+Cache configuration from a URL, so the backend is chosen in the environment (CACHE_URL).
+
+    redis://[:password@]host:6379/0   Redis, shared by every worker and host (rediss:// for TLS)
+    valkey://host:6379/0              Valkey, through the same Redis client (valkeys:// for TLS)
+    file:///var/tmp/littlelemon       A directory, shared by the workers of one host
+    locmem://                         The memory of each process, nothing is shared (the default)
+"""
+from urllib.parse import urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+REDIS_BACKEND = "django.core.cache.backends.redis.RedisCache"
+BACKENDS = {
+    "redis": REDIS_BACKEND,
+    "rediss": REDIS_BACKEND,
+    "valkey": REDIS_BACKEND,
+    "valkeys": REDIS_BACKEND,
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+def cache_from_url(url, key_prefix="", version=1, socket_timeout=None):
+    """Return a CACHES entry for url, its keys prefixed with key_prefix and versioned with version"""
+    parts = urlsplit(url or "locmem://")
+    if parts.scheme not in BACKENDS:
+        raise ImproperlyConfigured(f"Unsupported CACHE_URL scheme {parts.scheme!r}, use one of {', '.join(BACKENDS)}")
+    config = {"BACKEND": BACKENDS[parts.scheme], "KEY_PREFIX": key_prefix, "VERSION": version}
+    if config["BACKEND"] == REDIS_BACKEND:
+        config["LOCATION"] = parts._replace(scheme=parts.scheme.replace("valkey", "redis")).geturl()
+        if socket_timeout:
+            # Fail fast instead of hanging requests when the server is unreachable
+            config["OPTIONS"] = {"socket_timeout": socket_timeout, "socket_connect_timeout": socket_timeout}
+    elif parts.scheme == "file":
+        config["LOCATION"] = parts.path
+    else:
+        config["LOCATION"] = key_prefix
+    return config
+
+
+def is_shared(config):
+    """Whether every worker process sees the same cache"""
+    return config["BACKEND"] != BACKENDS["locmem"]
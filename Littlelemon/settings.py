@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 from datetime import timedelta
+from Littlelemon.caches import cache_from_url, is_shared
 
 # Load environment variables from .env file
 load_dotenv('.env.local')
@@ -58,11 +59,13 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",  # Needed by ROTATE_REFRESH_TOKENS/BLACKLIST_AFTER_ROTATION
     'drf_yasg',
     'Restaurant',
 ]
 
 MIDDLEWARE = [
+    'Restaurant.metrics.MetricsMiddleware',  # Outermost: times the whole request and counts its queries (/metrics)
     'django.middleware.security.SecurityMiddleware',  # First: Security-related middleware
     'django.contrib.sessions.middleware.SessionMiddleware',  # Second: Handle sessions (before authentication)
     'django.middleware.common.CommonMiddleware',  # Third: Common middleware (URL handling, etc.)
@@ -134,6 +137,30 @@ DATABASES = {
         }
     }
 
+# Database connections. DATABASE_CONN_MODE is one of:
+# - "pool": a psycopg connection pool in every process (PostgreSQL only, the default there). A Gunicorn worker
+#   needs at most one connection per thread, so the pool is sized from GUNICORN_THREADS unless set explicitly.
+# - "persistent": every thread keeps its connection for DATABASE_CONN_MAX_AGE seconds and checks it is alive
+#   before reusing it (the default for other databases). Not for uvicorn workers, use "pool" there.
+# - "none": a new connection per request.
+# /health/db/ shows the mode and the pool statistics of the answering worker.
+_postgresql = 'postgresql' in (DATABASES['default']['ENGINE'] or '')
+DATABASE_CONN_MODE = os.getenv('DATABASE_CONN_MODE', 'pool' if _postgresql else 'persistent')
+if DATABASE_CONN_MODE == 'pool' and _postgresql:
+    _pool_max_size = int(os.getenv('DATABASE_POOL_MAX_SIZE', 0)) or int(os.getenv('GUNICORN_THREADS', 4))
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            # psycopg_pool refuses a min_size above max_size, e.g. with GUNICORN_THREADS=1
+            'min_size': min(int(os.getenv('DATABASE_POOL_MIN_SIZE', 2)), _pool_max_size),
+            'max_size': _pool_max_size,
+            'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', 10)),  # Seconds to wait for a free connection
+            'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', 300)),  # Idle connections above min_size are closed
+        },
+    }
+elif DATABASE_CONN_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DATABASE_CONN_MAX_AGE', 60))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 # if ENVIRONMENT == 'development':
 #     DATABASES = {
 #         'default': {
@@ -210,6 +237,33 @@ CSRF_COOKIE_SAMESITE = 'Lax'
 SESSION_COOKIE_AGE = 3600  # 60 minutes (3600 seconds)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
+# Caches (Littlelemon/caches.py): CACHE_URL selects Redis/Valkey (redis://host:6379/0), a directory
+# (file:///var/tmp/littlelemon) or the memory of each process (locmem://, the default). With a shared cache the
+# DRF throttle counts, django-axes lockouts, sessions (cached_db), roles, pages and version counters are the
+# same in every worker and survive restarts. Keys are prefixed with CACHE_KEY_PREFIX; raising CACHE_VERSION
+# drops everything an older release cached.
+CACHES = {
+    'default': cache_from_url(
+        os.getenv('CACHE_URL', 'locmem://'),
+        key_prefix=os.getenv('CACHE_KEY_PREFIX', 'littlelemon'),
+        version=int(os.getenv('CACHE_VERSION', 1)),
+        socket_timeout=float(os.getenv('CACHE_SOCKET_TIMEOUT', 1)),
+    ),
+}
+SHARED_CACHE = is_shared(CACHES['default'])
+if CACHES['default']['BACKEND'].endswith('RedisCache'):
+    AXES_HANDLER = 'axes.handlers.cache.AxesCacheHandler'  # Failed logins counted in Redis (axes rejects file caches)
+
+# Session storage, SESSION_BACKEND is one of:
+# - "cached_db": read from the cache, written through to the database (the default with a shared cache)
+# - "cache": only in the cache, no query at all; sessions are lost when evicted or CACHE_VERSION changes,
+#   and with the per-process locmem cache every worker has its own sessions
+# - "signed_cookies": stored in the cookie itself, signed but readable by the client, nothing server side
+# - "db": a query on every request (the default without a shared cache)
+# Expired database sessions are deleted in batches by `python manage.py purge_sessions`.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.getenv('SESSION_BACKEND', 'cached_db' if SHARED_CACHE else 'db')
+SESSION_PURGE_BATCH_SIZE = int(os.getenv('SESSION_PURGE_BATCH_SIZE', 1000))
+
 # Rate Limiting Settings (Prevent Brute Force Attacks) 
 AXES_FAILURE_LIMIT = 5  # Block user after 1000 failed login attempts
 AXES_COOLOFF_TIME = 1  # Lockout time in hours (set 1 for 1 hour)
@@ -217,12 +271,29 @@ AXES_COOLOFF_TIME = 1  # Lockout time in hours (set 1 for 1 hour)
 
 # Secure Password Settings
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.Argon2PasswordHasher',  # Most secure option
+    'Restaurant.hashers.ConfigurableArgon2PasswordHasher',  # Most secure option, cost from the ARGON2_* settings
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',  # Fallback option
     'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',  # Another fallback
     'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',  # Optional backup
 ]
 
+# Argon2 cost of every hash: login, sign up and token requests pay it once (twice when rehashing). Defaults are
+# Django's; hashes made with other values are rehashed on the next login. `python manage.py calibrate_argon2
+# --target-ms 100` suggests values for this hardware. ARGON2_MEMORY_COST is in KiB.
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 102400))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 8))
+PASSWORD_HASH_TARGET_MS = int(os.getenv('PASSWORD_HASH_TARGET_MS', 100))  # Default target of calibrate_argon2
+# Serve the views that hash passwords from a dedicated pool of PASSWORD_HASH_THREADS threads (Restaurant/hashers.py),
+# bounding the memory of concurrent hashes. Off by default: under ASGI each request's sync views already get a
+# thread of their own, enable it only where the benchmark suite shows a gain
+PASSWORD_HASH_OFFLOAD = (os.getenv('PASSWORD_HASH_OFFLOAD', 'False') == "True")
+PASSWORD_HASH_THREADS = int(os.getenv('PASSWORD_HASH_THREADS', 4))
+
+# Route the menu page, /health/ and the booking branches and working_hours endpoints to the async views of
+# Restaurant/asyncviews.py. On by default under uvicorn workers only: under WSGI they would run with async_to_sync
+ASYNC_VIEWS = (os.getenv('ASYNC_VIEWS', 'True' if os.getenv('GUNICORN_WORKER_CLASS') == 'uvicorn' else 'False') == "True")
+
 
 
 
@@ -257,20 +328,37 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# API renderers (Restaurant/renderers.py): JSON is rendered with orjson. The browsable API ("api"), XML and CSV
+# renderers are opt-in: API_RENDERERS enables them on every endpoint (all of them while DEBUG, none by default
+# in production), and viewsets serving files add the formats they need (menu and booking: XML and CSV).
+OPTIONAL_RENDERERS = {
+    'api': 'rest_framework.renderers.BrowsableAPIRenderer',
+    'xml': 'rest_framework_xml.renderers.XMLRenderer',
+    'csv': 'rest_framework_csv.renderers.CSVRenderer',
+}
+API_RENDERERS = [name for name in os.getenv('API_RENDERERS', 'api,xml,csv' if DEBUG else '').split(',') if name]
+
+# API authentication, tried in the order of API_AUTHENTICATION (comma separated):
+# - "session": the site's session cookie (browsable API, the booking page)
+# - "jwt": JWT access tokens; the user is built from the token claims and only loaded from the database when a
+#   view needs more than its id, email and roles (Restaurant/authentication.py)
+# - "jwt_db": JWT access tokens, loading the user on every request (simplejwt's JWTAuthentication)
+# - "token": DRF tokens, a query joining authtoken_token to the user on every request. Nothing issues them, so
+#   they are off unless listed.
+# The first scheme decides how unauthenticated requests are refused: 403 for "session", 401 for the others.
+AUTHENTICATION_SCHEMES = {
+    'session': 'rest_framework.authentication.SessionAuthentication',
+    'jwt': 'Restaurant.authentication.ClaimsJWTAuthentication',
+    'jwt_db': 'rest_framework_simplejwt.authentication.JWTAuthentication',
+    'token': 'rest_framework.authentication.TokenAuthentication',
+}
+API_AUTHENTICATION = [name for name in os.getenv('API_AUTHENTICATION', 'session,jwt').split(',') if name]
+
 REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  
-    ],
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-        'rest_framework_xml.renderers.XMLRenderer',
-        'rest_framework_csv.renderers.CSVRenderer',
-    ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [AUTHENTICATION_SCHEMES[name] for name in API_AUTHENTICATION],
+    'DEFAULT_RENDERER_CLASSES': ['Restaurant.renderers.FastJSONRenderer'] + [OPTIONAL_RENDERERS[name] for name in API_RENDERERS],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'Restaurant.renderers.FastJSONParser',
         'rest_framework_xml.parsers.XMLParser',
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
@@ -293,6 +381,8 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
+    "TOKEN_OBTAIN_SERIALIZER": "Restaurant.serializers.RoleTokenObtainPairSerializer",  # Adds a "roles" claim
+    "TOKEN_REFRESH_SERIALIZER": "Restaurant.serializers.RoleTokenRefreshSerializer",
 }
 
 # Email settings
@@ -302,3 +392,79 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+
+# Booking availability engine
+# Each Gunicorn worker keeps its own in-memory occupancy index of booked tables per branch and date.
+# A loaded day is re-read from the database after this many seconds to pick up bookings made by other workers.
+AVAILABILITY_CACHE_SECONDS = int(os.getenv('AVAILABILITY_CACHE_SECONDS', 10))
+
+# Bookings of a branch on a date are committed one at a time. "row" locks a per-branch-per-date capacity row
+# (works on every database), "advisory" uses a PostgreSQL transaction advisory lock instead.
+BOOKING_LOCK_MODE = os.getenv('BOOKING_LOCK_MODE', 'row')
+
+# Branch registry: Restaurant rows are cached in each worker and reloaded after this many seconds.
+# Set BRANCH_REGISTRY_CACHE to a cache alias shared by all workers to invalidate every worker on change.
+BRANCH_REGISTRY_SECONDS = int(os.getenv('BRANCH_REGISTRY_SECONDS', 60))
+BRANCH_REGISTRY_CACHE = os.getenv('BRANCH_REGISTRY_CACHE') or ('default' if SHARED_CACHE else None)
+
+# Role resolution (Restaurant/roles.py): a user's group names are cached per user until their groups change.
+# Group changes made by another worker are only seen after ROLES_CACHE_SECONDS unless ROLES_CACHE is shared.
+# With ROLES_TRUST_TOKEN_CLAIM the "roles" claim of JWT access tokens is trusted, so JWT requests need no
+# group lookup, but a removed role stays in effect until the access token is refreshed or expires.
+ROLES_CACHE = os.getenv('ROLES_CACHE', 'default')
+ROLES_CACHE_SECONDS = int(os.getenv('ROLES_CACHE_SECONDS', 60))
+ROLES_TRUST_TOKEN_CLAIM = (os.getenv('ROLES_TRUST_TOKEN_CLAIM') == "True")
+
+# Public page cache (Restaurant/pagecache.py): anonymous responses of the home, about, menu and terms pages
+# are cached for PAGE_CACHE_SECONDS (0 disables it). The menu page is dropped as soon as a Menu changes.
+# Menu cards are cached as template fragments keyed by item and update time.
+PAGE_CACHE_SECONDS = int(os.getenv('PAGE_CACHE_SECONDS', 600))
+MENU_CARD_CACHE_SECONDS = int(os.getenv('MENU_CARD_CACHE_SECONDS', 86400))
+
+# API response cache (Restaurant/responsecache.py): rendered /api/menu list and detail responses are cached
+# for API_CACHE_SECONDS (0 disables it) and dropped as soon as a Menu changes.
+API_CACHE_SECONDS = int(os.getenv('API_CACHE_SECONDS', 600))
+
+# Outbound email (Restaurant/mailer.py): requests only queue messages, the mail worker
+# (python manage.py send_queued_mail --loop) sends them and retries failures with exponential backoff.
+MAIL_TRANSPORT = os.getenv('MAIL_TRANSPORT', 'Restaurant.mailer.MailgunTransport')  # Restaurant.mailer.LocmemTransport sends nothing
+MAILGUN_API_KEY = os.getenv('MAILGUN_API_KEY', 'MAILGUN_API_KEY')
+MAILGUN_DOMAIN = os.getenv('MAILGUN_DOMAIN', 'sandbox066e373697194dd1a51dcdde20c93dca.mailgun.org')
+MAIL_FROM = os.getenv('MAIL_FROM', f'Mailgun Sandbox <postmaster@{MAILGUN_DOMAIN}>')
+MAIL_TIMEOUT_SECONDS = float(os.getenv('MAIL_TIMEOUT_SECONDS', 10))
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 50))
+MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+MAIL_RETRY_BACKOFF_SECONDS = int(os.getenv('MAIL_RETRY_BACKOFF_SECONDS', 60))  # Doubled after every failed attempt
+MAIL_POLL_SECONDS = float(os.getenv('MAIL_POLL_SECONDS', 5))
+
+# Streaming exports (/api/booking/export, /api/menu/export): rows fetched from the database cursor and written per chunk
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Bulk imports (/api/menu/bulk, /api/booking/bulk): rows per request and rows per INSERT statement
+IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', 10000))
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+
+# Request metrics (Restaurant/metrics.py): wall time, database time, query count and repeated queries per view,
+# kept by each worker process and served at /metrics in the Prometheus text format to staff users and to
+# scrapers sending "Authorization: Bearer <METRICS_TOKEN>". Latency quantiles cover the last METRICS_WINDOW
+# requests of each view.
+METRICS_ENABLED = (os.getenv('METRICS_ENABLED', 'True') == "True")
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', 1000))
+
+# Queries allowed per request of a view. Over budget a warning is logged ("log"), or QueryBudgetExceeded raised
+# ("raise", as the tests in test_metrics.py do); "off" skips the check.
+QUERY_BUDGETS = {  # Cold caches: the first request also loads branches and roles
+    'BookingViewSet.create': 11,
+    'BookingViewSet.list': 3,
+    'MenuViewSet.list': 2,
+    'MenuViewSet.retrieve': 1,
+    'menu': 1,
+    'branches': 1,
+    'working_hours': 1,
+    'BookingViewSet.branches': 1,
+    'BookingViewSet.working_hours': 1,
+    'user_login': 12,
+    'TokenObtainPairView.post': 4,
+}
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log')
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Booking, Menu, CustomUser
+from .models import Booking, Menu, CustomUser, OutboundMessage
 from .forms import CustomUserCreationForm, CustomUserChangeForm
 
 class CustomUserAdmin(UserAdmin):
@@ -30,4 +30,5 @@ class CustomUserAdmin(UserAdmin):
 
 admin.site.register(Booking)
 admin.site.register(Menu)
+admin.site.register(OutboundMessage)
 admin.site.register(CustomUser, CustomUserAdmin)
@@ -0,0 +1,136 @@
+"""
+Async versions of the small, hot read-only endpoints, for the ASGI deployment.
+
+DRF views are synchronous, so under an ASGI server (GUNICORN_WORKER_CLASS=uvicorn)
+every DRF request is run in a thread by sync_to_async. The endpoints below are plain
+async Django views instead: the sync DRF machinery they keep (authentication,
+throttles) runs in a single sync_to_async call, and the branches are read through
+the branch registry's async loader. They behave like the DRF actions they replace:
+same URLs, format suffixes and URL names, same authentication classes and throttles,
+and a DRF Response negotiated over the booking renderers (JSON, XML, CSV).
+
+Restaurant/urls.py routes to them only with ASYNC_VIEWS=True (the default under
+uvicorn): under WSGI Django would run them with async_to_sync, a cost for nothing.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import render
+from rest_framework import exceptions, status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .models import Menu
+from .pagecache import MENU_VERSION, cache_public_page
+from .registry import branch_registry
+from .renderers import api_renderers
+
+
+def _authenticators():
+    return [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+def _renderers():
+    # The formats of the booking viewset, but not the browsable API, which needs a DRF view to render
+    return [renderer() for renderer in api_renderers("xml", "csv") if not issubclass(renderer, BrowsableAPIRenderer)]
+
+
+def check_request(drf_request):
+    """Authenticate and throttle a DRF Request like a DRF view would, raising its APIException"""
+    user = drf_request.user  # Authenticates with the sync ORM and cache
+    if drf_request.method not in ("GET", "HEAD"):
+        raise exceptions.MethodNotAllowed(drf_request.method)
+    if not user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    for throttle in (throttle_class() for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES):
+        if not throttle.allow_request(drf_request, None):
+            raise exceptions.Throttled(throttle.wait())
+
+
+def render_response(drf_request, data, status_code=status.HTTP_200_OK, headers=None, format_suffix=None):
+    """Return a rendered DRF Response in the format the client accepts"""
+    try:
+        renderer, media_type = DefaultContentNegotiation().select_renderer(drf_request, _renderers(), format_suffix)
+    except exceptions.NotAcceptable as exc:
+        renderer, media_type = _renderers()[0], None
+        data, status_code = {"detail": exc.detail}, exc.status_code
+    response = Response(data, status=status_code, headers=headers)
+    response.accepted_renderer = renderer
+    response.accepted_media_type = media_type or renderer.media_type
+    response.renderer_context = {"request": drf_request, "response": response}
+    return response.render()
+
+
+def async_api_view(view_func):
+    """Serve an async GET endpoint to authenticated users, with DRF authentication, throttling and errors"""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        format_suffix = kwargs.pop("format", None)
+        drf_request = Request(request, authenticators=_authenticators())
+        try:
+            await sync_to_async(check_request)(drf_request)
+            data, status_code = await view_func(drf_request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            headers = {}
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                # As in DRF: 401 only when the first authentication class can challenge the client
+                authenticate_header = drf_request.authenticators[0].authenticate_header(drf_request)
+                if authenticate_header:
+                    headers["WWW-Authenticate"] = authenticate_header
+                else:
+                    exc.status_code = status.HTTP_403_FORBIDDEN
+            if getattr(exc, "wait", None):
+                headers["Retry-After"] = str(int(exc.wait))
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            return render_response(drf_request, data, exc.status_code, headers, format_suffix)
+        return render_response(drf_request, data, status_code, format_suffix=format_suffix)
+    return wrapper
+
+
+async def health_check(request):
+    return JsonResponse({"status": "ok"})
+
+
+@cache_public_page(MENU_VERSION)
+async def menu(request):
+    """Menu page"""
+    # Fetch all menu items with the async ORM
+    menu_list = [item async for item in Menu.objects.all()]
+
+    # Prepare context for the template. Each menu card is cached as a fragment until the item changes
+    context = {
+        'menu_list': menu_list,
+        'menu_card_seconds': settings.MENU_CARD_CACHE_SECONDS,
+    }
+    # The page header reads request.user, which is loaded with the sync ORM
+    return await sync_to_async(render)(request, 'menu.html', context)
+
+
+@async_api_view
+async def branches(request):
+    """
+    Returns a list of restaurant branches.
+    """
+    return {"branches": list(await branch_registry.aall())}, status.HTTP_200_OK
+
+
+@async_api_view
+async def working_hours(request):
+    """
+    Returns the working hours of a specific branch.
+    """
+    branch = request.query_params.get("branch")
+    if not branch:
+        return {"error": "Branch parameter is required. e.g. /api/booking/working_hours?branch=Vellore"}, status.HTTP_400_BAD_REQUEST
+    restaurant = await branch_registry.aget(branch)
+    if restaurant is None:
+        return {"error": "Branch not found."}, status.HTTP_404_NOT_FOUND
+    return {
+        "opening_time": restaurant.opening_time.strftime("%H:%M"),
+        "closing_time": restaurant.closing_time.strftime("%H:%M"),
+    }, status.HTTP_200_OK
@@ -0,0 +1,98 @@
+"""
+JWT authentication without a user query per request.
+
+simplejwt's JWTAuthentication loads the CustomUser of every access token from the
+database. ClaimsJWTAuthentication returns a TokenClaimsUser instead: its pk, email
+and authentication state come from the token claims, and the CustomUser row is
+only loaded the first time a view reads anything else (first_name, is_staff,
+save(), ...). It is not a model instance: views assign request.user to foreign
+keys and filter on it through user_reference(), a CustomUser holding only the
+claims, so creating and listing bookings need no user query. Roles come from the
+"roles" claim or the roles cache by user id (roles.py), neither loads the user.
+
+Like any stateless token, the claims hold until the token expires: a user
+deactivated or deleted after it was issued is only rejected once a view loads
+the full user. Tokens checking a password hash (CHECK_REVOKE_TOKEN) load the
+user at once.
+"""
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils.functional import LazyObject, empty
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+EMAIL_CLAIM = "email"
+
+
+class TokenClaimsUser(LazyObject):
+    """The CustomUser of a validated access token, loaded from the database on first use of anything but its claims"""
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        super().__init__()
+        model = get_user_model()
+        pk = model._meta.pk.to_python(token[jwt_settings.USER_ID_CLAIM])
+        claims = {"pk": pk, model._meta.pk.attname: pk}
+        if EMAIL_CLAIM in token:
+            claims[model.get_email_field_name()] = token[EMAIL_CLAIM]
+        # Set on the instance dict, LazyObject.__setattr__ would load the user
+        self.__dict__["_claims"] = claims
+
+    def _setup(self):
+        model = get_user_model()
+        try:
+            user = model._default_manager.get(pk=self._claims["pk"])
+        except model.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        self._wrapped = user
+
+    def __getattr__(self, name):
+        claims = self.__dict__["_claims"]
+        if name in claims:
+            return claims[name]
+        if self._wrapped is empty and not hasattr(get_user_model(), name):
+            raise AttributeError(name)  # Not a field or method of the user model, no need to load it
+        return super().__getattr__(name)
+
+    def reference(self):
+        """
+        Return a CustomUser holding only the claims, to assign to foreign keys and filter on. Its other fields
+        are deferred: reading one is a query, without the checks of _setup. The loaded user once there is one.
+        """
+        if self._wrapped is not empty:
+            return self._wrapped
+        model = get_user_model()
+        names = [field.attname for field in model._meta.concrete_fields if field.attname in self._claims]
+        return model.from_db(router.db_for_read(model), names, [self._claims[name] for name in names])
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if not isinstance(other, (get_user_model(), TokenClaimsUser)):
+            return NotImplemented
+        return other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+def user_reference(user):
+    """Return request.user as a model instance for foreign keys and filters, without loading a TokenClaimsUser"""
+    return user.reference() if isinstance(user, TokenClaimsUser) else user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user is built from the token claims, see TokenClaimsUser"""
+
+    def get_user(self, validated_token):
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return TokenClaimsUser(validated_token)
@@ -0,0 +1,228 @@
+"""
+Availability engine for table bookings.
+
+For every (branch, booking_date) that has been asked about, the engine keeps an
+in-memory occupancy index of the BOOKED bookings of that day. Each booking holds
+one table over the half-open interval [start_time, end_time), so the number of
+tables in use during a window is the peak of overlapping bookings in it.
+
+The index is a segment tree over the minutes of the day, so adding, removing and
+querying a booking costs O(log 1440) regardless of how many bookings the day has.
+A day is loaded lazily with a single query and afterwards kept up to date by the
+Booking signal handlers in signals.py.
+"""
+import threading
+from datetime import time
+from time import monotonic
+
+from django.conf import settings
+
+from .models import Booking
+
+MINUTES_PER_DAY = 24 * 60
+SLOT_MINUTES = 30  # Bookings start on a 30 minute grid
+
+
+def to_minutes(value, round_up=False):
+    """Convert a time to minutes since midnight. Seconds are rounded down unless round_up is set."""
+    minutes = value.hour * 60 + value.minute
+    if round_up and (value.second or value.microsecond):
+        minutes += 1
+    return minutes
+
+
+def from_minutes(minutes):
+    """Convert minutes since midnight back to a time"""
+    return time(minutes // 60, minutes % 60)
+
+
+class OccupancyTree:
+    """
+    Segment tree over the minutes of a day with range add and range max.
+    The pending add of a node is kept on the node itself, so nothing is pushed down.
+    """
+
+    def __init__(self, size=MINUTES_PER_DAY):
+        self.size = size
+        self._max = [0] * (4 * size)
+        self._add = [0] * (4 * size)
+
+    def add(self, start, end, delta=1):
+        """Add delta to every minute in [start, end)"""
+        if start < end:
+            self._update(1, 0, self.size, start, end, delta)
+
+    def peak(self, start, end):
+        """Return the highest value of any minute in [start, end)"""
+        if start >= end:
+            return 0
+        return self._query(1, 0, self.size, start, end)
+
+    def _update(self, node, lo, hi, start, end, delta):
+        if start <= lo and hi <= end:
+            self._max[node] += delta
+            self._add[node] += delta
+            return
+        mid = (lo + hi) // 2
+        if start < mid:
+            self._update(2 * node, lo, mid, start, end, delta)
+        if end > mid:
+            self._update(2 * node + 1, mid, hi, start, end, delta)
+        self._max[node] = self._add[node] + max(self._max[2 * node], self._max[2 * node + 1])
+
+    def _query(self, node, lo, hi, start, end):
+        if start <= lo and hi <= end:
+            return self._max[node]
+        mid = (lo + hi) // 2
+        best = 0
+        if start < mid:
+            best = self._query(2 * node, lo, mid, start, end)
+        if end > mid:
+            best = max(best, self._query(2 * node + 1, mid, hi, start, end))
+        return best + self._add[node]
+
+
+class DayOccupancy:
+    """Occupied tables of one branch on one date"""
+
+    def __init__(self):
+        self.tree = OccupancyTree()
+        self.intervals = {}  # booking pk -> (start minute, end minute)
+        self.loaded_at = monotonic()
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, pk, start_time, end_time):
+        """Occupy a table for the booking. Re-adding a booking moves it."""
+        self.remove(pk)
+        interval = (to_minutes(start_time), to_minutes(end_time, round_up=True))
+        self.intervals[pk] = interval
+        self.tree.add(*interval)
+
+    def remove(self, pk):
+        """Release the table held by the booking, if any"""
+        interval = self.intervals.pop(pk, None)
+        if interval is not None:
+            self.tree.add(*interval, delta=-1)
+
+    def peak(self, start_time, end_time):
+        """Return the peak number of tables in use between start_time and end_time"""
+        return self.tree.peak(to_minutes(start_time), to_minutes(end_time, round_up=True))
+
+    def slots(self, opening_time, closing_time, duration, capacity, step=SLOT_MINUTES):
+        """Return (start_time, end_time, free tables) for every start slot of `duration` minutes within working hours"""
+        first, last = to_minutes(opening_time), to_minutes(closing_time) - duration
+        return [
+            (from_minutes(start), from_minutes(start + duration), max(0, capacity - self.tree.peak(start, start + duration)))
+            for start in range(first, last + 1, step)
+        ]
+
+
+class AvailabilityEngine:
+    """
+    Process-local registry of DayOccupancy indexes.
+
+    Writes made by other processes are only seen by the signal handlers of the
+    process that made them, so a loaded day is reloaded once it is older than
+    settings.AVAILABILITY_CACHE_SECONDS.
+
+    Days are read from the database outside the lock, so a slow load only holds
+    up the requests for that day. A day loaded while this process changed a
+    booking may miss the change; it answers the request that loaded it but is
+    not kept.
+    """
+
+    def __init__(self):
+        self._days = {}  # (branch, booking_date) -> DayOccupancy
+        self._bookings = {}  # booking pk -> (branch, booking_date)
+        self._changes = 0  # Bumped by every track, forget and invalidate
+        self._lock = threading.RLock()
+
+    @property
+    def max_age(self):
+        return getattr(settings, "AVAILABILITY_CACHE_SECONDS", 10)
+
+    def day(self, branch, booking_date):
+        """Return the occupancy of the branch on booking_date, loading it if needed"""
+        key = (branch, booking_date)
+        with self._lock:
+            occupancy = self._days.get(key)
+            if occupancy is not None and monotonic() - occupancy.loaded_at < self.max_age:
+                return occupancy
+            changes = self._changes
+        occupancy = load_day(branch, booking_date)
+        with self._lock:
+            if self._changes != changes:
+                return occupancy  # A booking changed during the load, don't keep what may have missed it
+            self._drop(key)
+            self._days[key] = occupancy
+            for pk in occupancy.intervals:
+                self._bookings[pk] = key
+            return occupancy
+
+    def peak(self, branch, booking_date, start_time, end_time):
+        """Return the peak number of booked tables of the branch in the given window"""
+        occupancy = self.day(branch, booking_date)
+        with self._lock:
+            return occupancy.peak(start_time, end_time)
+
+    def slots(self, branch, booking_date, opening_time, closing_time, duration, capacity):
+        """Return the free-table grid of the branch on booking_date"""
+        occupancy = self.day(branch, booking_date)
+        with self._lock:
+            return occupancy.slots(opening_time, closing_time, duration, capacity)
+
+    def track(self, pk, branch, booking_date, start_time, end_time, status):
+        """Apply a created or updated booking to the loaded days"""
+        with self._lock:
+            self.forget(pk)
+            self._changes += 1
+            key = (branch, booking_date)
+            occupancy = self._days.get(key)
+            if occupancy is not None and status == Booking.Status.BOOKED:
+                occupancy.add(pk, start_time, end_time)
+                self._bookings[pk] = key
+
+    def forget(self, pk):
+        """Remove a booking from whichever loaded day holds it"""
+        with self._lock:
+            self._changes += 1
+            key = self._bookings.pop(pk, None)
+            if key is not None and key in self._days:
+                self._days[key].remove(pk)
+
+    def invalidate(self, branch, booking_date):
+        """Drop a day so it is reloaded from the database on next use"""
+        with self._lock:
+            self._changes += 1
+            self._drop((branch, booking_date))
+
+    def clear(self):
+        """Drop every loaded day"""
+        with self._lock:
+            self._days.clear()
+            self._bookings.clear()
+
+    def _drop(self, key):
+        occupancy = self._days.pop(key, None)
+        if occupancy is not None:
+            for pk in occupancy.intervals:
+                self._bookings.pop(pk, None)
+
+
+def load_day(branch, booking_date, start_time=None, end_time=None):
+    """
+    Read the BOOKED bookings of the branch on booking_date from the database into a DayOccupancy.
+    With a window only the bookings overlapping it are read, which is enough to get its peak.
+    """
+    bookings = Booking.objects.filter(branch=branch, booking_date=booking_date, status=Booking.Status.BOOKED)
+    if start_time is not None and end_time is not None:
+        bookings = bookings.filter(start_time__lt=end_time, end_time__gt=start_time)
+    occupancy = DayOccupancy()
+    for pk, booking_start, booking_end in bookings.values_list("pk", "start_time", "end_time"):
+        occupancy.add(pk, booking_start, booking_end)
+    return occupancy
+
+
+availability_engine = AvailabilityEngine()
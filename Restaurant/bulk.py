@@ -0,0 +1,162 @@
+"""
+Bulk import of menu items and bookings.
+
+POST /api/menu/bulk and /api/booking/bulk take a JSON array, a CSV file or an XML
+list of rows. Every row is validated on its own against lookups loaded once for
+the whole request (branches and working hours, users by email, existing
+bookings), so validation runs no query per row. Valid rows are written with
+bulk_create in batches of IMPORT_BATCH_SIZE and invalid ones are reported by row
+number without aborting the rest.
+
+Menu items are upserted on their unique title. Bookings are created as given
+(status BOOKED unless the row says otherwise). BOOKED rows go through the same
+capacity rule as single bookings: each branch-day is locked with
+lock_branch_day and its bookings loaded once, and a row that would take a
+table past the branch's capacity is reported as an error instead of created.
+
+bulk_create sends no post_save signals, so the caches the signals keep in step
+(menu pages and API responses, the availability engine) are invalidated here.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from .availability import availability_engine, load_day
+from .cache import bump_version
+from .models import Booking, CustomUser, Menu
+from .pagecache import MENU_VERSION
+from .registry import branch_registry
+from .utils import BUFFER_TABLES, lock_branch_day
+
+
+class MenuImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Menu
+        fields = ["title", "description", "category", "price", "inventory", "image_filename"]
+        extra_kwargs = {"title": {"validators": []}}  # An existing title is updated, not rejected
+
+
+class BookingImportSerializer(serializers.ModelSerializer):
+    user = serializers.EmailField(required=False, help_text="Email of the booking's user, the importing user by default")
+
+    class Meta:
+        model = Booking
+        fields = ["user", "branch", "name", "phone", "no_of_guests", "booking_date", "start_time", "end_time", "message", "status"]
+        extra_kwargs = {"branch": {"required": True}, "status": {"default": Booking.Status.BOOKED}}
+
+    def validate(self, attrs):
+        restaurant = self.context["branches"].get(attrs["branch"])
+        if restaurant is None:
+            raise serializers.ValidationError({"branch": "Invalid branch."})
+        if not restaurant.opening_time <= attrs["start_time"] < attrs["end_time"] <= restaurant.closing_time:
+            raise serializers.ValidationError(
+                f"Booking must start before it ends, within working hours {restaurant.opening_time} - {restaurant.closing_time}."
+            )
+
+        email = attrs.get("user")
+        user = self.context["users"].get(email) if email else self.context["default_user"]
+        if user is None:
+            raise serializers.ValidationError({"user": f"No user with email {email}."})
+        attrs["user"] = user
+
+        slot = (user.pk, attrs["booking_date"], attrs["start_time"], attrs["end_time"])
+        if slot in self.context["booked_slots"]:
+            raise serializers.ValidationError("This user already has a booking for this time slot.")
+        self.context["booked_slots"].add(slot)  # Also catches duplicates within the import
+        return attrs
+
+
+def get_rows(data):
+    """Return the rows of a request body, without blank values, or raise ValidationError"""
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise serializers.ValidationError("Expected a list of rows.")
+    if len(data) > settings.IMPORT_MAX_ROWS:
+        raise serializers.ValidationError(f"At most {settings.IMPORT_MAX_ROWS} rows can be imported at once.")
+    # CSV and XML give "" for empty cells, which should mean "not given"
+    return [{key: value for key, value in row.items() if value not in ("", None)} for row in data]
+
+
+def validate_rows(rows, serializer_class, context=None):
+    """Return ((row number, validated attrs) of the valid rows, errors of the others)"""
+    valid, errors = [], []
+    for number, row in enumerate(rows, 1):
+        serializer = serializer_class(data=row, context=context or {})
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({"row": number, "errors": serializer.errors})
+    return valid, errors
+
+
+def import_menu(data):
+    """Upsert menu items on title and return a summary"""
+    rows = get_rows(data)
+    valid, errors = validate_rows(rows, MenuImportSerializer)
+    items = {attrs["title"]: attrs for _, attrs in valid}  # The last row of a repeated title wins
+    existing = set(Menu.objects.filter(title__in=items).values_list("title", flat=True))
+    with transaction.atomic():
+        Menu.objects.bulk_create(
+            [Menu(**attrs) for attrs in items.values()],
+            batch_size=settings.IMPORT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["title"],
+            update_fields=[name for name in MenuImportSerializer.Meta.fields if name != "title"] + ["updated_at"],
+        )
+        bump_version(MENU_VERSION)
+        transaction.on_commit(lambda: bump_version(MENU_VERSION))
+    return {"created": len(items) - len(existing), "updated": len(existing), "errors": errors}
+
+
+def import_bookings(data, user):
+    """Create bookings, by default for user, and return a summary"""
+    rows = get_rows(data)
+    emails = {row["user"] for row in rows if isinstance(row.get("user"), str)}
+    users = {account.email: account for account in CustomUser.objects.filter(email__in=emails)}
+    users[user.email] = user
+    dates = set()
+    for row in rows:
+        try:
+            dates.add(datetime.strptime(str(row.get("booking_date")), "%Y-%m-%d").date())
+        except ValueError:
+            pass  # Reported by the serializer
+    booked_slots = set(
+        Booking.objects.filter(user__in=users.values(), booking_date__in=dates)
+        .values_list("user_id", "booking_date", "start_time", "end_time")
+    )
+    context = {"branches": branch_registry.all(), "users": users, "default_user": user, "booked_slots": booked_slots}
+    valid, errors = validate_rows(rows, BookingImportSerializer, context)
+
+    days = {}
+    for number, attrs in valid:
+        days.setdefault((attrs["branch"], attrs["booking_date"]), []).append((number, attrs))
+    with transaction.atomic():
+        created = []
+        for key in sorted(days):  # Always locked in the same order, so two imports cannot deadlock
+            lock_branch_day(*key)
+            created += check_capacity(*key, days[key], context["branches"][key[0]], errors)
+        Booking.objects.bulk_create([Booking(**attrs) for attrs in created], batch_size=settings.IMPORT_BATCH_SIZE)
+        for key in days:
+            availability_engine.invalidate(*key)
+            transaction.on_commit(lambda key=key: availability_engine.invalidate(*key))
+    errors.sort(key=lambda error: error["row"])
+    return {"created": len(created), "updated": 0, "errors": errors}
+
+
+def check_capacity(branch, booking_date, rows, restaurant, errors):
+    """
+    Return the attrs of the (row number, attrs) rows of one locked branch-day that fit in its capacity.
+    The others are added to errors.
+    """
+    occupancy = load_day(branch, booking_date)
+    capacity = restaurant.no_of_tables - BUFFER_TABLES
+    accepted = []
+    for number, attrs in rows:
+        if attrs["status"] == Booking.Status.BOOKED:
+            if occupancy.peak(attrs["start_time"], attrs["end_time"]) >= capacity:
+                errors.append({"row": number, "errors": {"non_field_errors": ["No table is free for this time slot."]}})
+                continue
+            occupancy.add(("import", number), attrs["start_time"], attrs["end_time"])
+        accepted.append(attrs)
+    return accepted
@@ -0,0 +1,46 @@
+"""
+Version counters kept in Django's cache framework.
+
+Cached data is tagged with the version of what it was built from. Bumping the
+version makes every process drop its copy on next use, without having to know
+the individual cache keys.
+"""
+from time import time_ns
+
+from django.core.cache import caches
+
+
+def _version_key(name):
+    return f"version:{name}"
+
+
+def get_version(name, alias="default"):
+    """Return the current version of name"""
+    cache = caches[alias]
+    version = cache.get(_version_key(name))
+    if version is None:
+        # A fresh start value, so a counter evicted from the cache never repeats an old version
+        cache.add(_version_key(name), time_ns(), timeout=None)
+        version = cache.get(_version_key(name))
+    return version
+
+
+async def aget_version(name, alias="default"):
+    """get_version() for async code, through the cache's async API"""
+    cache = caches[alias]
+    version = await cache.aget(_version_key(name))
+    if version is None:
+        await cache.aadd(_version_key(name), time_ns(), timeout=None)
+        version = await cache.aget(_version_key(name))
+    return version
+
+
+def bump_version(name, alias="default"):
+    """Invalidate everything tagged with the current version of name and return the new version"""
+    cache = caches[alias]
+    try:
+        return cache.incr(_version_key(name))
+    except ValueError:
+        version = time_ns()
+        cache.set(_version_key(name), version, timeout=None)
+        return version
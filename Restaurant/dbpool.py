@@ -0,0 +1,25 @@
+"""
+Database connection statistics for monitoring.
+
+Connection pools (settings.DATABASE_CONN_MODE = "pool") live in each worker
+process, so the numbers describe the process that answers; poll /health/db/
+repeatedly or scrape every worker to see all of them.
+"""
+import os
+
+from django.conf import settings
+from django.db import connections
+
+
+def connection_stats():
+    """Return the connection mode of every database and, when pooled, psycopg_pool's statistics"""
+    databases = {}
+    for connection in connections.all():
+        pool = getattr(connection, "pool", None)  # Only PostgreSQL connections with OPTIONS["pool"] have one
+        databases[connection.alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "pool": pool.get_stats() if pool is not None else None,
+        }
+    return {"pid": os.getpid(), "mode": settings.DATABASE_CONN_MODE, "databases": databases}
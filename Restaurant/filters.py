@@ -0,0 +1,73 @@
+"""
+Server-side filtering and search of the booking list.
+
+BookingFilterBackend narrows /api/booking by date range, status and branch and
+searches name, phone and the user's email. Every term of ?search= must match one
+of those fields (case-insensitive substring, like DRF's SearchFilter).
+
+On PostgreSQL the substring search is answered from trigram GIN indexes on
+UPPER(column), the expression Django compares for icontains. They are created
+by migration 0007_booking_search_trigram_indexes because they need the pg_trgm
+extension and cannot be declared portably in Meta.indexes.
+"""
+from datetime import date
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from .models import Booking, CustomUser
+
+class BookingFilterBackend(BaseFilterBackend):
+    """Filter bookings with ?date_from, ?date_to, ?status (comma separated), ?branch and ?search"""
+    search_param = api_settings.SEARCH_PARAM
+
+    def parse_date(self, request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({param: "Must be a valid date. Format: YYYY-MM-DD"})
+
+    def filter_queryset(self, request, queryset, view):
+        date_from = self.parse_date(request, "date_from")
+        if date_from:
+            queryset = queryset.filter(booking_date__gte=date_from)
+        date_to = self.parse_date(request, "date_to")
+        if date_to:
+            queryset = queryset.filter(booking_date__lte=date_to)
+
+        statuses = [status for status in request.query_params.get("status", "").upper().split(",") if status]
+        if statuses:
+            invalid = set(statuses) - set(Booking.Status.values)
+            if invalid:
+                raise ValidationError({"status": f"Invalid status {', '.join(sorted(invalid))}. Choices: {', '.join(Booking.Status.values)}"})
+            queryset = queryset.filter(status__in=statuses)
+
+        branch = request.query_params.get("branch")
+        if branch:
+            queryset = queryset.filter(branch=branch)
+
+        for term in request.query_params.get(self.search_param, "").replace(",", " ").split():
+            # The email match is a subquery so every condition stays on the booking table and can use its index
+            users = CustomUser.objects.filter(email__icontains=term).values("pk")
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(phone__icontains=term) | Q(user__in=users)
+            )
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            ("date_from", "Bookings on or after this date (YYYY-MM-DD)."),
+            ("date_to", "Bookings on or before this date (YYYY-MM-DD)."),
+            ("status", f"Comma separated statuses: {', '.join(Booking.Status.values)}."),
+            ("branch", "Branch name."),
+            (self.search_param, "Search name, phone and email."),
+        ]
+        return [
+            {"name": name, "required": False, "in": "query", "description": description, "schema": {"type": "string"}}
+            for name, description in parameters
+        ]
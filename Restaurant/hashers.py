@@ -0,0 +1,123 @@
+"""
+Password hashing cost, set per deployment.
+
+ConfigurableArgon2PasswordHasher reads its time cost, memory cost (KiB) and
+parallelism from the ARGON2_* settings. The parameters are stored in every
+hash, so after they change Django's must_update rehashes each password with the
+new ones the next time its user logs in (ModelBackend and the token endpoint
+both go through check_password). `python manage.py calibrate_argon2` measures
+the hardware and suggests the parameters for a target time per hash.
+
+Under WSGI every gthread worker thread hashes on its own. Under ASGI Django runs
+each request in its own ThreadSensitiveContext, so the sync views of concurrent
+requests, logins included, already run in separate threads of asgiref's executor.
+With PASSWORD_HASH_OFFLOAD, offload_hashing runs the views that hash (login, sign
+up, token) in a dedicated pool of PASSWORD_HASH_THREADS threads instead, which
+caps the memory of concurrent hashes to PASSWORD_HASH_THREADS x ARGON2_MEMORY_COST
+and leaves the executor's threads to the other sync views. It is off by default:
+turn it on only if a run of the benchmark suite under uvicorn shows a gain, e.g.
+
+    python -m benchmarks.suite run --gunicorn uvicorn:2 --output shared.json
+    PASSWORD_HASH_OFFLOAD=True python -m benchmarks.suite run --gunicorn uvicorn:2 --output offload.json
+    python -m benchmarks.suite compare shared.json offload.json --threshold login=25 token_obtain=25
+"""
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.db import close_old_connections
+
+MIN_MEMORY_COST = 19456  # KiB, the OWASP minimum for Argon2id with a time cost of 2
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2PasswordHasher with the ARGON2_TIME_COST, ARGON2_MEMORY_COST and ARGON2_PARALLELISM settings"""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+def time_hash(time_cost, memory_cost, parallelism, samples=5):
+    """Return the median milliseconds of hashing a password with these parameters"""
+    hasher = Argon2PasswordHasher()
+    hasher.time_cost, hasher.memory_cost, hasher.parallelism = time_cost, memory_cost, parallelism
+    durations = []
+    for _ in range(samples):
+        started = perf_counter()
+        hasher.encode("calibration-password", hasher.salt())
+        durations.append((perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def calibrate(target_ms, memory_cost, parallelism, samples=5, max_time_cost=50):
+    """
+    Return (time_cost, memory_cost, ms, trials) for the slowest hash within target_ms.
+
+    The time cost is raised from 1 while the hash stays within the target. If even a time cost of 1 is too
+    slow the memory cost is halved, down to MIN_MEMORY_COST. trials lists every (time_cost, memory_cost, ms).
+    """
+    trials = []
+
+    def trial(time_cost, memory):
+        ms = time_hash(time_cost, memory, parallelism, samples)
+        trials.append((time_cost, memory, ms))
+        return ms
+
+    ms = trial(1, memory_cost)
+    while ms > target_ms and memory_cost > MIN_MEMORY_COST:
+        memory_cost = max(MIN_MEMORY_COST, memory_cost // 2)
+        ms = trial(1, memory_cost)
+    time_cost = 1
+    while time_cost < max_time_cost:
+        slower = trial(time_cost + 1, memory_cost)
+        if slower > target_ms:
+            break
+        time_cost, ms = time_cost + 1, slower
+    return time_cost, memory_cost, ms, trials
+
+
+_executor = None
+
+
+def hash_executor():
+    """Return the thread pool of offloaded views, started on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.PASSWORD_HASH_THREADS, thread_name_prefix="password-hash")
+    return _executor
+
+
+def offload_hashing(view):
+    """
+    Serve a sync view that hashes passwords from the hash_executor pool, with PASSWORD_HASH_OFFLOAD.
+    Without it the view is returned as is.
+    """
+    if not settings.PASSWORD_HASH_OFFLOAD:
+        return view
+
+    def run(request, *args, **kwargs):
+        # The pool threads keep their own connections, expire them like the request signals do
+        close_old_connections()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    @wraps(view)  # Keeps csrf_exempt and the view class read by the metrics
+    async def offloaded(request, *args, **kwargs):
+        return await sync_to_async(run, thread_sensitive=False, executor=hash_executor())(request, *args, **kwargs)
+
+    return offloaded
@@ -0,0 +1,127 @@
+"""
+Outbound email pipeline.
+
+Request handlers call enqueue_email(), which only inserts an OutboundMessage row,
+so sending mail adds one INSERT to the request instead of a round-trip to the
+mail provider. The send_queued_mail management command, run as a separate worker,
+delivers due messages in batches through the transport named by
+settings.MAIL_TRANSPORT and retries failures with exponential backoff.
+
+A transport has send(message), which raises MailError or a requests exception
+when the message was not accepted, and close().
+"""
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboundMessage
+
+
+class MailError(Exception):
+    """The mail provider did not accept a message"""
+
+
+class MailgunTransport:
+    """Send messages through the Mailgun HTTP API, reusing one pooled session"""
+
+    def __init__(self):
+        self.url = f"https://api.mailgun.net/v3/{settings.MAILGUN_DOMAIN}/messages"
+        self.session = requests.Session()
+        self.session.auth = ("api", settings.MAILGUN_API_KEY)
+
+    def send(self, message):
+        response = self.session.post(
+            self.url,
+            data={"from": settings.MAIL_FROM, "to": message.to_email, "subject": message.subject, "text": message.body},
+            timeout=settings.MAIL_TIMEOUT_SECONDS,
+        )
+        if response.status_code >= 400:
+            raise MailError(f"Mailgun returned {response.status_code}: {response.text[:200]}")
+
+    def close(self):
+        self.session.close()
+
+
+class LocmemTransport:
+    """Keep sent messages in LocmemTransport.outbox instead of sending them, for tests and local development"""
+    outbox = []
+
+    def send(self, message):
+        self.outbox.append(message)
+
+    def close(self):
+        pass
+
+
+def get_transport():
+    """Return an instance of the transport named by settings.MAIL_TRANSPORT"""
+    return import_string(settings.MAIL_TRANSPORT)()
+
+
+def enqueue_email(subject, message, to_email):
+    """Queue an email for the send_queued_mail worker and return its OutboundMessage"""
+    return OutboundMessage.objects.create(subject=subject, body=message, to_email=to_email)
+
+
+def retry_delay(attempts):
+    """Delay before the next attempt after the given number of failed attempts"""
+    return timedelta(seconds=settings.MAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+
+def claim_batch(batch_size):
+    """
+    Return up to batch_size due messages and push their next attempt past the time it takes to
+    send them, so concurrent workers skip them and a crashed worker's batch is retried later.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboundMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundMessage.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        lease = timedelta(seconds=settings.MAIL_TIMEOUT_SECONDS * (len(messages) + 1))
+        OutboundMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+            attempts=F("attempts") + 1, next_attempt_at=now + lease
+        )
+    for message in messages:
+        message.attempts += 1
+    return messages
+
+
+def send_batch(transport, batch_size):
+    """Send one batch of due messages and return (number sent, number failed)"""
+    sent = failed = 0
+    for message in claim_batch(batch_size):
+        try:
+            transport.send(message)
+        except (MailError, requests.RequestException) as error:
+            failed += 1
+            message.last_error = str(error)
+            if message.attempts >= settings.MAIL_MAX_ATTEMPTS:
+                message.status = OutboundMessage.Status.FAILED
+            else:
+                message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+        else:
+            sent += 1
+            message.status = OutboundMessage.Status.SENT
+            message.sent_at = timezone.now()
+            message.last_error = ""
+        message.save(update_fields=["status", "next_attempt_at", "last_error", "sent_at"])
+    return sent, failed
+
+
+def send_queued_mail(transport, batch_size):
+    """Send due messages until none are left and return (number sent, number failed)"""
+    sent = failed = 0
+    while True:
+        batch_sent, batch_failed = send_batch(transport, batch_size)
+        sent += batch_sent
+        failed += batch_failed
+        if batch_sent + batch_failed < batch_size:
+            return sent, failed
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from Restaurant.hashers import MIN_MEMORY_COST, calibrate
+
+
+class Command(BaseCommand):
+    help = ("Measure Argon2 on this machine and suggest the ARGON2_* settings for a target time per hash. "
+            "Run it on the production hardware, with the server idle.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS)
+        parser.add_argument("--memory-cost", type=int, default=settings.ARGON2_MEMORY_COST,
+                            help=f"KiB, halved down to {MIN_MEMORY_COST} if too slow")
+        parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM)
+        parser.add_argument("--samples", type=int, default=5, help="Hashes timed per trial, the median is used")
+
+    def handle(self, *args, **options):
+        time_cost, memory_cost, ms, trials = calibrate(
+            options["target_ms"], options["memory_cost"], options["parallelism"], options["samples"])
+        for trial_time_cost, trial_memory_cost, trial_ms in trials:
+            self.stdout.write(f"time_cost={trial_time_cost} memory_cost={trial_memory_cost}: {trial_ms:.1f} ms")
+        if ms > options["target_ms"]:
+            self.stdout.write(self.style.WARNING(
+                f"The cheapest parameters take {ms:.1f} ms, over the {options['target_ms']:g} ms target"))
+        current = (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+        if current != (time_cost, memory_cost, options["parallelism"]):
+            self.stdout.write("Existing hashes are rehashed on their users' next login after changing the settings.")
+        self.stdout.write(self.style.SUCCESS(f"{ms:.1f} ms per hash with:"))
+        self.stdout.write(f"ARGON2_TIME_COST={time_cost}\nARGON2_MEMORY_COST={memory_cost}\nARGON2_PARALLELISM={options['parallelism']}")
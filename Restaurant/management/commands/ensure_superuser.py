@@ -0,0 +1,33 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError
+
+DEFAULT_EMAIL = "admin@django.com"
+DEFAULT_PASSWORD = "admin"
+
+
+class Command(BaseCommand):
+    help = ("Create the superuser DJANGO_SUPERUSER_EMAIL with DJANGO_SUPERUSER_PASSWORD unless it exists. "
+            "Safe to run on every deploy: an existing user, and its password, are left as they are.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", default=os.getenv("DJANGO_SUPERUSER_EMAIL", DEFAULT_EMAIL))
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        email = options["email"]
+        if User._default_manager.filter(email=email).exists():  # No password hashed on the usual run
+            self.stdout.write(f"Superuser {email} already exists")
+            return
+        password = os.getenv("DJANGO_SUPERUSER_PASSWORD")
+        if not password:
+            password = DEFAULT_PASSWORD
+            self.stdout.write(self.style.WARNING(f"DJANGO_SUPERUSER_PASSWORD is not set, {email} gets the default password"))
+        try:
+            User._default_manager.create_superuser(email=email, password=password)
+        except IntegrityError:  # Created by another replica since the check
+            self.stdout.write(f"Superuser {email} already exists")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Created superuser {email}"))
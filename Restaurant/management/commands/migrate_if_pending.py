@@ -0,0 +1,58 @@
+import sys
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+MIGRATION_LOCK_ID = 7_423_101  # Key of the PostgreSQL advisory lock, the same in every replica
+
+
+def pending_migrations(connection):
+    """Return the (migration, backwards) plan that would bring the database to the latest migrations"""
+    executor = MigrationExecutor(connection)
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+@contextmanager
+def migration_lock(connection):
+    """Hold a session advisory lock on PostgreSQL, so one replica migrates while the others wait. A no-op elsewhere."""
+    if connection.vendor != "postgresql":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+
+class Command(BaseCommand):
+    help = ("Apply the unapplied migrations, if any, under a database lock so replicas starting together don't race. "
+            "Run by the migrate service of docker-compose.yml, or by entrypoint.prod.sh with MIGRATE_ON_START=True.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--check", action="store_true", help="Apply nothing, exit with status 1 if migrations are pending")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        plan = pending_migrations(connection)  # Checked before queuing for the lock, the usual answer is none
+        if options["check"]:
+            for migration, _ in plan:
+                self.stdout.write(f"Pending: {migration.app_label}.{migration.name}")
+            if plan:
+                sys.exit(1)
+            return
+        if not plan:
+            self.stdout.write("No migrations to apply")
+            return
+        with migration_lock(connection):
+            if not pending_migrations(connection):  # Applied by another replica while this one waited
+                self.stdout.write("No migrations to apply")
+                return
+            call_command("migrate", database=options["database"], interactive=False,
+                         verbosity=options["verbosity"], stdout=self.stdout, stderr=self.stderr)
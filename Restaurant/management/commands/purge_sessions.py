@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from Restaurant.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions in batches. Run it regularly, e.g. from cron, with the db or cached_db engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.SESSION_PURGE_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_sessions(options["batch_size"], options["pause"])
+        self.stdout.write(f"Deleted {deleted} expired session(s)")
@@ -0,0 +1,28 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from Restaurant.mailer import get_transport, send_queued_mail
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound emails. With --loop keep polling for new ones (the mail worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.MAIL_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep running and poll for new messages")
+        parser.add_argument("--interval", type=float, default=settings.MAIL_POLL_SECONDS, help="Seconds between polls")
+
+    def handle(self, *args, **options):
+        transport = get_transport()
+        try:
+            while True:
+                sent, failed = send_queued_mail(transport, options["batch_size"])
+                if sent or failed or not options["loop"]:
+                    self.stdout.write(f"Sent {sent} message(s), {failed} failed")
+                if not options["loop"]:
+                    break
+                sleep(options["interval"])
+        finally:
+            transport.close()
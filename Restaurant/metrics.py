@@ -0,0 +1,260 @@
+"""
+Request metrics: wall time, database time, query count and repeated queries per view.
+
+MetricsMiddleware records every request under the name of the view that handled
+it ("BookingViewSet.create", "menu", "UserSignUpView.post"). Queries are timed by
+a database execute wrapper installed on every connection (see signals.py) and
+counted for the request found in a context variable, so the queries async views
+run in sync_to_async threads count too. A query template (the SQL before its
+parameters are bound) executed more than once in a request is recorded as a
+repeated query, the signature of an N+1.
+
+The numbers live in each worker process and /metrics shows those of the process
+that answers, in the Prometheus text format: cumulative histograms since the
+process started, and quantiles of the last METRICS_WINDOW requests of each view.
+
+QUERY_BUDGETS caps the queries per request of a view. Over budget the middleware
+logs a warning, or raises QueryBudgetExceeded with QUERY_BUDGET_MODE = "raise"
+(test_metrics.py runs the hot endpoints that way).
+"""
+import hmac
+import logging
+import threading
+from bisect import bisect_left
+from collections import Counter, deque
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUANTILES = (0.5, 0.95, 0.99)
+MAX_REPEATED_SIGNATURES = 50  # Per view, to bound the label cardinality
+
+_recorder = ContextVar("query_recorder", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more queries than its QUERY_BUDGETS entry allows"""
+
+
+class QueryRecorder:
+    """Database execute wrapper counting and timing the queries of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.templates = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += perf_counter() - started
+            self.count += 1
+            self.templates[sql] += 1
+
+    def repeated(self):
+        """Return {sql: executions} of the templates executed more than once"""
+        return {sql: count for sql, count in self.templates.items() if count > 1}
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper passing the query to the current request's recorder, if any"""
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    """Add record_query to the execute wrappers of connection (first, as connection.execute_wrapper() pops the last)"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class ViewMetrics:
+    """Counters and histograms of one view"""
+
+    def __init__(self, window):
+        self.statuses = Counter()
+        self.durations = [0] * (len(DURATION_BUCKETS) + 1)  # Per bucket, the last one is +Inf
+        self.duration_sum = 0.0
+        self.db_seconds = 0.0
+        self.queries = [0] * (len(QUERY_BUCKETS) + 1)
+        self.query_sum = 0
+        self.repeated = Counter()
+        self.recent = deque(maxlen=window)
+
+    def add(self, status, duration, recorder):
+        self.statuses[status] += 1
+        self.durations[bisect_left(DURATION_BUCKETS, duration)] += 1
+        self.duration_sum += duration
+        self.db_seconds += recorder.seconds
+        self.queries[bisect_left(QUERY_BUCKETS, recorder.count)] += 1
+        self.query_sum += recorder.count
+        for sql, count in recorder.repeated().items():
+            if sql in self.repeated or len(self.repeated) < MAX_REPEATED_SIGNATURES:
+                self.repeated[sql] += count
+        self.recent.append(duration)
+
+    def quantiles(self):
+        """Return {quantile: seconds} over the recent requests"""
+        ordered = sorted(self.recent)
+        if not ordered:
+            return {}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    """The ViewMetrics of every view seen by this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, status, duration, recorder):
+        with self.lock:
+            metrics = self.views.get(view)
+            if metrics is None:
+                metrics = self.views[view] = ViewMetrics(settings.METRICS_WINDOW)
+            metrics.add(status, duration, recorder)
+
+    def clear(self):
+        with self.lock:
+            self.views.clear()
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, text):
+            lines.extend((f"# HELP {name} {text}", f"# TYPE {name} {kind}"))
+
+        def histogram(name, view, counts, buckets, total):
+            cumulative = 0
+            for bound, count in zip(buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{name}_count{{view="{view}"}} {cumulative}')
+
+        with self.lock:
+            views = sorted(((_escape(view), metrics) for view, metrics in self.views.items()), key=lambda item: item[0])
+            family("littlelemon_requests_total", "counter", "Requests by view and response status.")
+            for view, metrics in views:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'littlelemon_requests_total{{view="{view}",status="{status}"}} {count}')
+            family("littlelemon_request_duration_seconds", "histogram", "Wall time of the requests of a view.")
+            for view, metrics in views:
+                histogram("littlelemon_request_duration_seconds", view, metrics.durations, DURATION_BUCKETS, metrics.duration_sum)
+            family("littlelemon_request_recent_duration_seconds", "gauge", "Wall time quantiles of the most recent requests of a view.")
+            for view, metrics in views:
+                for quantile, seconds in metrics.quantiles().items():
+                    lines.append(f'littlelemon_request_recent_duration_seconds{{view="{view}",quantile="{quantile}"}} {seconds}')
+            family("littlelemon_request_db_seconds_total", "counter", "Time spent executing queries by the requests of a view.")
+            for view, metrics in views:
+                lines.append(f'littlelemon_request_db_seconds_total{{view="{view}"}} {metrics.db_seconds}')
+            family("littlelemon_request_queries", "histogram", "Queries per request of a view.")
+            for view, metrics in views:
+                histogram("littlelemon_request_queries", view, metrics.queries, QUERY_BUCKETS, metrics.query_sum)
+            family("littlelemon_repeated_queries_total", "counter", "Executions of query templates run more than once in a request.")
+            for view, metrics in views:
+                for sql, count in metrics.repeated.most_common():
+                    lines.append(f'littlelemon_repeated_queries_total{{view="{view}",sql="{_escape(sql)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry()
+
+
+def view_name(request):
+    """Return "ViewSet.action", "View.method" or the function name of the view that handled request"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    func = match.func
+    cls = getattr(func, "cls", None) or getattr(func, "view_class", None)
+    if cls is None:
+        return func.__name__
+    method = request.method.lower()
+    actions = getattr(func, "actions", None)
+    if actions:
+        return f"{cls.__name__}.{actions.get(method, method)}"
+    if cls.__qualname__ == "WrappedAPIView":
+        return cls.__name__  # An @api_view function: DRF builds its class with type() and renames it after the function
+    return f"{cls.__name__}.{method}"
+
+
+def check_query_budget(view, recorder):
+    """Log or raise QueryBudgetExceeded if the request ran more queries than the budget of view"""
+    budget = settings.QUERY_BUDGETS.get(view)
+    if budget is None or recorder.count <= budget or settings.QUERY_BUDGET_MODE == "off":
+        return
+    message = f"{view} ran {recorder.count} queries, over its budget of {budget}"
+    repeated = recorder.repeated()
+    if repeated:
+        message += "; repeated: " + "; ".join(f"{count}x {sql}" for sql, count in repeated.items())
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class MetricsMiddleware:
+    """Record the wall time, database time and queries of every request under its view name"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder, started = QueryRecorder(), perf_counter()
+        token = _recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder, started = QueryRecorder(), perf_counter()
+        token = _recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+        return self.finish(request, response, recorder, started)
+
+    def finish(self, request, response, recorder, started):
+        view = view_name(request)
+        metrics_registry.record(view, response.status_code, perf_counter() - started, recorder)
+        check_query_budget(view, recorder)
+        return response
+
+
+def metrics_allowed(request):
+    """Staff users, and scrapers sending "Authorization: Bearer <METRICS_TOKEN>", may read the metrics"""
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
@@ -0,0 +1,47 @@
+"""
+Trigram GIN indexes of the booking search (Restaurant/filters.py), PostgreSQL only.
+
+They index UPPER(column), the expression Django compares for icontains, with the
+gin_trgm_ops operator class of the pg_trgm extension. On other databases the
+operation does nothing. IF NOT EXISTS adopts the indexes that earlier releases
+created after migrate. Without the privilege to create the extension the
+migration fails: have a superuser run `CREATE EXTENSION pg_trgm` first.
+"""
+from django.db import migrations
+
+# (index name, table, column) searched with icontains
+TRIGRAM_INDEXES = [
+    ("booking_name_trgm", "Restaurant_booking", "name"),
+    ("booking_phone_trgm", "Restaurant_booking", "phone"),
+    ("customuser_email_trgm", "Restaurant_customuser", "email"),
+]
+
+
+class PostgreSQLRunSQL(migrations.RunSQL):
+    """RunSQL applied and reverted on PostgreSQL only"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Restaurant', '0006_booking_date_id_index'),
+    ]
+
+    operations = [
+        # The extension is left in place on the way back, other schemas may use it
+        PostgreSQLRunSQL("CREATE EXTENSION IF NOT EXISTS pg_trgm", migrations.RunSQL.noop),
+    ] + [
+        PostgreSQLRunSQL(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)',
+            f'DROP INDEX IF EXISTS "{name}"',
+        )
+        for name, table, column in TRIGRAM_INDEXES
+    ]
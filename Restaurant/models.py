@@ -7,6 +7,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib import auth
 from .managers import CustomUserManager
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from datetime import time, timedelta, datetime
 # from django.contrib.auth.hashers import make_password
 
@@ -49,6 +50,7 @@ class Menu(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     inventory =models.PositiveIntegerField(default=0)
     image_filename = models.CharField(max_length=255, default="/static/img/menu/boil.png")
+    updated_at = models.DateTimeField(auto_now=True)  # Keys the cached menu card fragment
     
     def __str__(self):
         return f'{self.title} | stock {self.inventory}'    
@@ -84,7 +86,8 @@ class Booking(models.Model):
         CANCELED = "CANCELED", "Canceled"  # User requested cancellation
         COMPLETED = "COMPLETED", "Completed"  # Successfully served
 
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="bookings")
+    # Not indexed on its own: booking_user_slot starts with user
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="bookings", db_index=False)
     branch = models.CharField(max_length=255, default="Vellore")
     name = models.CharField(max_length=255)
     phone = models.CharField(
@@ -102,11 +105,73 @@ class Booking(models.Model):
         default=Status.PENDING,
     )
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    class Meta:
+        indexes = [
+            # Capacity checks (availability.load_day): booked tables of a branch on a date overlapping a window
+            models.Index(
+                fields=["branch", "booking_date", "start_time", "end_time"],
+                condition=models.Q(status="BOOKED"),
+                name="booking_booked_slot",
+            ),
+            # Duplicate check of BookingSerializer.validate and a user's own bookings by date
+            models.Index(fields=["user", "booking_date", "start_time", "end_time"], name="booking_user_slot"),
+            # Branch Managers list every booking ordered by date (keyset pagination on booking_date, id)
+            models.Index(fields=["booking_date", "id"], name="booking_date_id"),
+        ]
 
     def __str__(self):
         return f'{self.name} | {self.booking_date} | User: {self.user.email}'
 
 
+class BranchDayCapacity(models.Model):
+    """
+    One row per branch and booking date, locked while a booking of that day is committed
+    so concurrent booking requests for the same slot are checked one after another.
+    """
+    branch = models.CharField(max_length=255)
+    booking_date = models.DateField()
+    version = models.PositiveIntegerField(default=0)  # Bumped by every booking commit of the day
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["branch", "booking_date"], name="unique_branch_day_capacity"),
+        ]
+
+    def __str__(self):
+        return f'{self.branch} | {self.booking_date} | version {self.version}'
+
+
+class OutboundMessage(models.Model):
+    """
+    An email waiting to be sent. Request handlers only insert a row; the
+    send_queued_mail command delivers queued messages and retries failures with backoff.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"  # Queued or waiting for a retry
+        SENT = "SENT", "Sent"  # Accepted by the mail provider
+        FAILED = "FAILED", "Failed"  # Gave up after MAIL_MAX_ATTEMPTS
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbound_message_due"),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} | {self.to_email} | {self.status}'
+
+
 
 
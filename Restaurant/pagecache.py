@@ -0,0 +1,80 @@
+"""
+Whole-page cache for the public pages (home, about, menu, terms).
+
+Anonymous GET responses are stored in Django's cache and served without running
+the view; signed-in users get a freshly rendered page because the header differs.
+A page is tagged with the version counters of the data it shows (see cache.py),
+so saving or deleting a Menu drops the cached menu page in every process sharing
+the cache. Every response carries an ETag, so browsers revalidate with a
+conditional GET and get a 304 when nothing changed.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+from .cache import get_version
+
+MENU_VERSION = "menu"
+
+
+def _page_key(request, version_names):
+    versions = ":".join(str(get_version(name)) for name in version_names)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"page:{versions}:{path}"
+
+
+def _cached_page(request, version_names, user):
+    """Return (cache key or None, cached (content, content type, ETag) or None)"""
+    key = _page_key(request, version_names) if settings.PAGE_CACHE_SECONDS and not user.is_authenticated else None
+    return key, cache.get(key) if key else None
+
+
+def _page_response(request, key, cached, response):
+    """Return the response from the cache or the view, with its ETag, caching the latter"""
+    if cached is None:
+        if response.status_code != 200 or response.streaming:
+            return response
+        etag = quote_etag(hashlib.md5(response.content).hexdigest())
+        if key:
+            cache.set(key, (response.content, response["Content-Type"], etag), settings.PAGE_CACHE_SECONDS)
+    else:
+        content, content_type, etag = cached
+        response = HttpResponse(content, content_type=content_type)
+
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Cookie",))
+    patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def cache_public_page(*version_names):
+    """Cache the anonymous response of a view until the named versions change or PAGE_CACHE_SECONDS pass"""
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view_func(request, *args, **kwargs)
+                # The sync cache (and the session user) are read in a thread, not on the event loop
+                key, cached = await sync_to_async(_cached_page)(request, version_names, request.user)
+                if cached is not None:
+                    return _page_response(request, key, cached, None)
+                response = await view_func(request, *args, **kwargs)
+                return await sync_to_async(_page_response)(request, key, None, response)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+            key, cached = _cached_page(request, version_names, request.user)
+            response = view_func(request, *args, **kwargs) if cached is None else None
+            return _page_response(request, key, cached, response)
+        return wrapper
+    return decorator
@@ -0,0 +1,151 @@
+"""
+Pagination for the large list endpoints.
+
+Page numbers (the REST_FRAMEWORK default) cost an OFFSET scan plus a COUNT(*)
+per page, both growing with the table. Keyset pagination instead continues
+after the last row of the previous page (WHERE (booking_date, id) > (...)),
+so with an index on the ordering every page costs the same as the first and
+no count is run.
+
+SelectablePagination keeps page numbers by default and switches to keyset
+pagination when the request asks for it with ?pagination=cursor (or follows a
+cursor link). Cursors are opaque base64 strings.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate on a unique ordering, e.g. ("booking_date", "id"). ?ordering=-<first field>
+    walks the same ordering backwards (newest first); other orderings are not supported.
+    """
+    ordering = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.descending = request.query_params.get(api_settings.ORDERING_PARAM, "").split(",")[0] == f"-{self.ordering[0]}"
+        values, backwards = self.decode_cursor(request, queryset.model)
+
+        # A previous page is read in reverse order from its first row, then flipped
+        descending = self.descending != backwards
+        queryset = queryset.order_by(*(f"-{name}" if descending else name for name in self.ordering))
+        if values is not None:
+            queryset = queryset.filter(self.after(values, descending))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+
+        self.next_values = self.row_values(rows[-1]) if rows and (has_more or backwards) else None
+        self.previous_values = self.row_values(rows[0]) if rows and (has_more if backwards else values is not None) else None
+        return rows
+
+    def after(self, values, descending):
+        """Filter for the rows after values in the ordering: (a, b) > (x, y) as a >= x AND (a > x OR (a = x AND b > y))"""
+        lookup = "lt" if descending else "gt"
+        condition = Q()
+        for index, (name, value) in enumerate(zip(self.ordering, values)):
+            equal = {field: previous for field, previous in zip(self.ordering[:index], values[:index])}
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        # The redundant bound on the first field lets the database start an index range scan there
+        return Q(**{f"{self.ordering[0]}__{lookup}e": values[0]}) & condition
+
+    def row_values(self, row):
+        return [row._meta.get_field(name).value_to_string(row) for name in self.ordering]
+
+    def encode_cursor(self, values, backwards):
+        cursor = json.dumps({"v": values, "b": int(backwards)}, separators=(",", ":"))
+        return replace_query_param(self.base_url, self.cursor_query_param, urlsafe_b64encode(cursor.encode()).decode())
+
+    def decode_cursor(self, request, model):
+        """Return (ordering values, backwards) of the requested cursor, or (None, False) for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()))
+            values = [model._meta.get_field(name).to_python(value) for name, value in zip(self.ordering, cursor["v"])]
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return values, bool(cursor["b"])
+        except (Base64Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.next_values, False) if self.next_values is not None else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.previous_values, True) if self.previous_values is not None else None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class SelectablePagination(BasePagination):
+    """Page numbers by default, keyset pagination with ?pagination=cursor or a cursor parameter"""
+    keyset_class = KeysetPagination
+    page_number_class = PageNumberPagination
+    pagination_query_param = "pagination"
+
+    def get_paginator(self, request):
+        if (request.query_params.get(self.pagination_query_param) == "cursor"
+                or self.keyset_class.cursor_query_param in request.query_params):
+            return self.keyset_class()
+        return self.page_number_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+
+class BookingKeysetPagination(KeysetPagination):
+    ordering = ("booking_date", "id")
+
+
+class BookingPagination(SelectablePagination):
+    keyset_class = BookingKeysetPagination
+
+
+class UserKeysetPagination(KeysetPagination):
+    ordering = ("email", "id")
+
+
+class UserPagination(SelectablePagination):
+    keyset_class = UserKeysetPagination
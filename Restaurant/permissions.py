@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from .roles import is_branch_manager
 
 class IsBranchManagerOrReadOnly(permissions.BasePermission):
     """
@@ -12,7 +13,7 @@ class IsBranchManagerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         # Allow write permissions only for users in the Branch_Manager group
-        return request.user.is_authenticated and request.user.groups.filter(name="Branch_Manager").exists()
+        return request.user.is_authenticated and is_branch_manager(request)
 
 class IsBranchManager(permissions.BasePermission):
     """
@@ -21,4 +22,4 @@ class IsBranchManager(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and request.user.groups.filter(name="Branch_Manager").exists()
\ No newline at end of file
+        return request.user.is_authenticated and is_branch_manager(request)
\ No newline at end of file
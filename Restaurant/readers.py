@@ -0,0 +1,123 @@
+"""
+Fast read path for list and retrieve of model serializers made of plain columns.
+
+serializer.data deep-copies the serializer's fields, builds a model instance per
+row, resolves every field through get_attribute and, for a
+HyperlinkedModelSerializer, calls reverse() for the url of every row.
+ValuesReader compiles a serializer class once into (name, column,
+to_representation) entries and applies them to values() rows. The url of a
+page is reversed once, for a placeholder pk, and the real pk of each row is
+put in its place. The data, and so the rendered bytes, are the same as the
+serializer's.
+
+ValuesReadMixin switches a viewset's list and retrieve to this path. The
+browsable API keeps the serializer, its forms are built from the instance.
+"""
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.response import Response
+
+PK_PLACEHOLDER = "__pk__"
+
+# Fields whose to_representation returns the database value unchanged
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.EmailField, serializers.IntegerField, serializers.BooleanField)
+
+
+class ValuesReader:
+    """Serializes values() rows the way serializer_class serializes instances"""
+
+    def __init__(self, serializer_class):
+        opts = serializer_class.Meta.model._meta
+        self.entries = []  # (name, column, to_representation or None for passthrough)
+        self.url_field = None
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, HyperlinkedIdentityField):
+                self.url_field = field
+                column = opts.pk.attname if field.lookup_field == "pk" else field.lookup_field
+                self.entries.append((name, column, field))
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or model_field.is_relation:
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name} is not a plain column")
+            convert = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+            self.entries.append((name, model_field.attname, convert))
+        self.columns = list(dict.fromkeys(column for _, column, _ in self.entries))
+
+    def url_template(self, context):
+        """Return the (prefix, suffix) around the pk of this request's hyperlinks"""
+        field = self.url_field
+        placeholder = SimpleNamespace(**{field.lookup_field: PK_PLACEHOLDER})
+        url = field.get_url(placeholder, field.view_name, context["request"], context.get("format"))
+        prefix, found, suffix = url.partition(PK_PLACEHOLDER)
+        if not found:
+            raise ImproperlyConfigured(f"The {field.view_name} URL does not accept the pk placeholder")
+        return prefix, suffix
+
+    def compile(self, context):
+        """Return the (name, column, convert) entries with the url converter bound to context"""
+        if self.url_field is None:
+            return self.entries
+        prefix, suffix = self.url_template(context)
+        return [
+            (name, column, (lambda pk: f"{prefix}{pk}{suffix}") if convert is self.url_field else convert)
+            for name, column, convert in self.entries
+        ]
+
+    def serialize(self, rows, context):
+        """Return the representation of an iterable of values() rows"""
+        entries = self.compile(context)
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in entries:
+                value = row[column]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+    def serialize_instance(self, instance, context):
+        """Return the representation of one model instance"""
+        return self.serialize([{column: getattr(instance, column) for column in self.columns}], context)[0]
+
+
+_readers = {}
+
+
+def get_reader(serializer_class):
+    """Return the ValuesReader of serializer_class, compiled on first use"""
+    reader = _readers.get(serializer_class)
+    if reader is None:
+        reader = _readers[serializer_class] = ValuesReader(serializer_class)
+    return reader
+
+
+class ValuesReadMixin:
+    """List and retrieve from values() rows through the ValuesReader of serializer_class"""
+    values_read = True
+
+    def use_values_read(self, request):
+        return self.values_read and request.accepted_renderer.format != "api"
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_read(request):
+            return super().list(request, *args, **kwargs)
+        reader = get_reader(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*reader.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.serialize(page, self.get_serializer_context()))
+        return Response(reader.serialize(queryset, self.get_serializer_context()))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_values_read(request):
+            return super().retrieve(request, *args, **kwargs)
+        reader = get_reader(self.get_serializer_class())
+        return Response(reader.serialize_instance(self.get_object(), self.get_serializer_context()))
@@ -0,0 +1,103 @@
+"""
+Branch registry: a process-local cache of Restaurant rows keyed by branch.
+
+Branches change rarely but are read several times per booking request (branch
+choices, working hours, capacity). The registry loads every branch with one query
+and serves them from memory until a Restaurant is saved or deleted (see signals.py).
+
+Writes made by other processes are picked up after settings.BRANCH_REGISTRY_SECONDS,
+or immediately when settings.BRANCH_REGISTRY_CACHE names a cache alias shared by all
+workers (e.g. Redis). Rows returned by the registry are shared and must not be modified.
+"""
+import threading
+from time import monotonic
+
+from django.conf import settings
+
+from .cache import aget_version, get_version, bump_version
+from .models import Restaurant
+
+VERSION_NAME = "branch-registry"
+
+
+class BranchRegistry:
+    """Branch name -> Restaurant, loaded in one query and kept until invalidated"""
+
+    def __init__(self):
+        self._branches = None
+        self._loaded_at = 0.0
+        self._version = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache_alias(self):
+        return getattr(settings, "BRANCH_REGISTRY_CACHE", None)
+
+    @property
+    def max_age(self):
+        return getattr(settings, "BRANCH_REGISTRY_SECONDS", 60)
+
+    def _shared_version(self):
+        return get_version(VERSION_NAME, self.cache_alias) if self.cache_alias else None
+
+    async def _ashared_version(self):
+        return await aget_version(VERSION_NAME, self.cache_alias) if self.cache_alias else None
+
+    def _is_current(self, version):
+        return (self._branches is not None and version == self._version
+                and monotonic() - self._loaded_at < self.max_age)
+
+    def _store(self, branches, version, generation):
+        """Publish loaded branches, unless the registry was invalidated while they were loading"""
+        with self._lock:
+            if generation == self._generation:
+                self._branches = branches
+                self._loaded_at = monotonic()
+                self._version = version
+
+    def _current(self, version):
+        """Return (the branches if still current else None, the generation to store a reload under)"""
+        with self._lock:
+            return (self._branches if self._is_current(version) else None), self._generation
+
+    def all(self):
+        """Return a dict of branch name -> Restaurant"""
+        # The lock only guards reading and swapping the branches, never a query or cache round trip
+        version = self._shared_version()
+        branches, generation = self._current(version)
+        if branches is None:
+            branches = {restaurant.branch: restaurant for restaurant in Restaurant.objects.order_by("pk")}
+            self._store(branches, version, generation)
+        return branches
+
+    async def aall(self):
+        """all() for async views: the version and a reload are read with the async cache API and ORM"""
+        version = await self._ashared_version()
+        branches, generation = self._current(version)
+        if branches is None:
+            branches = {restaurant.branch: restaurant async for restaurant in Restaurant.objects.order_by("pk")}
+            self._store(branches, version, generation)
+        return branches
+
+    def branches(self):
+        """Return the list of branch names"""
+        return list(self.all())
+
+    def get(self, branch):
+        """Return the Restaurant of the branch, or None if there is no such branch"""
+        return self.all().get(branch)
+
+    async def aget(self, branch):
+        return (await self.aall()).get(branch)
+
+    def invalidate(self):
+        """Reload the branches on next use, in every process sharing the cache"""
+        with self._lock:
+            self._branches = None
+            self._generation += 1
+        if self.cache_alias:
+            bump_version(VERSION_NAME, self.cache_alias)
+
+
+branch_registry = BranchRegistry()
@@ -0,0 +1,68 @@
+"""
+orjson-backed JSON renderer and parser, and per-viewset opt-in of the other renderers.
+
+FastJSONRenderer produces the same bytes as DRF's JSONRenderer (compact, UTF-8,
+\\u2028/\\u2029 escaped): whatever orjson cannot encode natively (Decimal, date,
+time, datetime, lazy strings, ...) goes through DRF's own JSONEncoder. Pretty
+printed output ("; indent=4" in Accept), non-default UNICODE_JSON/COMPACT_JSON
+settings and data orjson rejects (e.g. integers above 64 bits) use the stdlib
+renderer, as does everything when orjson is not installed.
+
+Only JSON is rendered by default in production (settings.API_RENDERERS). Viewsets
+that serve files list the formats they need with api_renderers("xml", "csv").
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_csv.renderers import CSVRenderer
+from rest_framework_xml.renderers import XMLRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OPTIONAL_RENDERERS = {"api": BrowsableAPIRenderer, "xml": XMLRenderer, "csv": CSVRenderer}
+
+
+def api_renderers(*formats):
+    """DEFAULT_RENDERER_CLASSES plus the optional renderers of formats ("api", "xml", "csv")"""
+    classes = list(api_settings.DEFAULT_RENDERER_CLASSES)
+    for name in formats:
+        if OPTIONAL_RENDERERS[name] not in classes:
+            classes.append(OPTIONAL_RENDERERS[name])
+    return classes
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer serializing with orjson"""
+    orjson_options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            # Dates and times are passed through too, DRF formats them differently from orjson
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=self.orjson_options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in ret:
+            ret = ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser parsing UTF-8 bodies with orjson"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,81 @@
+"""
+Read-through cache of rendered API responses.
+
+Viewsets using CachedResponseMixin store the rendered bytes of their list and
+retrieve responses in Django's cache. The key is built from the data version
+counters the viewset depends on (see cache.py), the host, the accepted media
+type, the action and its URL kwargs and the normalized query parameters
+(search, ordering, page). On a hit the stored bytes are returned without
+touching the ORM or the serializer. Authentication, permissions, throttling
+and content negotiation still run on every request.
+
+Every cached response carries an ETag, so clients can revalidate with
+If-None-Match whatever the renderer (JSON, XML or CSV). The browsable API
+renders per-user forms and is never cached.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .cache import get_version
+
+
+class CachedResponseMixin:
+    """Serve list and retrieve from a cache of rendered responses, dropped when a named version changes"""
+    cache_version_names = ()
+
+    def get_response_cache_key(self, request, **kwargs):
+        """Return the cache key of the response to request, or None if it must not be cached"""
+        if not settings.API_CACHE_SECONDS or request.accepted_media_type.startswith("text/html"):
+            return None
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+            if value != ""
+        )
+        parts = [
+            ":".join(str(get_version(name)) for name in self.cache_version_names),
+            request.scheme,
+            request.get_host(),
+            request.accepted_media_type,
+            self.action,
+            repr(sorted(kwargs.items())),
+            repr(params),
+        ]
+        return f"api:{self.basename}:{hashlib.md5('|'.join(parts).encode()).hexdigest()}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response to request, or call handler and cache its rendered response"""
+        key = self.get_response_cache_key(request, **kwargs)
+        if key is None:
+            return handler(request, *args, **kwargs)
+
+        cached = cache.get(key)
+        if cached is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            # Render now (as finalize_response would) to store the bytes
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            etag = quote_etag(hashlib.md5(response.content).hexdigest())
+            cache.set(key, (response.content, response["Content-Type"], etag), settings.API_CACHE_SECONDS)
+        else:
+            content, content_type, etag = cached
+            response = HttpResponse(content, content_type=content_type)
+
+        response["ETag"] = etag
+        return get_conditional_response(request, etag=etag, response=response)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
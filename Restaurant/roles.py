@@ -0,0 +1,81 @@
+"""
+Role resolution for permission checks.
+
+A user's roles are the names of their groups. They are resolved once per request
+and cached per user in Django's cache until the user's groups change (see signals.py),
+so permission classes and viewsets can ask "is this a Branch Manager?" as often
+as they like without repeating the group query.
+
+JWT access tokens carry the roles as a "roles" claim. With settings.ROLES_TRUST_TOKEN_CLAIM
+enabled the claim is used as is, so JWT-authenticated requests need no lookup at all;
+role changes then take effect when the token is refreshed.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import Group
+
+from .cache import get_version, bump_version
+
+BRANCH_MANAGER = "Branch_Manager"
+VERSION_NAME = "roles"
+TOKEN_CLAIM = "roles"
+
+
+def _cache():
+    return caches[getattr(settings, "ROLES_CACHE", "default")]
+
+
+def _cache_key(user_id):
+    alias = getattr(settings, "ROLES_CACHE", "default")
+    return f"roles:{get_version(VERSION_NAME, alias)}:{user_id}"
+
+
+def get_user_roles(user_id):
+    """Return the set of group names of the user with the given id"""
+    key = _cache_key(user_id)
+    roles = _cache().get(key)
+    if roles is None:
+        roles = sorted(Group.objects.filter(user__id=user_id).values_list("name", flat=True))
+        _cache().set(key, roles, getattr(settings, "ROLES_CACHE_SECONDS", 60))
+    return frozenset(roles)
+
+
+def get_roles(request):
+    """Return the roles of request.user, resolved once per request"""
+    http_request = getattr(request, "_request", request)
+    roles = getattr(http_request, "_user_roles", None)
+    if roles is None:
+        roles = frozenset()
+        user = request.user
+        if user and user.is_authenticated:
+            claim = _token_roles(request)
+            roles = claim if claim is not None else get_user_roles(user.pk)
+        http_request._user_roles = roles
+    return roles
+
+
+def is_branch_manager(request):
+    """Whether request.user is in the Branch_Manager group"""
+    return BRANCH_MANAGER in get_roles(request)
+
+
+def invalidate_user_roles(*user_ids):
+    """Forget the cached roles of the given users"""
+    _cache().delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def invalidate_all_roles():
+    """Forget the cached roles of every user, e.g. after a group is renamed or deleted"""
+    bump_version(VERSION_NAME, getattr(settings, "ROLES_CACHE", "default"))
+
+
+def _token_roles(request):
+    """Roles from the JWT claim when it is trusted, else None"""
+    if not getattr(settings, "ROLES_TRUST_TOKEN_CLAIM", False):
+        return None
+    token = getattr(request, "auth", None)
+    try:
+        roles = token[TOKEN_CLAIM]
+    except (TypeError, KeyError):
+        return None
+    return frozenset(roles)
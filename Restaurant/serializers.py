@@ -1,5 +1,11 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from .models import Menu, Booking, CustomUser, Restaurant, Holiday
+from .registry import branch_registry
+from .roles import get_user_roles, TOKEN_CLAIM
+from .authentication import EMAIL_CLAIM, user_reference
 from django.contrib.auth.models import Group
 from datetime import date, timedelta, time, datetime
 
@@ -32,10 +38,7 @@ class BookingSerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        from .models import Restaurant  # Import here to avoid circular import
-        self.fields['branch'].choices = list(
-            Restaurant.objects.values_list('branch', flat=True)
-        )
+        self.fields['branch'].choices = branch_registry.branches()
     
     class Meta:
         model = Booking
@@ -43,7 +46,7 @@ class BookingSerializer(serializers.ModelSerializer):
         read_only_fields = ["user", "status"]
         
     def validate(self, attrs):
-        user = self.context["request"].user
+        user = user_reference(self.context["request"].user)
         booking_date = attrs["booking_date"]
         start_time = attrs["start_time"]
         end_time = attrs["end_time"]
@@ -66,7 +69,7 @@ class BookingSerializer(serializers.ModelSerializer):
     
     def validate_branch(self, branch):
         """Ensure branch exists"""
-        if not Restaurant.objects.filter(branch=branch).exists():
+        if branch_registry.get(branch) is None:
             raise serializers.ValidationError("Invalid branch. View available branches on /api/booking/branches")
         return branch
     
@@ -82,7 +85,9 @@ class BookingSerializer(serializers.ModelSerializer):
         """Ensure start time is within restaurant opening hours and closing hours"""
         if not isinstance(start_time, time):
             raise serializers.ValidationError("Start time must be a valid time. Format: HH:MM")
-        restaurant = Restaurant.objects.get(branch=self.initial_data["branch"])
+        restaurant = branch_registry.get(self.initial_data.get("branch"))
+        if restaurant is None:
+            return start_time  # Reported by validate_branch
         closing_datetime = datetime.combine(datetime.today().date(), restaurant.closing_time)
         adjusted_closing_datetime = closing_datetime - timedelta(minutes=30)
         closing_time = adjusted_closing_datetime.time()
@@ -94,8 +99,13 @@ class BookingSerializer(serializers.ModelSerializer):
         """Ensure end time is within restaurant opening hours and closing hours"""
         if not isinstance(end_time, time):
             raise serializers.ValidationError("End time must be a valid time. Format: HH:MM")
-        restaurant = Restaurant.objects.get(branch=self.initial_data["branch"])
-        if end_time <= time.fromisoformat(self.initial_data.get("start_time")):
+        restaurant = branch_registry.get(self.initial_data.get("branch"))
+        if restaurant is None:
+            return end_time  # Reported by validate_branch
+        start_time = self.initial_data.get("start_time")
+        if isinstance(start_time, str):
+            start_time = time.fromisoformat(start_time)
+        if start_time is not None and end_time <= start_time:
             raise serializers.ValidationError("End time must be greater than start time.")
         if end_time < restaurant.opening_time or end_time > restaurant.closing_time:
             raise serializers.ValidationError(f"End time must be within restaurant working hours. {restaurant.opening_time} - {restaurant.closing_time}")
@@ -105,4 +115,41 @@ class HolidaySerializer(serializers.HyperlinkedModelSerializer):
     class Meta:
         model = Holiday
         fields = ['url', 'id', 'holiday_date', 'description']
-        
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Obtain JWT tokens carrying the user's email and roles as claims"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[EMAIL_CLAIM] = user.email  # Read by ClaimsJWTAuthentication without loading the user
+        token[TOKEN_CLAIM] = sorted(get_user_roles(user.pk))
+        return token
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh JWT tokens with the user's current email and roles, so changes to them reach the tokens on refresh"""
+
+    def validate(self, attrs):
+        # TokenRefreshSerializer.validate, with the user checked and its email read from one row
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        user = CustomUser.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).values_list("email", "is_active").first()
+        if user is None or (jwt_settings.CHECK_USER_IS_ACTIVE and not user[1]):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        refresh[EMAIL_CLAIM] = user[0]
+        refresh[TOKEN_CLAIM] = sorted(get_user_roles(user_id))
+        data = {"access": str(refresh.access_token)}  # Copies the claims
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:  # token_blacklist not installed
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
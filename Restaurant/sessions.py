@@ -0,0 +1,32 @@
+"""
+Batched removal of expired sessions.
+
+Django's clearsessions deletes every expired row in one statement, which holds
+locks on django_session for as long as that takes while logged-in users keep
+reading and writing it. purge_expired_sessions deletes them in primary key
+batches instead, optionally pausing between batches.
+"""
+from importlib import import_module
+from time import sleep
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.utils import timezone
+
+
+def purge_expired_sessions(batch_size, pause=0.0):
+    """Delete the expired sessions of the configured engine and return how many rows were deleted"""
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    if not issubclass(store_class, DatabaseSessionStore):
+        store_class.clear_expired()  # Cache and cookie sessions expire by themselves
+        return 0
+
+    model = store_class.get_model_class()
+    deleted = 0
+    while True:
+        batch = list(model.objects.filter(expire_date__lt=timezone.now()).values_list("pk", flat=True)[:batch_size])
+        if batch:
+            deleted += model.objects.filter(pk__in=batch).delete()[0]
+        if len(batch) < batch_size:
+            return deleted
+        sleep(pause)
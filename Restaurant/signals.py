@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .models import Booking, Restaurant, CustomUser, Menu
+from .availability import availability_engine
+from .registry import branch_registry
+from .roles import invalidate_user_roles, invalidate_all_roles
+from .cache import bump_version
+from .pagecache import MENU_VERSION
+from .metrics import install_query_recorder
+
+
+@receiver(post_save, sender=Booking)
+def track_booking_availability(sender, instance, **kwargs):
+    """
+    Keep the availability engine in step with created/updated/canceled bookings.
+    Inside a transaction the day is dropped now and the booking applied once it commits,
+    so a rolled back booking never occupies a table.
+    """
+    args = (instance.pk, instance.branch, instance.booking_date, instance.start_time, instance.end_time, instance.status)
+    if transaction.get_connection().in_atomic_block:
+        availability_engine.forget(instance.pk)
+        availability_engine.invalidate(instance.branch, instance.booking_date)
+        transaction.on_commit(lambda: availability_engine.track(*args))
+    else:
+        availability_engine.track(*args)
+
+
+@receiver(post_delete, sender=Booking)
+def forget_booking_availability(sender, instance, **kwargs):
+    """Release the table of a deleted booking"""
+    availability_engine.forget(instance.pk)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def invalidate_branch_registry(sender, instance, **kwargs):
+    """Reload the branch registry now and, if inside a transaction, again once it commits"""
+    branch_registry.invalidate()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(branch_registry.invalidate)
+
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+def invalidate_roles_on_group_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Forget the cached roles of users added to or removed from a group, once the rows have changed"""
+    if action == "pre_clear" and reverse:
+        # group.user_set.clear(): the members are only known before the rows are deleted
+        instance._cleared_user_ids = list(instance.user_set.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        user_ids = [instance.pk]  # user.groups.add(...)
+    elif action == "post_clear":
+        user_ids = instance.__dict__.pop("_cleared_user_ids", [])
+    else:
+        user_ids = list(pk_set)  # group.user_set.add(...)
+    invalidate_user_roles(*user_ids)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_roles_of_new_user(sender, instance, created, **kwargs):
+    """A new user has no groups, whatever was cached for a reused id"""
+    if created:
+        invalidate_user_roles(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, instance, created=False, **kwargs):
+    """A renamed or deleted group changes the roles of all its members"""
+    if not created:
+        invalidate_all_roles()
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def invalidate_menu_pages(sender, instance, **kwargs):
+    """Drop cached menu pages now and, if inside a transaction, again once it commits"""
+    bump_version(MENU_VERSION)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_version(MENU_VERSION))
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    """Count and time the queries of every connection for the request metrics"""
+    install_query_recorder(connection)
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import include, path, resolve, reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import time
+from Restaurant.models import Menu, Restaurant, CustomUser
+from Restaurant import registry
+from Restaurant.registry import branch_registry
+from Restaurant import asyncviews
+from Restaurant.urls import async_urlpatterns
+from Restaurant.views import BookingViewSet
+
+# The URLs with ASYNC_VIEWS=True
+urlpatterns = [path("", include(async_urlpatterns)), path("", include("Littlelemon.urls"))]
+
+
+class AsyncViewRoutingTest(TestCase):
+    def test_sync_by_default(self):
+        self.assertIs(resolve("/api/booking/branches.json").func.cls, BookingViewSet)
+        self.assertIs(resolve("/api/booking/working_hours").func.cls, BookingViewSet)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_async_urls(self):
+        self.assertIs(resolve("/api/booking/branches").func, asyncviews.branches)
+        self.assertIs(resolve("/api/booking/working_hours.xml").func, asyncviews.working_hours)
+        self.assertIs(resolve(reverse("menu")).func, asyncviews.menu)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        branch_registry.invalidate()
+        Restaurant.objects.create(branch="Chennai", phone="8346751234", opening_time=time(10, 0), closing_time=time(22, 0))
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+
+    def test_registry_async_loader(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(list(async_to_sync(branch_registry.aall)()), ["Chennai"])
+            self.assertIsNone(async_to_sync(branch_registry.aget)("Mumbai"))
+            self.assertEqual(branch_registry.branches(), ["Chennai"])  # Shared with the sync API
+
+    def test_session_user(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("booking-branches"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"branches": ["Chennai"]})
+        response = self.client.get("/api/booking/branches.xml")
+        self.assertEqual(response["Content-Type"], "application/xml; charset=utf-8")
+        self.assertIn(b"Chennai", response.content)
+
+    def test_jwt_user_and_formats(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"}
+        response = self.client.get(reverse("booking-working-hours"), {"branch": "Chennai"}, **headers)
+        self.assertEqual(response.data, {"opening_time": "10:00", "closing_time": "22:00"})
+        response = self.client.get(reverse("booking-working-hours"), {"branch": "Chennai", "format": "xml"}, **headers)
+        self.assertEqual(response["Content-Type"], "application/xml; charset=utf-8")
+        self.assertIn(b"<opening_time>10:00</opening_time>", response.content)
+        response = self.client.get(reverse("booking-working-hours"), {"branch": "Mumbai"}, **headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_errors_match_drf(self):
+        self.assertEqual(self.client.get(reverse("booking-branches")).status_code, 403)
+        response = self.client.get(reverse("booking-branches"), HTTP_AUTHORIZATION="Bearer invalid")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data["code"], "token_not_valid")
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.post(reverse("booking-branches")).status_code, 405)
+        self.assertEqual(self.client.get(reverse("booking-working-hours")).status_code, 400)
+
+    @override_settings(BRANCH_REGISTRY_CACHE="default")
+    async def test_registry_version_read_async(self):
+        await self.async_client.aforce_login(self.user)
+        cache_class = type(caches["default"])
+        sync_read = AssertionError("The registry version was read with the sync cache API")
+        with patch.object(cache_class, "aget", autospec=True, side_effect=cache_class.aget) as aget, \
+                patch.object(registry, "get_version", side_effect=sync_read):
+            response = await self.async_client.get(reverse("booking-branches"))
+        self.assertEqual(response.json(), {"branches": ["Chennai"]})
+        self.assertIn(f"version:{registry.VERSION_NAME}", [call.args[1] for call in aget.call_args_list])
+
+    async def test_async_client(self):
+        self.assertEqual((await self.async_client.get("/health/")).json(), {"status": "ok"})
+        await Menu.objects.acreate(title="Pasta", price=10.99, inventory=5)
+        response = await self.async_client.get(reverse("menu"))
+        self.assertContains(response, "Pasta")
+        cached = await self.async_client.get(reverse("menu"), headers={"if-none-match": response["ETag"]})
+        self.assertEqual(cached.status_code, 304)
@@ -0,0 +1,95 @@
+from datetime import date, time, timedelta
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from Restaurant.authentication import ClaimsJWTAuthentication, EMAIL_CLAIM, TokenClaimsUser, user_reference
+from Restaurant.availability import availability_engine
+from Restaurant.models import Booking, CustomUser, Restaurant
+from Restaurant.registry import branch_registry
+from Restaurant.serializers import RoleTokenObtainPairSerializer
+
+
+class TokenClaimsUserTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123", first_name="Asha")
+        self.token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+
+    def test_email_claim(self):
+        self.assertEqual(self.token[EMAIL_CLAIM], "user@example.com")
+        response = APIClient().post(reverse("token_obtain_pair"), {"email": "user@example.com", "password": "Passkey@123"})
+        self.assertEqual(ClaimsJWTAuthentication().get_validated_token(response.data["access"])[EMAIL_CLAIM], "user@example.com")
+
+    def test_refresh_reads_current_email(self):
+        refresh = APIClient().post(reverse("token_obtain_pair"), {"email": "user@example.com", "password": "Passkey@123"}).data["refresh"]
+        self.user.email = "changed@example.com"
+        self.user.save()
+        response = APIClient().post(reverse("token_refresh"), {"refresh": refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ClaimsJWTAuthentication().get_validated_token(response.data["access"])[EMAIL_CLAIM], "changed@example.com")
+        self.assertEqual(RefreshToken(response.data["refresh"])[EMAIL_CLAIM], "changed@example.com")
+
+    def test_refresh_reads_the_user_once(self):
+        refresh = str(RoleTokenObtainPairSerializer.get_token(self.user))
+        user_table = CustomUser._meta.db_table
+        # Without rotation: token_blacklist reads the user again for its own records
+        with patch.object(jwt_settings, "ROTATE_REFRESH_TOKENS", False), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(APIClient().post(reverse("token_refresh"), {"refresh": refresh}).status_code, 200)
+        self.assertEqual(len([query for query in queries if f'FROM "{user_table}"' in query["sql"]]), 1)
+        self.user.is_active = False
+        self.user.save()
+        refresh = str(RoleTokenObtainPairSerializer.get_token(self.user))
+        response = APIClient().post(reverse("token_refresh"), {"refresh": refresh})
+        self.assertEqual((response.status_code, response.data["detail"].code), (401, "no_active_account"))
+        self.user.delete()
+        self.assertEqual(APIClient().post(reverse("token_refresh"), {"refresh": refresh}).status_code, 401)
+
+    def test_claims_without_query(self):
+        with self.assertNumQueries(0):
+            user = ClaimsJWTAuthentication().get_user(self.token)
+            self.assertTrue(user and user.is_authenticated)
+            self.assertEqual((user.pk, user.id, user.email), (self.user.pk, self.user.pk, "user@example.com"))
+            self.assertEqual(user, self.user)
+            self.assertFalse(hasattr(user, "resolve_expression"))
+            reference = user_reference(user)
+            self.assertIsInstance(reference, CustomUser)
+            self.assertEqual((reference.pk, reference.email), (self.user.pk, "user@example.com"))
+        with self.assertNumQueries(1):
+            self.assertEqual(reference.first_name, "Asha")  # Deferred
+
+    def test_loads_on_other_fields(self):
+        user = TokenClaimsUser(self.token)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Asha")
+            self.assertTrue(user.check_password("Passkey@123"))
+
+    def test_deleted_user(self):
+        user = TokenClaimsUser(self.token)
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            user.first_name
+
+    @override_settings(API_CACHE_SECONDS=0)
+    def test_bookings_without_user_query(self):
+        cache.clear()
+        branch_registry.invalidate()
+        availability_engine.clear()
+        Restaurant.objects.create(branch="Chennai", phone="1234567890", no_of_tables=5, opening_time=time(10, 0), closing_time=time(22, 0))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        user_table = CustomUser._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse("booking-list"), {
+                "branch": "Chennai", "name": "Guest", "phone": "1234567890", "no_of_guests": 2,
+                "booking_date": date.today() + timedelta(days=1), "start_time": time(11, 0), "end_time": time(11, 30),
+            }, format="json")
+            self.assertEqual(response.status_code, 201, response.content)
+            self.assertEqual(client.get(reverse("booking-list")).data["count"], 1)
+        self.assertFalse([query["sql"] for query in queries if f'FROM "{user_table}"' in query["sql"]])
+        self.assertEqual(Booking.objects.get().user, self.user)
@@ -0,0 +1,204 @@
+from django.test import TestCase, TransactionTestCase
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, Restaurant, CustomUser, BranchDayCapacity
+from Restaurant import availability
+from Restaurant.availability import OccupancyTree, DayOccupancy, availability_engine
+
+
+class OccupancyTreeTest(TestCase):
+    def test_peak_of_overlapping_intervals(self):
+        tree = OccupancyTree()
+        tree.add(600, 660)  # 10:00 - 11:00
+        tree.add(630, 690)  # 10:30 - 11:30
+        tree.add(690, 720)  # 11:30 - 12:00
+        self.assertEqual(tree.peak(600, 720), 2)
+        self.assertEqual(tree.peak(660, 720), 1)
+        self.assertEqual(tree.peak(720, 780), 0)
+
+    def test_remove_interval(self):
+        tree = OccupancyTree()
+        tree.add(600, 660)
+        tree.add(600, 660)
+        tree.add(600, 660, delta=-1)
+        self.assertEqual(tree.peak(0, 1440), 1)
+
+    def test_day_occupancy_moves_booking(self):
+        day = DayOccupancy()
+        day.add(1, time(10, 0), time(11, 0))
+        day.add(1, time(12, 0), time(13, 0))
+        self.assertEqual(day.peak(time(10, 0), time(11, 0)), 0)
+        self.assertEqual(day.peak(time(12, 30), time(14, 0)), 1)
+        self.assertEqual(len(day), 1)
+
+
+class AvailabilityEngineTest(TestCase):
+    def setUp(self):
+        availability_engine.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        self.restaurant = Restaurant.objects.create(
+            branch="Chennai",
+            phone="8346751234",
+            opening_time=time(10, 0),
+            closing_time=time(22, 0),
+            no_of_tables=5,
+        )
+        self.booking_date = date.today() + timedelta(days=1)
+
+    def book(self, start_time, end_time, status=Booking.Status.BOOKED):
+        return Booking.objects.create(
+            user=self.user,
+            branch="Chennai",
+            name="John Doe",
+            phone="9876543210",
+            booking_date=self.booking_date,
+            start_time=start_time,
+            end_time=end_time,
+            status=status,
+        )
+
+    def peak(self, start_time, end_time):
+        return availability_engine.peak("Chennai", self.booking_date, start_time, end_time)
+
+    def test_partial_overlaps_are_counted(self):
+        self.book(time(10, 30), time(11, 30))
+        self.book(time(11, 0), time(12, 0))
+        self.book(time(11, 15), time(11, 45))
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 3)
+
+    def test_only_booked_status_occupies_tables(self):
+        self.book(time(11, 0), time(11, 30), status=Booking.Status.PENDING)
+        self.book(time(11, 0), time(11, 30), status=Booking.Status.FAILED)
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 0)
+
+    def test_day_is_loaded_once(self):
+        self.book(time(11, 0), time(11, 30))
+        with self.assertNumQueries(1):
+            self.peak(time(11, 0), time(11, 30))
+            self.peak(time(12, 0), time(12, 30))
+
+    def test_day_loaded_during_a_booking_is_not_kept(self):
+        load_day = availability.load_day
+
+        def load_then_book(*args):
+            occupancy = load_day(*args)
+            self.book(time(11, 0), time(11, 30))  # Committed by another request while this one loaded
+            return occupancy
+
+        with patch.object(availability, "load_day", side_effect=load_then_book):
+            self.assertEqual(self.peak(time(11, 0), time(11, 30)), 0)
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 1)  # Reloaded
+
+    def test_signals_track_create_cancel_and_delete(self):
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 0)
+        booking = self.book(time(11, 0), time(11, 30))
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 1)
+
+        booking.status = Booking.Status.CANCELED
+        booking.save()
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 0)
+
+        booking.status = Booking.Status.BOOKED
+        booking.start_time = time(13, 0)
+        booking.end_time = time(14, 0)
+        booking.save()
+        self.assertEqual(self.peak(time(11, 0), time(11, 30)), 0)
+        self.assertEqual(self.peak(time(13, 30), time(15, 0)), 1)
+
+        booking.delete()
+        self.assertEqual(self.peak(time(13, 30), time(15, 0)), 0)
+
+
+class BookingCommitTest(TestCase):
+    def setUp(self):
+        availability_engine.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        Restaurant.objects.create(
+            branch="Chennai",
+            phone="8346751234",
+            opening_time=time(10, 0),
+            closing_time=time(22, 0),
+            no_of_tables=3,
+        )
+        self.booking_date = date.today() + timedelta(days=1)
+        self.payload = {
+            "branch": "Chennai",
+            "name": "John Doe",
+            "phone": "1234567890",
+            "no_of_guests": 2,
+            "booking_date": self.booking_date.isoformat(),
+            "start_time": "11:00",
+            "end_time": "12:00",
+        }
+
+    def test_booking_is_saved_once_with_final_status(self):
+        response = self.client.post(reverse("booking-list"), self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], Booking.Status.BOOKED)
+        self.assertEqual(Booking.objects.get().status, Booking.Status.BOOKED)
+        self.assertEqual(BranchDayCapacity.objects.get(branch="Chennai", booking_date=self.booking_date).version, 1)
+
+    def test_overlapping_booking_fails_when_no_table_is_left(self):
+        # 3 tables minus 2 buffer tables leaves one bookable table
+        Booking.objects.create(
+            user=self.user, branch="Chennai", name="Jane Doe", phone="1234567890",
+            booking_date=self.booking_date, start_time=time(11, 30), end_time=time(12, 30),
+            status=Booking.Status.BOOKED,
+        )
+        response = self.client.post(reverse("booking-list"), self.payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Booking.objects.filter(status=Booking.Status.FAILED).count(), 1)
+        self.assertFalse(Booking.objects.filter(status=Booking.Status.PENDING).exists())
+
+
+class BookingConcurrencyTest(TransactionTestCase):
+    """Fire many parallel booking requests at one slot and check it is never overbooked"""
+    requests = 120
+    workers = 24
+
+    def setUp(self):
+        availability_engine.clear()
+        Restaurant.objects.create(
+            branch="Chennai",
+            phone="8346751234",
+            opening_time=time(10, 0),
+            closing_time=time(22, 0),
+            no_of_tables=5,
+        )
+        self.users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"user{i}@example.com") for i in range(self.requests)
+        )
+        self.payload = {
+            "branch": "Chennai",
+            "name": "John Doe",
+            "phone": "1234567890",
+            "no_of_guests": 2,
+            "booking_date": (date.today() + timedelta(days=1)).isoformat(),
+            "start_time": "19:00",
+            "end_time": "20:00",
+        }
+
+    def post_booking(self, user):
+        try:
+            client = APIClient()
+            client.force_authenticate(user=user)
+            return client.post(reverse("booking-list"), self.payload, format="json").status_code
+        finally:
+            connection.close()
+
+    def test_parallel_requests_do_not_overbook(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            codes = list(pool.map(self.post_booking, CustomUser.objects.all()))
+
+        capacity = 5 - 2  # no_of_tables minus buffer tables
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), capacity)
+        self.assertEqual(codes.count(status.HTTP_400_BAD_REQUEST), self.requests - capacity)
+        self.assertEqual(Booking.objects.filter(status=Booking.Status.BOOKED).count(), capacity)
+        self.assertEqual(Booking.objects.filter(status=Booking.Status.FAILED).count(), self.requests - capacity)
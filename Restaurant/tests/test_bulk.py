@@ -0,0 +1,115 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, Menu, Restaurant, CustomUser
+from Restaurant.registry import branch_registry
+from Restaurant.availability import availability_engine
+from Restaurant.cache import get_version
+from Restaurant.pagecache import MENU_VERSION
+
+
+@override_settings(IMPORT_BATCH_SIZE=2)
+class BulkImportTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        branch_registry.invalidate()
+        availability_engine.clear()
+        Restaurant.objects.create(branch="Chennai", no_of_tables=10, opening_time=time(10, 0), closing_time=time(22, 0))
+        self.manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.guest = CustomUser.objects.create_user(email="guest@example.com", password="Passkey@123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        self.day = (date.today() + timedelta(days=3)).isoformat()
+
+    def booking(self, **fields):
+        return {"branch": "Chennai", "name": "Guest", "phone": "1234567890", "no_of_guests": 2,
+                "booking_date": self.day, "start_time": "11:00", "end_time": "12:00", **fields}
+
+    def test_menu_upsert_on_title(self):
+        Menu.objects.create(title="Pasta", price=9.99, inventory=1)
+        version = get_version(MENU_VERSION)
+        rows = [
+            {"title": "Pasta", "price": "10.99", "inventory": 5},
+            {"title": "Pizza", "price": "12.99", "inventory": 8, "category": "Mains"},
+            {"title": "Soup", "price": "cheap", "inventory": 1},
+            {"title": "Salad", "price": "5.00", "inventory": 3},
+        ]
+        response = self.client.post(reverse("menu-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual((response.data["created"], response.data["updated"]), (2, 1))
+        self.assertEqual([error["row"] for error in response.data["errors"]], [3])
+        self.assertIn("price", response.data["errors"][0]["errors"])
+        self.assertEqual(Menu.objects.get(title="Pasta").inventory, 5)
+        self.assertEqual(sorted(Menu.objects.values_list("title", flat=True)), ["Pasta", "Pizza", "Salad"])
+        self.assertNotEqual(get_version(MENU_VERSION), version)  # bulk_create sends no signals
+
+    def test_menu_csv_upload(self):
+        body = "title,price,inventory,description\r\nPasta,10.99,5,\r\nPizza,12.99,8,Cheese\r\n"
+        response = self.client.post(reverse("menu-bulk"), body, content_type="text/csv")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Menu.objects.get(title="Pizza").description, "Cheese")
+
+    def test_bookings_validated_without_per_row_queries(self):
+        rows = [self.booking(name=f"Guest {i}", start_time=f"{10 + i}:00", end_time=f"{11 + i}:00") for i in range(10)]
+        rows.append(self.booking(user="guest@example.com"))
+        branch_registry.all()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("booking-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 11)
+        self.assertLess(len(queries), 19)  # Lookups, a savepoint, the day's lock and bookings, 6 INSERTs of 2 rows
+        self.assertEqual(Booking.objects.filter(user=self.guest).count(), 1)
+        self.assertEqual(Booking.objects.filter(status=Booking.Status.BOOKED).count(), 11)
+
+    def test_booking_row_errors_do_not_abort_the_batch(self):
+        Booking.objects.create(user=self.manager, branch="Chennai", name="Old", phone="1234567890",
+                               booking_date=self.day, start_time=time(11, 0), end_time=time(12, 0))
+        rows = [
+            self.booking(),                                          # Already booked by the manager
+            self.booking(branch="Mumbai"),                           # No such branch
+            self.booking(start_time="08:00"),                        # Before opening
+            self.booking(user="nobody@example.com"),                 # No such user
+            self.booking(phone="12ab"),                              # Invalid phone
+            self.booking(user="guest@example.com"),
+            self.booking(user="guest@example.com"),                  # Same slot twice in the import
+        ]
+        response = self.client.post(reverse("booking-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [1, 2, 3, 4, 5, 7])
+        self.assertIn("branch", response.data["errors"][1]["errors"])
+        self.assertIn("user", response.data["errors"][3]["errors"])
+
+    def test_booking_import_respects_capacity(self):
+        # 10 tables minus 2 buffer tables, all rows overlap at 11:30
+        rows = [self.booking(start_time=f"11:{i:02d}") for i in range(10)]
+        rows.append(self.booking(start_time="11:20", status=Booking.Status.CANCELED))  # Holds no table
+        response = self.client.post(reverse("booking-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual(response.data["created"], 9)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [9, 10])
+        day = date.fromisoformat(self.day)
+        self.assertEqual(availability_engine.peak("Chennai", day, time(11, 0), time(12, 0)), 8)
+
+    def test_booking_import_refreshes_availability(self):
+        day = date.fromisoformat(self.day)
+        before = availability_engine.peak("Chennai", day, time(11, 0), time(12, 0))
+        self.client.post(reverse("booking-bulk"), [self.booking(), self.booking(user="guest@example.com")], format="json")
+        self.assertEqual(availability_engine.peak("Chennai", day, time(11, 0), time(12, 0)), before + 2)
+
+    def test_invalid_body_and_permissions(self):
+        self.assertEqual(self.client.post(reverse("booking-bulk"), {"name": "x"}, format="json").status_code, 400)
+        response = self.client.post(reverse("booking-bulk"), [self.booking(branch="Mumbai")], format="json")
+        self.assertEqual(response.status_code, 400)
+        with self.settings(IMPORT_MAX_ROWS=1):
+            self.assertEqual(self.client.post(reverse("menu-bulk"), [{}, {}], format="json").status_code, 400)
+
+        self.client.force_authenticate(user=self.guest)
+        self.assertEqual(self.client.post(reverse("booking-bulk"), [self.booking()], format="json").status_code, 403)
+        self.assertEqual(self.client.post(reverse("menu-bulk"), [], format="json").status_code, 403)
@@ -0,0 +1,68 @@
+from unittest import mock, skipUnless
+from django.core.cache import CacheHandler
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import UserRateThrottle
+from Littlelemon.caches import cache_from_url, is_shared
+from Restaurant.cache import get_version, bump_version
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class CacheFromUrlTest(SimpleTestCase):
+    def test_backends(self):
+        redis = cache_from_url("redis://:secret@cache:6379/1", key_prefix="ll", version=3, socket_timeout=0.5)
+        self.assertEqual(redis["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(redis["LOCATION"], "redis://:secret@cache:6379/1")
+        self.assertEqual((redis["KEY_PREFIX"], redis["VERSION"]), ("ll", 3))
+        self.assertEqual(redis["OPTIONS"]["socket_timeout"], 0.5)
+        self.assertEqual(cache_from_url("valkeys://cache:6379/0")["LOCATION"], "rediss://cache:6379/0")
+        self.assertEqual(cache_from_url("file:///var/tmp/ll")["LOCATION"], "/var/tmp/ll")
+        self.assertFalse(is_shared(cache_from_url("")))
+        self.assertTrue(is_shared(cache_from_url("file:///var/tmp/ll")))
+
+    def test_unknown_scheme(self):
+        with self.assertRaises(ImproperlyConfigured):
+            cache_from_url("memcached://cache:11211")
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class SharedRedisCacheTest(SimpleTestCase):
+    """Two cache handlers on one (fake) Redis server stand for two Gunicorn workers"""
+
+    def worker(self, version=1):
+        config = cache_from_url("redis://cache:6379/0", key_prefix="littlelemon-test", version=version)
+        config["OPTIONS"] = {"connection_class": fakeredis.FakeConnection}
+        return CacheHandler({"default": config})
+
+    def setUp(self):
+        self.worker().create_connection("default").clear()
+
+    def test_version_counters_are_shared(self):
+        first, second = self.worker(), self.worker()
+        with mock.patch("Restaurant.cache.caches", first):
+            version = get_version("menu")
+        with mock.patch("Restaurant.cache.caches", second):
+            self.assertEqual(get_version("menu"), version)
+            bump_version("menu")
+        with mock.patch("Restaurant.cache.caches", first):
+            self.assertNotEqual(get_version("menu"), version)
+
+    def test_cache_version_namespaces_keys(self):
+        self.worker(version=1)["default"].set("page", "old release")
+        self.assertIsNone(self.worker(version=2)["default"].get("page"))
+
+    def test_throttle_counts_are_shared(self):
+        request = APIRequestFactory().get("/api/menu")
+        request.user = type("User", (), {"is_authenticated": True, "pk": 1})()
+        allowed = []
+        for worker in (self.worker(), self.worker(), self.worker()):
+            throttle = UserRateThrottle()
+            throttle.cache = worker["default"]
+            throttle.num_requests = 2
+            allowed.append(throttle.allow_request(request, None))
+        self.assertEqual(allowed, [True, True, False])
@@ -0,0 +1,32 @@
+from unittest import mock
+from django.db import connection, connections
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from Restaurant.models import CustomUser
+
+
+class DatabaseStatsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_superuser(email="admin@example.com", password="Passkey@123")
+
+    def test_admin_sees_connection_settings(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("database_stats"))
+        self.assertEqual(response.status_code, 200)
+        default = response.data["databases"]["default"]
+        self.assertEqual(default["conn_max_age"], connection.settings_dict["CONN_MAX_AGE"])
+        self.assertIn(response.data["mode"], ("pool", "persistent", "none"))
+
+    def test_pool_statistics(self):
+        pool = mock.Mock(**{"get_stats.return_value": {"pool_size": 2, "pool_available": 1, "requests_waiting": 0}})
+        self.client.force_authenticate(user=self.admin)
+        with mock.patch.object(connections["default"], "pool", pool, create=True):
+            response = self.client.get(reverse("database_stats"))
+        self.assertEqual(response.data["databases"]["default"]["pool"]["pool_available"], 1)
+
+    def test_only_for_admins(self):
+        self.assertEqual(self.client.get(reverse("database_stats")).status_code, 403)
+        self.client.force_authenticate(user=CustomUser.objects.create_user(email="user@example.com", password="Passkey@123"))
+        self.assertEqual(self.client.get(reverse("database_stats")).status_code, 403)
@@ -0,0 +1,67 @@
+import csv
+from io import StringIO
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_xml.renderers import XMLRenderer
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, Menu, CustomUser
+from Restaurant.export import stream_xml
+
+
+@override_settings(EXPORT_CHUNK_SIZE=3)
+class StreamingExportTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.guest = CustomUser.objects.create_user(email="guest@example.com", password="Passkey@123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        today = date.today()
+        Booking.objects.bulk_create(
+            Booking(user=self.guest if i % 2 else self.manager, branch="Chennai", name=f"Guest {i}", phone="1234567890",
+                    booking_date=today + timedelta(days=10 - i), start_time=time(11, 0), end_time=time(12, 0),
+                    status=Booking.Status.BOOKED)
+            for i in range(10)
+        )
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        return response, chunks
+
+    def test_booking_csv_is_streamed_in_chunks(self):
+        response, chunks = self.export(reverse("booking-export"))
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="bookings.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO("".join(chunks))))
+        self.assertEqual(len(chunks), 4)  # 3 rows per chunk
+        self.assertEqual([row["name"] for row in rows], [f"Guest {i}" for i in range(9, -1, -1)])  # By date
+        self.assertEqual(rows[0]["user"], "guest@example.com")
+        self.assertEqual(rows[0]["message"], "")
+
+    def test_export_applies_filters_and_user_scope(self):
+        _, chunks = self.export(reverse("booking-export"), date_from=(date.today() + timedelta(days=8)).isoformat())
+        self.assertEqual([row["name"] for row in csv.DictReader(StringIO("".join(chunks)))], ["Guest 2", "Guest 1", "Guest 0"])
+
+        self.client.force_authenticate(user=self.guest)
+        _, chunks = self.export(reverse("booking-export"))
+        self.assertEqual({row["user"] for row in csv.DictReader(StringIO("".join(chunks)))}, {"guest@example.com"})
+
+    def test_menu_xml_matches_xml_renderer(self):
+        Menu.objects.create(title="Pasta", description="Penne & cheese", price=10.99, inventory=5)
+        Menu.objects.create(title="Pizza", price=12.99, inventory=8)
+        self.client.force_authenticate(user=None)
+        response, chunks = self.export(reverse("menu-export"), format="xml")
+        self.assertEqual(response["Content-Type"], "application/xml; charset=utf-8")
+        fields = ["id", "title", "description", "category", "price", "inventory", "image_filename"]
+        expected = XMLRenderer().render([dict(zip(fields, row)) for row in Menu.objects.order_by("id").values_list(*fields)])
+        self.assertEqual("".join(chunks), expected)
+
+    def test_stream_xml_without_rows(self):
+        self.assertEqual("".join(stream_xml(["id"], [], 10)), XMLRenderer().render([]))
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, CustomUser
+
+
+class BookingFilterBackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.guest = CustomUser.objects.create_user(email="priya@example.com", password="Passkey@123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        self.today = date.today()
+
+        def book(user, name, phone, days, branch="Chennai", status=Booking.Status.BOOKED):
+            return Booking.objects.create(
+                user=user, branch=branch, name=name, phone=phone, booking_date=self.today + timedelta(days=days),
+                start_time=time(11, 0), end_time=time(12, 0), status=status,
+            )
+
+        self.john = book(self.manager, "John Doe", "9876543210", 1)
+        self.jane = book(self.manager, "Jane Roe", "9123456780", 5, branch="Vellore", status=Booking.Status.CANCELED)
+        self.priya = book(self.guest, "Priya", "9000011111", 10)
+
+    def names(self, **params):
+        response = self.client.get(reverse("booking-list"), {"ordering": "booking_date", **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [booking["name"] for booking in response.data["results"]]
+
+    def test_date_range(self):
+        self.assertEqual(self.names(date_from=(self.today + timedelta(days=2)).isoformat()), ["Jane Roe", "Priya"])
+        self.assertEqual(self.names(date_to=(self.today + timedelta(days=5)).isoformat()), ["John Doe", "Jane Roe"])
+
+    def test_status_and_branch(self):
+        self.assertEqual(self.names(status="canceled"), ["Jane Roe"])
+        self.assertEqual(self.names(status="BOOKED,CANCELED"), ["John Doe", "Jane Roe", "Priya"])
+        self.assertEqual(self.names(branch="Chennai"), ["John Doe", "Priya"])
+
+    def test_search_name_phone_and_email(self):
+        self.assertEqual(self.names(search="doe"), ["John Doe"])
+        self.assertEqual(self.names(search="91234"), ["Jane Roe"])
+        self.assertEqual(self.names(search="priya@"), ["Priya"])
+        self.assertEqual(self.names(search="manager"), ["John Doe", "Jane Roe"])
+        # Every term has to match
+        self.assertEqual(self.names(search="manager roe"), ["Jane Roe"])
+
+    def test_filters_combine_with_keyset_pagination(self):
+        self.assertEqual(self.names(search="manager", status="BOOKED", pagination="cursor"), ["John Doe"])
+
+    def test_invalid_values_are_rejected(self):
+        url = reverse("booking-list")
+        self.assertEqual(self.client.get(url, {"date_from": "tomorrow"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"status": "LOST"}).status_code, 400)
+
+    def test_normal_users_only_search_their_bookings(self):
+        self.client.force_authenticate(user=self.guest)
+        self.assertEqual(self.names(search="doe"), [])
+        self.assertEqual(self.names(search="priya"), ["Priya"])
+
+    def test_trigram_indexes_are_postgresql_only(self):
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, "Restaurant_booking")
+        self.assertEqual("booking_name_trgm" in indexes, connection.vendor == "postgresql")  # Migration 0007
@@ -0,0 +1,71 @@
+import threading
+from io import StringIO
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from Restaurant.hashers import MIN_MEMORY_COST, calibrate, offload_hashing
+from Restaurant.models import CustomUser
+
+FAST_ARGON2 = {"ARGON2_TIME_COST": 1, "ARGON2_MEMORY_COST": MIN_MEMORY_COST, "ARGON2_PARALLELISM": 1}
+
+
+def argon2_params(encoded):
+    decoded = get_hasher("argon2").decode(encoded)
+    return decoded["time_cost"], decoded["memory_cost"], decoded["parallelism"]
+
+
+@override_settings(**FAST_ARGON2)
+class ConfigurableArgon2Test(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+
+    def test_cost_from_settings(self):
+        self.assertEqual(argon2_params(self.user.password), (1, MIN_MEMORY_COST, 1))
+        with override_settings(ARGON2_TIME_COST=2):
+            self.assertEqual(argon2_params(make_password("Passkey@123")), (2, MIN_MEMORY_COST, 1))
+
+    @override_settings(ARGON2_TIME_COST=2)
+    def test_rehash_on_login(self):
+        response = self.client.post(reverse("login"), {"email": "user@example.com", "password": "Passkey@123"})
+        self.assertEqual(response.status_code, 302)
+        self.user.refresh_from_db()
+        self.assertEqual(argon2_params(self.user.password), (2, MIN_MEMORY_COST, 1))
+
+    @override_settings(ARGON2_PARALLELISM=2)
+    def test_rehash_on_token(self):
+        response = self.client.post(reverse("token_obtain_pair"), {"email": "user@example.com", "password": "Passkey@123"})
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(argon2_params(self.user.password), (1, MIN_MEMORY_COST, 2))
+        self.assertTrue(self.user.check_password("Passkey@123"))
+
+    def test_calibrate(self):
+        time_cost, memory_cost, ms, trials = calibrate(0.001, MIN_MEMORY_COST * 2, 1, samples=1)
+        self.assertEqual((time_cost, memory_cost), (1, MIN_MEMORY_COST))  # Too slow even at the cheapest
+        self.assertEqual([trial[:2] for trial in trials], [(1, MIN_MEMORY_COST * 2), (1, MIN_MEMORY_COST), (2, MIN_MEMORY_COST)])
+        out = StringIO()
+        call_command("calibrate_argon2", target_ms=20, memory_cost=MIN_MEMORY_COST, parallelism=1, samples=1, stdout=out)
+        self.assertIn("ARGON2_MEMORY_COST=19456", out.getvalue())
+
+
+class OffloadHashingTest(TestCase):
+    @staticmethod
+    @csrf_exempt
+    def view(request):
+        return HttpResponse(threading.current_thread().name)
+
+    @override_settings(PASSWORD_HASH_OFFLOAD=False)
+    def test_off(self):
+        self.assertIs(offload_hashing(self.view), self.view)
+
+    @override_settings(PASSWORD_HASH_OFFLOAD=True)
+    def test_runs_in_pool(self):
+        offloaded = offload_hashing(self.view)
+        self.assertTrue(iscoroutinefunction(offloaded))
+        self.assertTrue(offloaded.csrf_exempt)
+        response = async_to_sync(offloaded)(RequestFactory().get("/login/"))
+        self.assertTrue(response.content.decode().startswith("password-hash"))
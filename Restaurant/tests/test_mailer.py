@@ -0,0 +1,116 @@
+from unittest import mock
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+import requests
+from Restaurant.models import OutboundMessage, Restaurant, CustomUser
+from Restaurant.registry import branch_registry
+from Restaurant.mailer import LocmemTransport, MailgunTransport, MailError, send_queued_mail
+from Restaurant.utils import send_mailgun_email
+
+
+class FlakyTransport:
+    """Fails the first `failures` sends"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise MailError("Mailgun returned 503")
+        self.sent.append(message)
+
+    def close(self):
+        pass
+
+
+@override_settings(MAIL_TRANSPORT="Restaurant.mailer.LocmemTransport", MAIL_MAX_ATTEMPTS=3, MAIL_RETRY_BACKOFF_SECONDS=60)
+class OutboundMailTest(TestCase):
+    def setUp(self):
+        LocmemTransport.outbox.clear()
+
+    def test_send_mailgun_email_only_queues(self):
+        with mock.patch.object(requests.Session, "request") as request:
+            message = send_mailgun_email("Hello", "Body", "guest@example.com")
+        request.assert_not_called()
+        self.assertEqual(message.status, OutboundMessage.Status.PENDING)
+        self.assertEqual(OutboundMessage.objects.count(), 1)
+
+    def test_worker_command_sends_queued_mail(self):
+        for i in range(3):
+            send_mailgun_email(f"Hello {i}", "Body", "guest@example.com")
+        out = StringIO()
+        call_command("send_queued_mail", "--batch-size", "2", stdout=out)
+        self.assertIn("Sent 3 message(s), 0 failed", out.getvalue())
+        self.assertEqual([message.subject for message in LocmemTransport.outbox], ["Hello 0", "Hello 1", "Hello 2"])
+        self.assertEqual(OutboundMessage.objects.filter(status=OutboundMessage.Status.SENT).count(), 3)
+
+    def test_failures_are_retried_with_backoff(self):
+        message = send_mailgun_email("Hello", "Body", "guest@example.com")
+        transport = FlakyTransport(failures=1)
+
+        self.assertEqual(send_queued_mail(transport, 10), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboundMessage.Status.PENDING)
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(message.last_error, "Mailgun returned 503")
+        self.assertGreater(message.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        # Not due yet
+        self.assertEqual(send_queued_mail(transport, 10), (0, 0))
+        OutboundMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_queued_mail(transport, 10), (1, 0))
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboundMessage.Status.SENT)
+        self.assertEqual(message.attempts, 2)
+
+    def test_gives_up_after_max_attempts(self):
+        message = send_mailgun_email("Hello", "Body", "guest@example.com")
+        transport = FlakyTransport(failures=10)
+        for _ in range(3):
+            OutboundMessage.objects.update(next_attempt_at=timezone.now())
+            send_queued_mail(transport, 10)
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboundMessage.Status.FAILED)
+        self.assertEqual(message.attempts, 3)
+
+    @override_settings(MAIL_TIMEOUT_SECONDS=4)
+    def test_mailgun_transport_uses_timeout(self):
+        message = OutboundMessage(to_email="guest@example.com", subject="Hello", body="Body")
+        transport = MailgunTransport()
+        with mock.patch.object(transport.session, "post") as post:
+            post.return_value.status_code = 200
+            transport.send(message)
+            self.assertEqual(post.call_args.kwargs["timeout"], 4)
+            self.assertEqual(post.call_args.kwargs["data"]["to"], "guest@example.com")
+
+            post.return_value.status_code = 401
+            with self.assertRaises(MailError):
+                transport.send(message)
+
+    def test_booking_queues_confirmation(self):
+        branch_registry.invalidate()
+        Restaurant.objects.create(branch="Chennai", phone="8346751234", opening_time=time(10, 0), closing_time=time(22, 0), no_of_tables=5)
+        user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        payload = {
+            "branch": "Chennai",
+            "name": "John Doe",
+            "phone": "1234567890",
+            "no_of_guests": 2,
+            "booking_date": (date.today() + timedelta(days=1)).isoformat(),
+            "start_time": "11:00",
+            "end_time": "12:00",
+        }
+        response = client.post(reverse("booking-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        message = OutboundMessage.objects.get()
+        self.assertEqual(message.to_email, "user@example.com")
+        self.assertIn("11:00 AM", message.body)
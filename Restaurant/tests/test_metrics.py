@@ -0,0 +1,121 @@
+from datetime import date, time, timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from Restaurant.availability import availability_engine
+from Restaurant.metrics import metrics_registry, QueryBudgetExceeded, QueryRecorder
+from Restaurant.models import CustomUser, Menu, Restaurant
+from Restaurant.registry import branch_registry
+from Restaurant.serializers import RoleTokenObtainPairSerializer
+
+
+@api_view(["GET"])
+def ping(request):
+    return Response({"ping": "pong"})
+
+
+@api_view(["GET", "POST"])
+def echo(request):
+    return Response(request.data)
+
+
+urlpatterns = [path("ping/", ping), path("echo/", echo), path("", include("Littlelemon.urls"))]
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.clear()
+        branch_registry.invalidate()
+        availability_engine.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        Restaurant.objects.create(branch="Chennai", phone="1234567890", no_of_tables=5, opening_time=time(10, 0), closing_time=time(22, 0))
+        for i in range(5):
+            Menu.objects.create(title=f"Pasta {i}", price="10.99", inventory=i)
+        self.client = APIClient()
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RoleTokenObtainPairSerializer.get_token(self.user).access_token}")
+
+
+@override_settings(QUERY_BUDGET_MODE="raise")
+class QueryBudgetTest(MetricsTestCase):
+    """The hot endpoints stay within QUERY_BUDGETS (the middleware raises QueryBudgetExceeded otherwise)"""
+
+    def test_booking_create(self):
+        self.authenticate()
+        for hour in (11, 12):  # Cold, then warm caches
+            response = self.client.post(reverse("booking-list"), {
+                "branch": "Chennai", "name": "Guest", "phone": "1234567890", "no_of_guests": 2,
+                "booking_date": date.today() + timedelta(days=1), "start_time": time(hour, 0), "end_time": time(hour, 30),
+            }, format="json")
+            self.assertEqual(response.status_code, 201, response.content)
+
+    def test_booking_reads(self):
+        self.authenticate()
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse("booking-list")).status_code, 200)
+            self.assertEqual(self.client.get(reverse("booking-branches")).status_code, 200)
+            self.assertEqual(self.client.get(reverse("booking-working-hours"), {"branch": "Chennai"}).status_code, 200)
+        self.assertIn("BookingViewSet.working_hours", metrics_registry.views)
+
+    def test_menu(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse("menu")).status_code, 200)
+            self.assertEqual(self.client.get(reverse("menu-list")).status_code, 200)
+            self.assertEqual(self.client.get(reverse("menu-detail", args=[Menu.objects.first().pk])).status_code, 200)
+
+    def test_login(self):
+        self.assertEqual(self.client.post(reverse("login"), {"email": "user@example.com", "password": "Passkey@123"}).status_code, 302)
+        response = self.client.post(reverse("token_obtain_pair"), {"email": "user@example.com", "password": "Passkey@123"})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_BUDGETS={"MenuViewSet.list": 0}, API_CACHE_SECONDS=0)
+    def test_over_budget_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "MenuViewSet.list ran 2 queries, over its budget of 0"):
+            self.client.get(reverse("menu-list"))
+
+
+class MetricsMiddlewareTest(MetricsTestCase):
+    def test_view_names(self):
+        self.client.get(reverse("menu-list"))
+        self.client.get(reverse("about"))
+        self.client.get(reverse("user_sign_up"))
+        self.client.get("/api/nothing-here")
+        self.assertLessEqual({"MenuViewSet.list", "about", "UserSignUpView.get", "<unresolved>"}, set(metrics_registry.views))
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_function_view_names(self):
+        self.client.get("/ping/")
+        self.client.post("/echo/", {"a": 1}, format="json")
+        self.client.get(reverse("database_stats"))
+        self.assertLessEqual({"ping", "echo", "database_stats"}, set(metrics_registry.views))
+
+    def test_repeated_queries(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for menu in Menu.objects.all():
+                Menu.objects.filter(pk=menu.pk).exists()
+        self.assertEqual(recorder.count, 6)
+        self.assertEqual(list(recorder.repeated().values()), [5])
+
+    def test_prometheus_endpoint(self):
+        self.client.get(reverse("menu-list"))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.client.force_login(CustomUser.objects.create_superuser(email="admin@example.com", password="Passkey@123"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('littlelemon_requests_total{view="MenuViewSet.list",status="200"} 1', body)
+        self.assertIn('littlelemon_request_duration_seconds_bucket{view="MenuViewSet.list",le="+Inf"} 1', body)
+        self.assertIn('littlelemon_request_recent_duration_seconds{view="MenuViewSet.list",quantile="0.99"}', body)
+        self.assertIn('littlelemon_request_queries_sum{view="MenuViewSet.list"} 2', body)
+
+    @override_settings(METRICS_TOKEN="scraper-secret")
+    def test_prometheus_token(self):
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scraper-secret").status_code, 200)
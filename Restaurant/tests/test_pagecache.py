@@ -0,0 +1,72 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from Restaurant.models import Menu, CustomUser
+
+
+class PublicPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.menu = Menu.objects.create(title="Pasta", price=10.99, inventory=5)
+        self.url = reverse("menu")
+
+    def test_anonymous_menu_page_is_served_from_cache(self):
+        with self.assertNumQueries(1):
+            first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertContains(second, "Pasta")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_conditional_get_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_menu_change_invalidates_page(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.menu.price = 11.99
+        self.menu.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "11.99")
+
+        Menu.objects.create(title="Pizza", price=12.99, inventory=8)
+        self.assertContains(self.client.get(self.url), "Pizza")
+        self.menu.delete()
+        self.assertNotContains(self.client.get(self.url), "Pasta")
+
+    def test_menu_api_write_invalidates_page(self):
+        self.client.get(self.url)
+        manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        api = APIClient()
+        api.force_authenticate(user=manager)
+        response = api.patch(reverse("menu-detail", args=[self.menu.pk]), {"title": "Penne"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(self.client.get(self.url), "Penne")
+
+    def test_signed_in_users_are_not_served_cached_pages(self):
+        self.client.get(self.url)
+        user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        self.client.force_login(user)
+        response = self.client.get(self.url)
+        self.assertIn("menu_list", response.context)
+        self.assertTrue(response.has_header("ETag"))
+
+    @override_settings(PAGE_CACHE_SECONDS=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_static_pages_are_cached(self):
+        for name in ("home", "about", "terms_n_conditions"):
+            first = self.client.get(reverse(name))
+            second = self.client.get(reverse(name))
+            self.assertIsNone(second.context)
+            self.assertEqual(first.content, second.content)
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, CustomUser
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+        today = date.today()
+        # 25 bookings over 4 dates, inserted out of date order so ties on booking_date are broken by id
+        Booking.objects.bulk_create(
+            Booking(user=self.manager, branch="Chennai", name=f"Guest {i}", phone="1234567890",
+                    booking_date=today + timedelta(days=(i * 7) % 4), start_time=time(11, 0), end_time=time(12, 0))
+            for i in range(25)
+        )
+        self.expected = list(Booking.objects.order_by("booking_date", "id").values_list("id", flat=True))
+        self.url = reverse("booking-list")
+
+    def walk(self, url, link="next", key="id"):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([item[key] for item in response.data["results"]])
+            url = response.data[link]
+        return pages
+
+    def test_walks_every_booking_once_in_order(self):
+        pages = self.walk(f"{self.url}?pagination=cursor")
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_links_return_the_same_pages(self):
+        forward = self.walk(f"{self.url}?pagination=cursor")
+        last_page = self.client.get(f"{self.url}?pagination=cursor").data
+        last_page = self.client.get(self.client.get(last_page["next"]).data["next"]).data
+        self.assertIsNone(last_page["next"])
+        backward = self.walk(last_page["previous"], link="previous")
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_descending_ordering(self):
+        pages = self.walk(f"{self.url}?pagination=cursor&ordering=-booking_date")
+        self.assertEqual(sum(pages, []), self.expected[::-1])
+
+    def test_no_count_or_offset_queries(self):
+        first = self.client.get(f"{self.url}?pagination=cursor").data
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(first["next"])
+        self.assertNotIn("count", response.data)
+        booking_queries = [query["sql"] for query in queries.captured_queries if '"Restaurant_booking"' in query["sql"]]
+        self.assertEqual(len(booking_queries), 1)
+        self.assertNotIn("COUNT(", booking_queries[0])
+        self.assertNotIn("OFFSET", booking_queries[0])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(f"{self.url}?cursor=not-a-cursor").status_code, 404)
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 25)
+        self.assertIn("page=2", response.data["next"])
+
+    def test_users_are_paginated_by_email(self):
+        CustomUser.objects.bulk_create(CustomUser(email=f"guest{i:02}@example.com") for i in range(12))
+        pages = self.walk(f"{reverse('customuser-list')}?pagination=cursor", key="email")
+        self.assertEqual([len(page) for page in pages], [10, 3])
+        self.assertEqual(sum(pages, []), sorted(CustomUser.objects.values_list("email", flat=True)))
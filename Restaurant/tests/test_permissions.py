@@ -0,0 +1,132 @@
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import connection
+from django.db.models.signals import m2m_changed
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+from Restaurant.models import Restaurant, Booking, CustomUser
+from Restaurant.registry import branch_registry
+from Restaurant.roles import get_user_roles, BRANCH_MANAGER, TOKEN_CLAIM
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def group_queries(queries):
+    return [query for query in queries.captured_queries if '"auth_group"' in query["sql"]]
+
+
+class UserRolesTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.group = Group.objects.create(name=BRANCH_MANAGER)
+        self.user = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+
+    def test_roles_are_cached(self):
+        self.user.groups.add(self.group)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_roles(self.user.pk), {BRANCH_MANAGER})
+            self.assertEqual(get_user_roles(self.user.pk), {BRANCH_MANAGER})
+
+    def test_invalidated_on_membership_change(self):
+        self.assertEqual(get_user_roles(self.user.pk), set())
+        self.user.groups.add(self.group)
+        self.assertEqual(get_user_roles(self.user.pk), {BRANCH_MANAGER})
+        self.user.groups.remove(self.group)
+        self.assertEqual(get_user_roles(self.user.pk), set())
+
+        # Membership changed from the group's side
+        self.group.user_set.add(self.user)
+        self.assertEqual(get_user_roles(self.user.pk), {BRANCH_MANAGER})
+        self.group.user_set.clear()
+        self.assertEqual(get_user_roles(self.user.pk), set())
+
+    def test_invalidated_after_clear(self):
+        def read_roles(action, **kwargs):  # A concurrent request between pre_clear and the delete
+            if action == "pre_clear":
+                get_user_roles(self.user.pk)
+
+        m2m_changed.connect(read_roles, sender=CustomUser.groups.through)
+        self.addCleanup(m2m_changed.disconnect, read_roles, sender=CustomUser.groups.through)
+        for clear in (self.user.groups.clear, self.group.user_set.clear):
+            self.user.groups.add(self.group)
+            clear()
+            self.assertEqual(get_user_roles(self.user.pk), set())
+
+    def test_invalidated_on_group_rename(self):
+        self.user.groups.add(self.group)
+        get_user_roles(self.user.pk)
+        self.group.name = "Chef"
+        self.group.save()
+        self.assertEqual(get_user_roles(self.user.pk), {"Chef"})
+
+
+class BookingPermissionQueriesTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        branch_registry.invalidate()
+        Restaurant.objects.create(branch="Chennai", phone="8346751234", opening_time=time(10, 0), closing_time=time(22, 0))
+        self.manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.manager.groups.add(Group.objects.create(name=BRANCH_MANAGER))
+        self.payload = {
+            "branch": "Chennai",
+            "name": "John Doe",
+            "phone": "1234567890",
+            "no_of_guests": 2,
+            "booking_date": (date.today() + timedelta(days=1)).isoformat(),
+            "start_time": "11:00",
+            "end_time": "12:00",
+        }
+        self.booking = Booking.objects.create(user=self.manager, status=Booking.Status.BOOKED, **self.payload)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+
+    def update_group_queries(self, start_time, end_time):
+        payload = {**self.payload, "start_time": start_time, "end_time": end_time, "status": Booking.Status.CANCELED}
+        url = reverse("booking-detail", args=[self.booking.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return group_queries(queries)
+
+    def test_update_resolves_roles_at_most_once(self):
+        self.assertEqual(len(self.update_group_queries("13:00", "14:00")), 1)
+        self.assertEqual(len(self.update_group_queries("15:00", "16:00")), 0)
+
+
+class RoleTokenClaimTest(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.group = Group.objects.create(name=BRANCH_MANAGER)
+        self.user = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        self.user.groups.add(self.group)
+        self.client = APIClient()
+
+    def obtain(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"), {"email": "manager@example.com", "password": "Passkey@123"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_obtained_token_carries_roles(self):
+        access = AccessToken(self.obtain()["access"])
+        self.assertEqual(access[TOKEN_CLAIM], [BRANCH_MANAGER])
+
+    def test_refreshed_token_carries_current_roles(self):
+        refresh = self.obtain()["refresh"]
+        self.user.groups.remove(self.group)
+        response = self.client.post(reverse("token_refresh"), {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data["access"])[TOKEN_CLAIM], [])
+
+    @override_settings(ROLES_TRUST_TOKEN_CLAIM=True)
+    def test_trusted_claim_skips_group_lookup(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.obtain()['access']}")
+        caches["default"].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("restaurant-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(group_queries(queries), [])
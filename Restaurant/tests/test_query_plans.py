@@ -0,0 +1,91 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from datetime import date, time, timedelta
+from Restaurant.models import Booking, CustomUser
+from Restaurant.availability import load_day
+from Restaurant.serializers import BookingSerializer
+
+BRANCHES = ["Chennai", "Vellore", "Mumbai", "Delhi", "Pune"]
+DAYS = 60
+STATUSES = [Booking.Status.BOOKED, Booking.Status.BOOKED, Booking.Status.CANCELED, Booking.Status.FAILED]
+
+
+class BookingQueryPlanTest(TestCase):
+    """
+    Seed a large synthetic booking table and check with EXPLAIN that the hot
+    booking queries are answered from their indexes rather than a table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = CustomUser.objects.bulk_create(CustomUser(email=f"guest{i}@example.com") for i in range(200))
+        today = date.today()
+        bookings = []
+        for i in range(20000):
+            start = 10 * 60 + (i % 20) * 30
+            bookings.append(Booking(
+                user=cls.users[i % len(cls.users)],
+                branch=BRANCHES[i % len(BRANCHES)],
+                name=f"Guest {i}",
+                phone="1234567890",
+                booking_date=today + timedelta(days=(i // 7) % DAYS),
+                start_time=time(start // 60, start % 60),
+                end_time=time((start + 60) // 60, (start + 60) % 60),
+                status=STATUSES[i % len(STATUSES)],
+            ))
+        Booking.objects.bulk_create(bookings, batch_size=2000)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.day = today + timedelta(days=3)
+
+    def setUp(self):
+        cache.clear()  # Bulk-created users get no signals, so drop roles cached for reused ids
+
+    def plans(self, run):
+        """Run the callable and return the EXPLAIN output of every query it made on the booking table"""
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        plans = []
+        for query in queries.captured_queries:
+            if query["sql"].startswith("SELECT") and '"Restaurant_booking"' in query["sql"]:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{connection.ops.explain_query_prefix()} {query['sql']}")
+                    plans.append("\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall()))
+        self.assertTrue(plans, "no booking query was made")
+        return plans
+
+    def assertUsesIndex(self, plan, index_name):
+        self.assertIn(index_name, plan, f"expected an index scan on {index_name}, got:\n{plan}")
+
+    def test_capacity_check_uses_booked_slot_index(self):
+        for plan in self.plans(lambda: load_day("Chennai", self.day, time(12, 0), time(13, 0))):
+            self.assertUsesIndex(plan, "booking_booked_slot")
+
+    def test_duplicate_check_uses_user_slot_index(self):
+        request = APIRequestFactory().post("/api/booking")
+        request.user = self.users[0]
+        serializer = BookingSerializer(context={"request": request})
+        attrs = {"booking_date": self.day, "start_time": time(12, 0), "end_time": time(13, 0)}
+        for plan in self.plans(lambda: serializer.validate(attrs)):
+            self.assertUsesIndex(plan, "booking_user_slot")
+
+    def test_own_bookings_by_date_use_user_slot_index(self):
+        client = APIClient()
+        client.force_authenticate(user=self.users[0])
+        run = lambda: client.get(reverse("booking-list"), {"ordering": "booking_date"})
+        for plan in self.plans(run):
+            self.assertUsesIndex(plan, "booking_user_slot")
+
+    def test_deep_keyset_page_uses_date_index(self):
+        manager = self.users[1]
+        manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        cursor = client.get(reverse("booking-list"), {"pagination": "cursor"}).data["next"]
+        for plan in self.plans(lambda: client.get(cursor)):
+            self.assertUsesIndex(plan, "booking_date_id")
@@ -0,0 +1,63 @@
+from datetime import date, time
+from unittest.mock import patch
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+import rest_framework.reverse as drf_reverse
+from Restaurant.models import Menu, CustomUser, Restaurant, Holiday
+from Restaurant.readers import ValuesReadMixin, get_reader
+from Restaurant.renderers import api_renderers
+from Restaurant.serializers import MenuSerializer, UserSerializer
+from Restaurant.views import MenuViewSet
+
+
+@override_settings(API_CACHE_SECONDS=0)
+class ValuesReadTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            Menu.objects.create(title=f"Pasta {i}", description="", category="Main", price=f"1{i}.5", inventory=i)
+        Restaurant.objects.create(branch="Chennai", address="", phone="1234567890", opening_time=time(10, 0), closing_time=time(22, 30))
+        Holiday.objects.create(holiday_date=date(2025, 12, 25), description="Christmas")
+        manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.client = APIClient()
+        self.client.force_authenticate(user=manager)
+
+    def assertSameAsSerializer(self, url, params=None):
+        fast = self.client.get(url, params)
+        with patch.object(ValuesReadMixin, "values_read", False):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_output_is_byte_identical(self):
+        menu = Menu.objects.first()
+        for url in (reverse("menu-list"), reverse("menu-detail", args=[menu.pk]), f"/api/menu/{menu.pk}.json",
+                    reverse("restaurant-list"), reverse("holiday-list")):
+            for params in (None, {"format": "xml"}, {"ordering": "-price", "page": 1}):
+                if "xml" in str(params) and not url.startswith("/api/menu"):
+                    continue  # Restaurant and holiday only render JSON
+                self.assertSameAsSerializer(url, params)
+
+    def test_one_reverse_per_page(self):
+        with patch.object(drf_reverse, "_reverse", wraps=drf_reverse._reverse) as reverse_:
+            response = self.client.get(reverse("menu-list"))
+        self.assertEqual(len(response.json()["results"]), 3)
+        self.assertEqual(reverse_.call_count, 1)
+
+    def test_browsable_api_keeps_the_serializer(self):
+        with patch.object(MenuViewSet, "renderer_classes", api_renderers("api")):
+            response = self.client.get(reverse("menu-list"), HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(type(response.data["results"].serializer.child), MenuSerializer)
+
+    def test_reader_compiles_plain_columns(self):
+        reader = get_reader(MenuSerializer)
+        self.assertIs(get_reader(MenuSerializer), reader)
+        self.assertEqual(reader.columns, ["id", "title", "description", "category", "price", "inventory", "image_filename"])
+        with self.assertRaises(ImproperlyConfigured):
+            get_reader(UserSerializer)  # groups is a relation
@@ -0,0 +1,80 @@
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import date, time, timedelta
+from Restaurant.models import Restaurant, CustomUser
+from Restaurant.registry import branch_registry
+from Restaurant.utils import get_working_hours
+
+
+class BranchRegistryTest(TestCase):
+    def setUp(self):
+        branch_registry.invalidate()
+        self.restaurant = Restaurant.objects.create(
+            branch="Chennai",
+            phone="8346751234",
+            opening_time=time(10, 0),
+            closing_time=time(22, 0),
+        )
+
+    def test_branches_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(branch_registry.branches(), ["Chennai"])
+            self.assertEqual(branch_registry.get("Chennai"), self.restaurant)
+            self.assertIsNone(branch_registry.get("Mumbai"))
+            self.assertEqual(get_working_hours("Chennai"), ("10:00", "22:00"))
+
+    def test_invalidated_on_save_and_delete(self):
+        branch_registry.branches()
+        self.restaurant.closing_time = time(23, 0)
+        self.restaurant.save()
+        self.assertEqual(get_working_hours("Chennai"), ("10:00", "23:00"))
+
+        Restaurant.objects.create(branch="Vellore", phone="8346751234")
+        self.assertEqual(branch_registry.branches(), ["Chennai", "Vellore"])
+
+        self.restaurant.delete()
+        self.assertEqual(branch_registry.branches(), ["Vellore"])
+
+    @override_settings(BRANCH_REGISTRY_CACHE="default")
+    def test_shared_cache_version_invalidates_other_processes(self):
+        branch_registry.branches()
+        # Simulate another worker updating the branch: only the shared version changes here
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(closing_time=time(20, 0))
+        self.assertEqual(get_working_hours("Chennai"), ("10:00", "22:00"))
+        from Restaurant.cache import bump_version
+        from Restaurant.registry import VERSION_NAME
+        bump_version(VERSION_NAME, "default")
+        self.assertEqual(get_working_hours("Chennai"), ("10:00", "20:00"))
+
+
+class BookingRestaurantLookupTest(TestCase):
+    def setUp(self):
+        branch_registry.invalidate()
+        Restaurant.objects.create(branch="Chennai", phone="8346751234", no_of_tables=5)
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.payload = {
+            "branch": "Chennai",
+            "name": "John Doe",
+            "phone": "1234567890",
+            "no_of_guests": 2,
+            "booking_date": (date.today() + timedelta(days=1)).isoformat(),
+            "start_time": "11:00",
+            "end_time": "12:00",
+        }
+
+    def restaurant_queries(self, payload):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("booking-list"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return [query for query in queries.captured_queries if '"Restaurant_restaurant"' in query["sql"]]
+
+    def test_booking_post_does_at_most_one_restaurant_lookup(self):
+        branch_registry.invalidate()
+        self.assertEqual(len(self.restaurant_queries(self.payload)), 1)
+        self.assertEqual(len(self.restaurant_queries({**self.payload, "start_time": "13:00", "end_time": "14:00"})), 0)
@@ -0,0 +1,52 @@
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipUnless
+from uuid import uuid4
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from datetime import date, time, datetime, timezone
+from Restaurant.models import CustomUser
+from Restaurant.renderers import FastJSONRenderer, FastJSONParser, orjson
+
+
+@skipUnless(orjson, "orjson is not installed")
+class FastJSONTest(SimpleTestCase):
+    def assertSameAsDRF(self, data, accepted_media_type=None):
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), JSONRenderer().render(data, accepted_media_type))
+
+    def test_matches_drf_output(self):
+        self.assertSameAsDRF({
+            "price": Decimal("10.99"), "booking_date": date(2025, 5, 1), "start_time": time(11, 30),
+            "created": datetime(2025, 5, 1, 11, 30, 15, 123456, tzinfo=timezone.utc), "naive": datetime(2025, 5, 1, 11, 30),
+            "id": uuid4(), "name": "Caf\u00e9 \u2028 Lemon \u2029", "label": gettext_lazy("Booked"), 1: [None, True, 1.5],
+        })
+        self.assertSameAsDRF([{"title": "Pasta", "price": "10.99"}] * 100)
+        self.assertSameAsDRF({"nested": {"big": 2 ** 70}})  # Beyond orjson, stdlib fallback
+        self.assertSameAsDRF({"a": [1, 2]}, "application/json; indent=4")
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_parser(self):
+        body = '{"title": "Café", "price": 10.99}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"price": NaN}'))
+
+
+class RendererNegotiationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=CustomUser.objects.create_superuser(email="admin@example.com", password="Passkey@123"))
+
+    def test_json_is_the_default(self):
+        response = self.client.get(reverse("customuser-list"), HTTP_ACCEPT="text/html")
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_file_formats_are_opt_in_per_viewset(self):
+        self.assertEqual(self.client.get(reverse("menu-list"), {"format": "csv"}).status_code, 200)
+        self.assertEqual(self.client.get(reverse("booking-list"), {"format": "xml"}).status_code, 200)
+        self.assertEqual(self.client.get(reverse("customuser-list"), {"format": "xml"}).status_code, 404)
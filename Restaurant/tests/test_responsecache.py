@@ -0,0 +1,77 @@
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from Restaurant.models import Menu, CustomUser
+
+
+class MenuResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.pasta = Menu.objects.create(title="Pasta", category="Main", price=10.99, inventory=5)
+        self.pizza = Menu.objects.create(title="Pizza", category="Main", price=12.99, inventory=8)
+        self.client = APIClient()
+        self.url = reverse("menu-list")
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(second.json()["count"], 2)
+
+    def test_retrieve_is_served_from_cache(self):
+        url = reverse("menu-detail", args=[self.pasta.pk])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["title"], "Pasta")
+
+    def test_query_params_are_part_of_the_key(self):
+        titles = lambda response: [item["title"] for item in response.json()["results"]]
+        self.assertEqual(titles(self.client.get(self.url, {"ordering": "-price"})), ["Pizza", "Pasta"])
+        self.assertEqual(titles(self.client.get(self.url, {"ordering": "price"})), ["Pasta", "Pizza"])
+        self.assertEqual(titles(self.client.get(self.url, {"search": "piz"})), ["Pizza"])
+        # Parameter order and empty values do not matter
+        self.client.get(self.url, {"search": "piz", "ordering": "price"})
+        with self.assertNumQueries(0):
+            self.client.get(f"{self.url}?ordering=price&page=&search=piz")
+
+    def test_conditional_get_for_every_renderer(self):
+        for params in ({}, {"format": "csv"}, {"format": "xml"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            not_modified = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(not_modified.status_code, 304)
+        csv = self.client.get(self.url, {"format": "csv"})
+        self.assertTrue(csv["Content-Type"].startswith("text/csv"))
+        self.assertNotEqual(csv["ETag"], self.client.get(self.url)["ETag"])
+
+    def test_menu_write_invalidates_cache(self):
+        etag = self.client.get(self.url)["ETag"]
+        manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        self.client.force_authenticate(user=manager)
+        response = self.client.patch(reverse("menu-detail", args=[self.pasta.pk]), {"price": "9.50"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("9.50", [item["price"] for item in response.json()["results"]])
+
+        self.pizza.delete()
+        self.assertEqual(self.client.get(self.url).json()["count"], 1)
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get(self.url, HTTP_ACCEPT="text/html")
+        response = self.client.get(self.url, HTTP_ACCEPT="text/html")
+        self.assertIn("view", response.renderer_context)
+
+    @override_settings(API_CACHE_SECONDS=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
@@ -0,0 +1,62 @@
+from io import StringIO
+from datetime import timedelta
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from Restaurant.models import CustomUser
+from Restaurant.sessions import purge_expired_sessions
+
+
+class SessionEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email="user@example.com", password="Passkey@123")
+
+    def page_queries(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("about"))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse("about")).status_code, 200)
+        return [query["sql"] for query in queries if "django_session" in query["sql"]]
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_db_sessions_query_every_request(self):
+        self.assertEqual(len(self.page_queries()), 1)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_cached_db_sessions_are_read_from_the_cache(self):
+        self.assertEqual(self.page_queries(), [])
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_signed_cookie_sessions(self):
+        self.assertEqual(self.page_queries(), [])
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+class PurgeSessionsTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            Session(session_key=f"expired{i}", session_data="", expire_date=now - timedelta(days=1)) for i in range(5)
+        )
+        Session.objects.create(session_key="active", session_data="", expire_date=now + timedelta(days=1))
+
+    def test_purge_in_batches(self):
+        with self.assertNumQueries(6):  # 3 batches of (select ids, delete)
+            self.assertEqual(purge_expired_sessions(batch_size=2), 5)
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["active"])
+
+    def test_command(self):
+        out = StringIO()
+        call_command("purge_sessions", "--batch-size", "10", stdout=out)
+        self.assertIn("Deleted 5 expired session(s)", out.getvalue())
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cache")
+    def test_cache_sessions_have_nothing_to_purge(self):
+        self.assertEqual(purge_expired_sessions(batch_size=2), 0)
+        self.assertEqual(Session.objects.count(), 6)
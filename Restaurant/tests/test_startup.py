@@ -0,0 +1,72 @@
+import os
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from Restaurant.management.commands import migrate_if_pending
+from Restaurant.models import Booking, BranchDayCapacity, CustomUser, Menu, OutboundMessage
+
+
+class MigrationsTest(TestCase):
+    def test_migrations_committed(self):
+        call_command("makemigrations", check=True, dry_run=True, stdout=StringIO())  # Exits with status 1 if missing
+
+    def test_nothing_pending(self):
+        out = StringIO()
+        with patch.object(migrate_if_pending, "call_command") as migrate:
+            call_command("migrate_if_pending", stdout=out)
+            call_command("migrate_if_pending", check=True, stdout=out)
+        migrate.assert_not_called()
+        self.assertIn("No migrations to apply", out.getvalue())
+
+    def test_pending(self):
+        migration = type("Migration", (), {"app_label": "Restaurant", "name": "0002_later"})()
+        plan = [(migration, False)]
+        out = StringIO()
+        with patch.object(migrate_if_pending, "pending_migrations", return_value=plan), \
+                patch.object(migrate_if_pending, "call_command") as migrate:
+            with self.assertRaises(SystemExit):
+                call_command("migrate_if_pending", check=True, stdout=out)
+            migrate.assert_not_called()
+            call_command("migrate_if_pending", stdout=out)
+        migrate.assert_called_once()
+        self.assertIn("Pending: Restaurant.0002_later", out.getvalue())
+
+
+class UpgradeTest(TransactionTestCase):
+    """Databases deployed before the follow-up migrations have the same 0001_initial applied"""
+
+    def test_upgrade_from_initial(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("Restaurant", "0001_initial")])
+        tables = connection.introspection.table_names()
+        self.assertNotIn(OutboundMessage._meta.db_table, tables)
+        self.assertNotIn(BranchDayCapacity._meta.db_table, tables)
+        old_menu = executor.loader.project_state(("Restaurant", "0001_initial")).apps.get_model("Restaurant", "Menu")
+        old_menu.objects.create(title="Pasta", price="10.99", inventory=5)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        tables = connection.introspection.table_names()
+        self.assertIn(OutboundMessage._meta.db_table, tables)
+        self.assertIn(BranchDayCapacity._meta.db_table, tables)
+        self.assertIsNotNone(Menu.objects.get(title="Pasta").updated_at)
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(cursor, Booking._meta.db_table)
+        self.assertLessEqual({"booking_booked_slot", "booking_user_slot", "booking_date_id"}, set(indexes))
+
+
+@override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=19456, ARGON2_PARALLELISM=1)
+class EnsureSuperuserTest(TestCase):
+    @patch.dict(os.environ, {"DJANGO_SUPERUSER_EMAIL": "root@example.com", "DJANGO_SUPERUSER_PASSWORD": "Passkey@123"})
+    def test_idempotent(self):
+        call_command("ensure_superuser", stdout=StringIO())
+        user = CustomUser.objects.get(email="root@example.com")
+        self.assertTrue(user.is_superuser and user.check_password("Passkey@123"))
+        out = StringIO()
+        with patch.dict(os.environ, {"DJANGO_SUPERUSER_PASSWORD": "changed"}), self.assertNumQueries(1):
+            call_command("ensure_superuser", stdout=out)
+        self.assertIn("already exists", out.getvalue())
+        self.assertEqual(CustomUser.objects.get(email="root@example.com").password, user.password)
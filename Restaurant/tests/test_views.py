@@ -287,3 +287,66 @@ class BookingViewSetTestCase(APITestCase):
         response = self.client.get(reverse('booking-working-hours'), {"branch": "Invalid"})
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+
+
+class BookingAvailabilityTestCase(APITestCase):
+    def setUp(self):
+        from Restaurant.availability import availability_engine
+        availability_engine.clear()
+        self.user = User.objects.create_user(email='user1@littlelemon.com', password='Passkey@123')
+        self.client.force_authenticate(user=self.user)
+        self.restaurant = Restaurant.objects.create(
+            branch="Chennai",
+            phone='8346751234',
+            opening_time=time(10, 0),
+            closing_time=time(12, 0),
+            no_of_tables=4
+        )
+        self.booking_date = date.today() + timedelta(days=1)
+        self.url = reverse('booking-availability')
+        self.params = {"branch": "Chennai", "date": self.booking_date.isoformat(), "duration": 60}
+
+    def book(self, start_time, end_time):
+        return Booking.objects.create(
+            user=self.user, branch="Chennai", name="John Doe", phone="1234567890",
+            booking_date=self.booking_date, start_time=start_time, end_time=end_time,
+            status=Booking.Status.BOOKED
+        )
+
+    def test_day_grid(self):
+        self.book(time(10, 30), time(11, 0))
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["capacity"], 2)  # 4 tables minus 2 buffer tables
+        self.assertEqual(response.data["slots"], [
+            {"start_time": "10:00", "end_time": "11:00", "available_tables": 1},
+            {"start_time": "10:30", "end_time": "11:30", "available_tables": 1},
+            {"start_time": "11:00", "end_time": "12:00", "available_tables": 2},
+        ])
+
+    def test_grid_is_built_with_one_booking_query(self):
+        self.book(time(10, 30), time(11, 0))
+        # One Restaurant lookup and one read of the day's bookings
+        with self.assertNumQueries(2):
+            self.client.get(self.url, self.params)
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url, self.params)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)  # Would differ between workers
+
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.book(time(11, 0), time(12, 0))
+        response = self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_or_invalid_parameters(self):
+        response = self.client.get(self.url, {"branch": "Chennai"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {**self.params, "date": "01-05-2025"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {**self.params, "branch": "Invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
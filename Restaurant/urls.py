@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import UserViewSet, MenuViewSet, BookingViewSet, index, about, menu, book, user_login, user_logout, UserSignUpView, terms_n_conditions
-from .views import RestaurantViewset, HolidayViewSet, health_check
+from .views import RestaurantViewset, HolidayViewSet, health_check, database_stats, metrics
+from . import asyncviews
+from .hashers import offload_hashing
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import permissions
+from rest_framework.urlpatterns import format_suffix_patterns
 
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -33,20 +37,34 @@ urlpatterns = [
     path("about/", about, name="about"),
     path("menu/", menu, name="menu"),
     path("book/", book, name="book"),
-    path('user/sign_up/', UserSignUpView.as_view(), name = "user_sign_up" ),
+    path('user/sign_up/', offload_hashing(UserSignUpView.as_view()), name = "user_sign_up" ),
     path('terms/', terms_n_conditions, name= "terms_n_conditions"),
-    path('login/', user_login, name="login"),
+    path('login/', offload_hashing(user_login), name="login"),
     path('logout/', user_logout, name="logout"),\
     #API
     path("api/", include(router.urls)),
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("api/token/", offload_hashing(TokenObtainPairView.as_view()), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     #Documentation
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     #Health Check
     path("health/", health_check),
+    path("health/db/", database_stats, name="database_stats"),
+    #Metrics (Prometheus)
+    path("metrics", metrics, name="metrics"),
     # path("verify-email/<uidb64>/<token>/", views.verify_email, name="verify_email"),
 ]
 
 
+# Async views of the hot read-only endpoints, matched before the views above (ASYNC_VIEWS, the ASGI deployment)
+async_urlpatterns = format_suffix_patterns([
+    path("api/booking/branches", asyncviews.branches, name="booking-branches"),
+    path("api/booking/working_hours", asyncviews.working_hours, name="booking-working-hours"),
+]) + [
+    path("menu/", asyncviews.menu, name="menu"),
+    path("health/", asyncviews.health_check),
+]
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = async_urlpatterns + urlpatterns
@@ -3,18 +3,24 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.db.models import Count
-import os
-import requests
+from django.db.models import Count, F
+from django.db import connection, transaction, IntegrityError
+from django.conf import settings
+import hashlib
 from dotenv import load_dotenv
 from datetime import time, timedelta, datetime
-from .models import Booking, Restaurant
+from .models import Booking, Restaurant, BranchDayCapacity
+from .availability import load_day
+from .registry import branch_registry
+from .mailer import enqueue_email
 
 # Load environment variables from .env file
 load_dotenv()
 
 User = get_user_model()
 
+BUFFER_TABLES = 2  # Tables kept free for walk-in customers
+
 def generate_email_verification_token(user):
     uid = urlsafe_base64_encode(force_bytes(user.pk))
     token = default_token_generator.make_token(user)
@@ -33,13 +39,8 @@ def verify_email_token(uidb64, token):
     return False
 
 def send_mailgun_email(subject, message, to_email = 'littlelemondemo@gmail.com'):
-  	return requests.post(
-  		"https://api.mailgun.net/v3/sandbox066e373697194dd1a51dcdde20c93dca.mailgun.org/messages",
-  		auth=("api", os.getenv('MAILGUN_API_KEY', 'MAILGUN_API_KEY')),
-  		data={"from": "Mailgun Sandbox <postmaster@sandbox066e373697194dd1a51dcdde20c93dca.mailgun.org>",
-			"to": to_email,
-  			"subject": subject,
-  			"text": message})
+    """Queue an email for the mail worker (python manage.py send_queued_mail), which sends it through Mailgun"""
+    return enqueue_email(subject, message, to_email)
 
 def send_verification_email(user):
     uid, token = generate_email_verification_token(user)
@@ -49,7 +50,16 @@ def send_verification_email(user):
     message = f"click the link to verify your email: {full_url}"
     to_email = user.email
     send_mailgun_email(subject, message, to_email)
-    
+
+def send_booking_confirmation(booking):
+    """Queue the confirmation email of a booked table"""
+    subject = "Little Lemon - booking confirmed"
+    message = (
+        f"Hi {booking.name}, your table for {booking.no_of_guests} at our {booking.branch} branch is booked "
+        f"on {booking.booking_date} from {get_12hour_format(booking.start_time)} to {get_12hour_format(booking.end_time)}."
+    )
+    send_mailgun_email(subject, message, booking.user.email)
+
 
 def get_12hour_format(time_obj):
     """Convert 24-hour format to 12-hour format"""
@@ -57,38 +67,53 @@ def get_12hour_format(time_obj):
 
 def get_branches():
     """Return list of branches"""
-    return Restaurant.objects.values_list("branch", flat=True)
+    return branch_registry.branches()
 
 def get_working_hours(branch):
     """Return working hours of the branch"""
-    branch = Restaurant.objects.get(branch=branch)
-    opening_time = branch.opening_time.strftime("%H:%M")
-    closing_time = branch.closing_time.strftime("%H:%M")
+    restaurant = branch_registry.get(branch)
+    if restaurant is None:
+        raise Restaurant.DoesNotExist(f"Branch {branch} does not exist.")
+    opening_time = restaurant.opening_time.strftime("%H:%M")
+    closing_time = restaurant.closing_time.strftime("%H:%M")
     return opening_time, closing_time
 
-def is_slot_available(branch, booking_date, start_time, end_time, buffer_tables=2):
+def lock_branch_day(branch, booking_date):
     """
-    Assuming we can take booking of the same time equal to number of tables available in the branch.
-    We can have buffer tables like 2 for walk-in customers.
-    Check existing booking between start_time and end_time for the given branch and booking_date.
-    If number of bookings exceeds or equal to number of tables minus buffer tables, return False.
-    else return True.
+    Serialise booking commits for a branch on a date until the surrounding transaction ends.
+    By default the branch-day capacity row is bumped with an UPDATE before anything is read. The UPDATE
+    holds the same row lock as SELECT ... FOR UPDATE on PostgreSQL/MySQL, and unlike FOR UPDATE it also takes
+    the write lock on SQLite. With BOOKING_LOCK_MODE = "advisory" PostgreSQL uses a transaction advisory lock instead.
     """
-    branch = Restaurant.objects.get(branch=branch)
-    # booking_date = datetime.strptime(booking_date, "%Y-%m-%d").date()
-    # start_time = datetime.strptime(start_time, "%H:%M").time()
-    # end_time = datetime.strptime(end_time, "%H:%M").time()
-    booked_slots = Booking.objects.filter(
-        branch=branch.branch,
-        booking_date=booking_date,
-        start_time__lt=end_time,
-        start_time__gte=start_time,
-        end_time__gt=start_time,
-        end_time__lte=end_time,
-        status=Booking.Status.BOOKED
-    )
-    if booked_slots.count() >= (branch.no_of_tables - buffer_tables):
-        return False
-    else:
-        return True
-    
\ No newline at end of file
+    if getattr(settings, "BOOKING_LOCK_MODE", "row") == "advisory" and connection.vendor == "postgresql":
+        key = int.from_bytes(hashlib.blake2b(f"{branch}|{booking_date}".encode(), digest_size=8).digest(), "big", signed=True)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+        return
+
+    capacity = BranchDayCapacity.objects.filter(branch=branch, booking_date=booking_date)
+    if capacity.update(version=F("version") + 1):
+        return
+    try:
+        with transaction.atomic():
+            BranchDayCapacity.objects.create(branch=branch, booking_date=booking_date, version=1)
+    except IntegrityError:
+        # Another request created the row first, wait for its lock
+        capacity.update(version=F("version") + 1)
+
+def commit_booking(serializer, user, buffer_tables=BUFFER_TABLES):
+    """
+    Save a validated BookingSerializer once, as BOOKED if a table is free for the whole slot, else as FAILED.
+    The capacity check and the insert run in one transaction holding the branch-day lock, so concurrent
+    requests for the same slot cannot both be booked. Return the saved booking.
+    """
+    data = serializer.validated_data
+    branch, booking_date = data["branch"], data["booking_date"]
+    start_time, end_time = data["start_time"], data["end_time"]
+    with transaction.atomic():
+        lock_branch_day(branch, booking_date)
+        restaurant = branch_registry.get(branch)
+        booked_tables = load_day(branch, booking_date, start_time, end_time).peak(start_time, end_time)
+        if booked_tables < restaurant.no_of_tables - buffer_tables:
+            return serializer.save(user=user, status=Booking.Status.BOOKED)
+        return serializer.save(user=user, status=Booking.Status.FAILED)
@@ -9,24 +9,43 @@ from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.conf import settings
+from django.utils.timezone import now
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 
 # From Django Rest Framework
 from rest_framework import viewsets, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import action, permission_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework import filters
 
 # From Python Library
-from datetime import datetime
+from datetime import datetime, date
+import hashlib
+import json
 
 # From the application - Resturant
 from .serializers import UserSerializer, MenuSerializer, BookingSerializer, RestuarantSerializer, HolidaySerializer
 from .models import Menu, Booking, CustomUser, Restaurant, Holiday
 from .forms import CustomUserSignUpForm, LoginForm
 from .utils import generate_email_verification_token, verify_email_token, send_mailgun_email, send_verification_email
-from .utils import is_slot_available
+from .utils import commit_booking, get_branches, get_working_hours, send_booking_confirmation, BUFFER_TABLES
+from .registry import branch_registry
+from .availability import availability_engine, SLOT_MINUTES
 from .permissions import IsBranchManagerOrReadOnly, IsBranchManager
+from .roles import is_branch_manager
+from .authentication import user_reference
+from .pagecache import cache_public_page, MENU_VERSION
+from .responsecache import CachedResponseMixin
+from .pagination import BookingPagination, UserPagination
+from .filters import BookingFilterBackend
+from .export import ExportMixin
+from .bulk import import_menu, import_bookings
+from .dbpool import connection_stats
+from .renderers import api_renderers
+from .readers import ValuesReadMixin
+from .metrics import metrics_registry, metrics_allowed
 
 
 # Create your views here.
@@ -34,24 +53,42 @@ from .permissions import IsBranchManagerOrReadOnly, IsBranchManager
 def health_check(request):
     return JsonResponse({"status": "ok"})
 
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def database_stats(request):
+    """Connection mode and connection pool statistics of the answering worker process"""
+    return Response(connection_stats())
+
+
+def metrics(request):
+    """Request metrics of the answering worker process in the Prometheus text format"""
+    if not metrics_allowed(request):
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+@cache_public_page()
 def index(request):
     """Homepage of the application"""
     return render(request, 'index.html', {})
 
 
+@cache_public_page()
 def about(request):
     """About page"""
     return render(request, 'about.html', {})
 
 
+@cache_public_page(MENU_VERSION)
 def menu(request):
     """Menu page"""
     # Fetch all menu items directly from the database
     menu_list = Menu.objects.all()
 
-    # Prepare context for the template
+    # Prepare context for the template. Each menu card is cached as a fragment until the item changes
     context = {
-        'menu_list': menu_list
+        'menu_list': menu_list,
+        'menu_card_seconds': settings.MENU_CARD_CACHE_SECONDS,
     }
     return render(request, 'menu.html', context)
 
@@ -60,6 +97,7 @@ def book(request):
     """Book a Reservation in the restaurant"""
     return render(request, 'book.html', {})
 
+@cache_public_page()
 def terms_n_conditions(request):
     """Terms and conditions page"""
     return render(request, 'terms_n_conditions.html', {})
@@ -116,6 +154,13 @@ class UserSignUpView(CreateView):
         return render(request, "user_sign_up.html", {"form": form})
 
 
+def bulk_status(summary):
+    """201 when every row was saved, 207 when only some were, 400 when none were"""
+    if not summary["errors"]:
+        return status.HTTP_201_CREATED
+    return status.HTTP_207_MULTI_STATUS if summary["created"] + summary["updated"] else status.HTTP_400_BAD_REQUEST
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """
     Handles user-related operations.
@@ -123,6 +168,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = get_user_model().objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserPagination  # ?pagination=cursor for keyset pagination on (email, id)
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["email", "first_name", "last_name", "phone_number"]
     ordering_fields = ["first_name", "last_name", "groups__name"]
@@ -134,14 +180,14 @@ class UserViewSet(viewsets.ModelViewSet):
         - Normal users can view their own profile/account details and perform update/delete(account deletion) on it. 
         """
         user = self.request.user
-        if user.groups.filter(name='Branch_Manager').exists():
+        if is_branch_manager(self.request):
             return get_user_model().objects.all()  # Branch Managers get all users
         # Normal users get only their own data
         return get_user_model().objects.filter(id=user.id)
 
     def create(self, request, *args, **kwargs):
         """Create a new user"""
-        if request.method == 'POST' and not request.user.groups.filter(name="Branch_Manager").exists():
+        if request.method == 'POST' and not is_branch_manager(request):
             return Response({'error': f'Normal user can create an account from UI - Sign up page.'}, status=status.HTTP_403_FORBIDDEN)
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -170,12 +216,17 @@ class UserViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class MenuViewSet(viewsets.ModelViewSet):
+class MenuViewSet(CachedResponseMixin, ExportMixin, ValuesReadMixin, viewsets.ModelViewSet):
     """
     Handles menu-related operations.
+    List and retrieve responses are cached until a menu item changes.
     """
+    cache_version_names = (MENU_VERSION,)
+    export_fields = {name: name for name in ["id", "title", "description", "category", "price", "inventory", "image_filename"]}
+    export_filename = "menu"
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
+    renderer_classes = api_renderers("xml", "csv")
     permission_classes = [IsBranchManagerOrReadOnly]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'category']
@@ -205,17 +256,34 @@ class MenuViewSet(viewsets.ModelViewSet):
         """Delete a menu by ID"""
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=["post"], permission_classes=[IsBranchManager])
+    def bulk(self, request):
+        """
+        Create or update (by title) many menu items from a JSON array, CSV or XML list.
+        Invalid rows are reported by row number, the valid ones are still saved.
+        """
+        summary = import_menu(request.data)
+        return Response(summary, status=bulk_status(summary))
+
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     Handles booking-related operations.
     """
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
+    renderer_classes = api_renderers("xml", "csv")
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["user__email", "name", "phone"]
+    pagination_class = BookingPagination  # ?pagination=cursor for keyset pagination on (booking_date, id)
+    filter_backends = [BookingFilterBackend, filters.OrderingFilter]  # ?search over name, phone and user email
     ordering_fields = ["name",  "booking_date", "status"]
+    export_fields = {
+        "id": "id", "user": "user__email", "branch": "branch", "name": "name", "phone": "phone",
+        "no_of_guests": "no_of_guests", "booking_date": "booking_date", "start_time": "start_time",
+        "end_time": "end_time", "message": "message", "status": "status",
+    }
+    export_ordering = ("booking_date", "id")
+    export_filename = "bookings"
 
     def get_queryset(self):
         """
@@ -225,10 +293,10 @@ class BookingViewSet(viewsets.ModelViewSet):
         - Anonymous (Unauthenticated) Users can't access the booking API endpoints.
         """
         user = self.request.user
-        if user.groups.filter(name='Branch_Manager').exists():
+        if is_branch_manager(self.request):
             return Booking.objects.all()  # Branch Managers get all user's bookings
         # Normal users see only their own bookings
-        return Booking.objects.filter(user=user)
+        return Booking.objects.filter(user=user_reference(user))
 
     def list(self, request, *args, **kwargs):
         """Retrieve a list of bookings"""
@@ -236,27 +304,14 @@ class BookingViewSet(viewsets.ModelViewSet):
 
     def create(self, request, *args, **kwargs):
         """Create a new booking"""
-        data=request.data
-        serializer = self.get_serializer(data = data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        # Book if requested date and time is available
-        try:
-            serializer.save(user=self.request.user, status=Booking.Status.PENDING)
-            slot_available = is_slot_available(
-                serializer.validated_data["branch"],
-                serializer.validated_data["booking_date"],
-                serializer.validated_data["start_time"],
-                serializer.validated_data["end_time"]
-            )
-            if slot_available:
-                serializer.save(status=Booking.Status.BOOKED)
-            else:
-                serializer.save(status=Booking.Status.FAILED)
-                return Response({"error": "One or more slots are already booked. Please try again."}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            serializer.save(status=Booking.Status.FAILED)
+
+        # Book if requested date and time is available. The check and the save happen in one transaction
+        booking = commit_booking(serializer, user_reference(self.request.user))
+        if booking.status != Booking.Status.BOOKED:
             return Response({"error": "One or more slots are already booked. Please try again."}, status=status.HTTP_400_BAD_REQUEST)
+        send_booking_confirmation(booking)  # Queued, sent by the mail worker
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def retrieve(self, request, *args, **kwargs):
@@ -267,14 +322,13 @@ class BookingViewSet(viewsets.ModelViewSet):
         """Update a booking by ID"""
 
         instance = self.get_object()
-        user = request.user
 
         # Prevent updates on past bookings
         if instance.booking_date < now().date():
             return Response({"error": "Cannot modify past bookings"}, status=400)
 
         # Restrict normal users from updating status
-        if "status" in request.data and not user.groups.filter(name='Branch_Manager').exists():
+        if "status" in request.data and not is_branch_manager(request):
             return Response({"error": "Only Branch Managers can change booking status"}, status=403)
 
         return super().update(request, *args, **kwargs)
@@ -283,14 +337,13 @@ class BookingViewSet(viewsets.ModelViewSet):
         """Partially update a booking by ID"""
 
         instance = self.get_object()
-        user = request.user
 
         # Prevent updates on past bookings
         if instance.booking_date < now().date():
             return Response({"error": "Cannot modify past bookings"}, status=400)
 
         # Restrict normal users from updating status
-        if "status" in request.data and not user.groups.filter(name='Branch_Manager').exists():
+        if "status" in request.data and not is_branch_manager(request):
             return Response({"error": "Only Branch Managers can change booking status"}, status=403)
 
         return super().partial_update(request, *args, **kwargs)
@@ -305,14 +358,23 @@ class BookingViewSet(viewsets.ModelViewSet):
             return Response({"error": "Cannot delete past bookings"}, status=400)
 
         return super().destroy(request, *args, **kwargs)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsBranchManager])
+    def bulk(self, request):
+        """
+        Create many bookings from a JSON array, CSV or XML list, e.g. when migrating from another system.
+        Rows without a "user" email are booked for the requesting manager. Invalid rows are reported
+        by row number, the valid ones are still saved.
+        """
+        summary = import_bookings(request.data, user_reference(request.user))
+        return Response(summary, status=bulk_status(summary))
         
     @action(detail=False, methods=["get"])
     def branches(self, request):
         """
         Returns a list of restaurant branches.
         """
-        branches = Restaurant.objects.values_list("branch", flat=True)
-        return Response({"branches": list(branches)})
+        return Response({"branches": get_branches()})
     
     @action(detail=False, methods=["get"])
     def working_hours(self, request):
@@ -324,15 +386,64 @@ class BookingViewSet(viewsets.ModelViewSet):
             return Response({"error": "Branch parameter is required. e.g. /api/booking/working_hours?branch=Vellore"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            restaurant = Restaurant.objects.get(branch=branch)
-            opening_time = restaurant.opening_time.strftime("%H:%M")
-            closing_time = restaurant.closing_time.strftime("%H:%M")
+            opening_time, closing_time = get_working_hours(branch)
             return Response({"opening_time": opening_time, "closing_time": closing_time})
         except Restaurant.DoesNotExist:
             return Response({"error": "Branch not found."}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        """
+        Returns the number of free tables for every 30 minute start slot of a branch on a date.
+        The grid is built from one read of that day's booked tables, and carries an ETag so clients
+        polling it mostly get 304 Not Modified.
+        """
+        usage = "e.g. /api/booking/availability?branch=Vellore&date=2025-05-01&duration=30"
+        branch = request.query_params.get("branch")
+        booking_date = request.query_params.get("date")
+        if not branch or not booking_date:
+            return Response({"error": f"Branch and date parameters are required. {usage}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            booking_date = date.fromisoformat(booking_date)
+            duration = int(request.query_params.get("duration", SLOT_MINUTES))
+        except ValueError:
+            return Response({"error": f"Date must be YYYY-MM-DD and duration a number of minutes. {usage}"}, status=status.HTTP_400_BAD_REQUEST)
+        if duration <= 0:
+            return Response({"error": "Duration must be a positive number of minutes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        restaurant = branch_registry.get(branch)
+        if restaurant is None:
+            return Response({"error": "Branch not found."}, status=status.HTTP_404_NOT_FOUND)
 
-class RestaurantViewset(viewsets.ModelViewSet):
+        capacity = max(0, restaurant.no_of_tables - BUFFER_TABLES)
+        slots = availability_engine.slots(
+            restaurant.branch, booking_date, restaurant.opening_time, restaurant.closing_time, duration, capacity
+        )
+        data = {
+            "branch": restaurant.branch,
+            "date": booking_date.isoformat(),
+            "duration": duration,
+            "capacity": capacity,
+            "slots": [
+                {"start_time": start.strftime("%H:%M"), "end_time": end.strftime("%H:%M"), "available_tables": free}
+                for start, end, free in slots
+            ],
+        }
+
+        # The ETag is derived from the grid itself so every worker agrees on it. No Last-Modified: a worker
+        # only knows when it loaded the day, not when its bookings changed.
+        etag = quote_etag(hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest())
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is None:
+            response = Response(data)
+            response["ETag"] = etag
+        else:
+            response = not_modified
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class RestaurantViewset(ValuesReadMixin, viewsets.ModelViewSet):
     """
     Handles restaurant-related operations.
     """
@@ -367,7 +478,7 @@ class RestaurantViewset(viewsets.ModelViewSet):
         """Delete a restaurant by ID"""
         return super().destroy(request, *args, **kwargs)
     
-class HolidayViewSet(viewsets.ModelViewSet):
+class HolidayViewSet(ValuesReadMixin, viewsets.ModelViewSet):
     """
     Handles holiday-related operations.
     """
@@ -0,0 +1,74 @@
+"""
+Benchmark of the per-request cost of each API authentication scheme.
+
+Authenticates a GET request with every scheme of AUTHENTICATION_SCHEMES and
+reads request.user.pk, as the booking list does, reporting the latency and the
+queries per request: "session" (the session row and the user), "jwt" (claims
+only), "jwt_db" (simplejwt, the user by id) and "token" (authtoken_token joined
+to the user).
+
+    python -m benchmarks.authentication --requests 5000
+"""
+import argparse
+from time import perf_counter
+
+from .common import setup_django, create_database, summarize, print_table
+
+SCHEMES = ["session", "jwt", "jwt_db", "token"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--schemes", nargs="+", default=SCHEMES, choices=SCHEMES)
+    options = parser.parse_args()
+
+    setup_django()
+    from importlib import import_module
+    from django.conf import settings
+    from django.contrib.auth import get_user
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils.functional import SimpleLazyObject
+    from django.utils.module_loading import import_string
+    from rest_framework.authtoken.models import Token
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from Restaurant.models import CustomUser
+    from Restaurant.serializers import RoleTokenObtainPairSerializer
+
+    drop_database = create_database()
+    try:
+        user = CustomUser.objects.create_user(email="benchmark@example.com", password="Passkey@123")
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session.update({"_auth_user_id": str(user.pk), "_auth_user_backend": settings.AUTHENTICATION_BACKENDS[-1],
+                        "_auth_user_hash": user.get_session_auth_hash()})
+        session.save()
+        access = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+        headers = {"jwt": f"Bearer {access}", "jwt_db": f"Bearer {access}", "token": f"Token {Token.objects.create(user=user).key}"}
+        factory = APIRequestFactory()
+
+        def build(scheme):
+            django_request = factory.get("/api/booking", HTTP_AUTHORIZATION=headers.get(scheme, ""))
+            if scheme == "session":  # What SessionMiddleware and AuthenticationMiddleware set
+                django_request.session = import_module(settings.SESSION_ENGINE).SessionStore(session.session_key)
+                django_request.user = SimpleLazyObject(lambda: get_user(django_request))
+            return Request(django_request, authenticators=[import_string(settings.AUTHENTICATION_SCHEMES[scheme])()])
+
+        rows = []
+        for scheme in options.schemes:
+            build(scheme).user.pk  # Warm up
+            samples = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(options.requests):
+                    started = perf_counter()
+                    assert build(scheme).user.pk == user.pk
+                    samples.append(perf_counter() - started)
+            rows.append((f"{scheme} ({len(queries) / options.requests:.1f} q)", summarize(samples)))
+        print_table("Authentication cost per request (queries per request)", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the booking availability engine at 10k+ bookings per branch-day.
+
+Compares the engine's peak-occupancy query against a linear sweep over the same
+bookings (what a correct overlap check costs without an index), and measures
+the cost of incremental updates and of loading a day.
+
+    python -m benchmarks.availability --bookings 10000 --queries 5000
+"""
+import argparse
+import random
+from datetime import time
+from time import perf_counter
+
+from .common import setup_django, measure, summarize, print_table
+
+
+def random_bookings(count, rng):
+    """Random bookings on a 30 minute grid between 09:00 and 21:00 lasting 30 to 90 minutes"""
+    bookings = []
+    for pk in range(1, count + 1):
+        start = 9 * 60 + 30 * rng.randrange(0, 22)
+        end = min(start + rng.choice((30, 60, 90)), 21 * 60)
+        bookings.append((pk, time(start // 60, start % 60), time(end // 60, end % 60)))
+    return bookings
+
+
+def linear_peak(bookings, start_time, end_time):
+    """Peak concurrent bookings in the window via a sweep over every booking"""
+    events = []
+    for _, booking_start, booking_end in bookings:
+        if booking_start < end_time and booking_end > start_time:
+            events.append((max(booking_start, start_time), 1))
+            events.append((booking_end, -1))
+    events.sort(key=lambda event: (event[0], event[1]))
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    options = parser.parse_args()
+
+    setup_django()
+    from Restaurant.availability import DayOccupancy
+
+    rng = random.Random(options.seed)
+    for count in options.bookings:
+        bookings = random_bookings(count, rng)
+        windows = [(slot[1], slot[2]) for slot in random_bookings(options.queries, rng)]
+
+        started = perf_counter()
+        day = DayOccupancy()
+        for pk, start_time, end_time in bookings:
+            day.add(pk, start_time, end_time)
+        load_seconds = perf_counter() - started
+
+        # Correctness check before timing anything
+        for start_time, end_time in windows[:50]:
+            assert day.peak(start_time, end_time) == linear_peak(bookings, start_time, end_time)
+
+        updates = [(count + i, start_time, end_time) for i, (start_time, end_time) in enumerate(windows)]
+        rows = [
+            ("engine peak()", summarize(measure(day.peak, windows))),
+            ("engine add()", summarize(measure(day.add, updates))),
+            ("engine remove()", summarize(measure(day.remove, [(pk,) for pk, _, _ in updates]))),
+            ("linear sweep peak", summarize(measure(linear_peak, [(bookings, *w) for w in windows[:200]]))),
+        ]
+        print_table(f"{count} bookings in one branch-day (day loaded in {load_seconds * 1000:.1f} ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Concurrency stress benchmark for booking creation.
+
+Fires parallel POST /api/booking requests (through Django's test client, one
+thread per simulated client) at a single slot, checks that no more tables
+than the branch has were booked, and reports throughput and latency.
+
+    python -m benchmarks.booking_concurrency --requests 400 --concurrency 1 8 32 64
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+from time import perf_counter
+
+from .common import setup_django, create_database, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--tables", type=int, default=12)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from Restaurant.models import Booking, BranchDayCapacity, CustomUser, Restaurant
+    from Restaurant.availability import availability_engine
+    from Restaurant.utils import BUFFER_TABLES
+
+    drop_database = create_database()
+    try:
+        Restaurant.objects.create(branch="Benchmark", phone="1234567890", opening_time=time(9, 0),
+                                  closing_time=time(21, 0), no_of_tables=options.tables)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"bench{i}@example.com") for i in range(options.requests)
+        )
+        payload = {
+            "branch": "Benchmark", "name": "Bench", "phone": "1234567890", "no_of_guests": 2,
+            "booking_date": (date.today() + timedelta(days=1)).isoformat(),
+            "start_time": "19:00", "end_time": "20:00",
+        }
+        url = reverse("booking-list")
+
+        def post(user):
+            try:
+                client = APIClient()
+                client.force_authenticate(user=user)
+                started = perf_counter()
+                code = client.post(url, payload, format="json").status_code
+                return code, perf_counter() - started
+            finally:
+                connection.close()
+
+        rows = []
+        for concurrency in options.concurrency:
+            Booking.objects.all().delete()
+            BranchDayCapacity.objects.all().delete()
+            availability_engine.clear()
+
+            started = perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(post, users))
+            elapsed = perf_counter() - started
+
+            booked = Booking.objects.filter(status=Booking.Status.BOOKED).count()
+            expected = options.tables - BUFFER_TABLES
+            assert booked == expected, f"overbooked: {booked} booked, capacity {expected}"
+            errors = sum(1 for code, _ in results if code not in (201, 400))
+            label = f"concurrency {concurrency}: {len(results) / elapsed:.0f} req/s, {errors} errors"
+            rows.append((label, summarize([latency for _, latency in results])))
+        print_table(f"{options.requests} POST /api/booking for one slot, {options.tables} tables", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Every script can be run from the repository root, e.g. `python -m benchmarks.availability`.
+Without DATABASE_* environment variables a local SQLite file is used. The files a script writes,
+that database included, go to benchmarks/.output/ (ignored by git).
+"""
+import os
+import sys
+import statistics
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_DIR = ROOT / "benchmarks" / ".output"
+
+
+def setup_django():
+    """Configure and set up Django for a standalone benchmark script"""
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Littlelemon.settings")
+    os.environ.setdefault("DATABASE_ENGINE", "django.db.backends.sqlite3")
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    os.environ.setdefault("DATABASE_NAME", str(OUTPUT_DIR / "benchmark.sqlite3"))
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark-secret-key")
+    import django
+    django.setup()
+
+
+def create_database():
+    """
+    Create a throwaway test database for the configured engine and return a callable that drops it.
+    The committed Restaurant migrations create the tables.
+    """
+    from django.test.utils import setup_databases, teardown_databases
+    old_config = setup_databases(verbosity=0, interactive=False)
+    return lambda: teardown_databases(old_config, verbosity=0)
+
+
+def measure(func, args_list):
+    """Call func once per argument tuple and return the duration of each call in seconds"""
+    samples = []
+    for args in args_list:
+        start = perf_counter()
+        func(*args)
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    """Return count, mean and p50/p95/p99 of the samples in microseconds"""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_us": round(statistics.fmean(ordered) * 1e6, 2) if ordered else 0.0,
+        "p50_us": round(percentile(ordered, 50) * 1e6, 2),
+        "p95_us": round(percentile(ordered, 95) * 1e6, 2),
+        "p99_us": round(percentile(ordered, 99) * 1e6, 2),
+    }
+
+
+def print_table(title, rows):
+    """Print a list of (label, summary) rows as an aligned table"""
+    print(f"\n{title}")
+    print(f"{'case':<40}{'n':>8}{'mean us':>12}{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}")
+    for label, summary in rows:
+        print(f"{label:<40}{summary['n']:>8}{summary['mean_us']:>12}{summary['p50_us']:>12}"
+              f"{summary['p95_us']:>12}{summary['p99_us']:>12}")
@@ -0,0 +1,84 @@
+"""
+Benchmark of the streaming booking export against the in-memory CSV renderer.
+
+Seeds synthetic bookings, then for each size streams GET /api/booking/export
+(CSV) and, up to --legacy-max rows, renders the same rows the old way
+(BookingSerializer(many=True) + CSVRenderer). Reports rows/s and the peak
+Python memory allocated while producing the output (tracemalloc).
+
+    python -m benchmarks.export --rows 10000 100000 1000000 --legacy-max 100000
+"""
+import argparse
+import tracemalloc
+from datetime import date, time, timedelta
+from time import perf_counter
+
+from .common import setup_django, create_database
+
+
+def traced(func):
+    """Run func and return (result, seconds, peak MiB allocated)"""
+    tracemalloc.start()
+    started = perf_counter()
+    result = func()
+    elapsed = perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=100000, help="Largest size also rendered in memory")
+    options = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import Group
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from rest_framework_csv.renderers import CSVRenderer
+    from Restaurant.models import Booking, CustomUser
+    from Restaurant.serializers import BookingSerializer
+
+    drop_database = create_database()
+    try:
+        manager = CustomUser.objects.create_user(email="manager@example.com", password="Passkey@123")
+        manager.groups.add(Group.objects.create(name="Branch_Manager"))
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        today = date.today()
+
+        print(f"\n{'rows':>10}{'case':>12}{'seconds':>10}{'rows/s':>12}{'peak MiB':>10}{'MiB out':>10}")
+        seeded = 0
+        for size in sorted(options.rows):
+            while seeded < size:
+                batch = min(10000, size - seeded)
+                Booking.objects.bulk_create(
+                    Booking(user=manager, branch="Chennai", name=f"Guest {seeded + i}", phone="1234567890",
+                            booking_date=today + timedelta(days=(seeded + i) % 365), start_time=time(11, 0),
+                            end_time=time(12, 0), status=Booking.Status.BOOKED)
+                    for i in range(batch)
+                )
+                seeded += batch
+
+            def stream():
+                response = client.get(reverse("booking-export"), {"format": "csv"})
+                return sum(len(chunk) for chunk in response.streaming_content)
+
+            cases = [("streaming", stream)]
+            if size <= options.legacy_max:
+                def in_memory():
+                    data = BookingSerializer(Booking.objects.order_by("booking_date", "id"), many=True).data
+                    return len(CSVRenderer().render(data))
+                cases.append(("in memory", in_memory))
+
+            for label, func in cases:
+                length, elapsed, peak = traced(func)
+                print(f"{size:>10}{label:>12}{elapsed:>10.2f}{size / elapsed:>12.0f}{peak:>10.1f}{length / 2 ** 20:>10.1f}")
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
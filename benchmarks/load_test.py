@@ -0,0 +1,124 @@
+"""
+Load test comparing gunicorn worker configurations.
+
+For every configuration gunicorn is started with gunicorn.conf.py on a local
+SQLite database seeded with a few branches and menu items, warmed up, then
+--requests requests are sent from --concurrency client threads over keep-alive
+connections, spread over the public pages and the menu API. Reports requests/s,
+errors and latency percentiles per configuration.
+
+A configuration is NAME=WORKER_CLASS:WORKERS[:THREADS]; the uvicorn worker class
+needs uvicorn installed.
+
+    python -m benchmarks.load_test --configs sync=sync:3 gthread=gthread:3:4 uvicorn=uvicorn:3
+    python -m benchmarks.load_test --url http://127.0.0.1:8000   # an already running server
+"""
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from time import perf_counter, sleep
+
+from .common import ROOT, setup_django, summarize, print_table
+
+PATHS = ["/health/", "/api/menu", "/api/menu?search=pasta", "/menu/", "/"]
+
+
+def seed():
+    """Create the benchmark database tables and data, once"""
+    setup_django()
+    from django.core.management import call_command
+    from Restaurant.models import Menu, Restaurant
+    call_command("migrate", verbosity=0, interactive=False)
+    for branch in ("Chennai", "Vellore"):
+        Restaurant.objects.get_or_create(branch=branch, defaults={"no_of_tables": 20})
+    for i in range(40):
+        Menu.objects.get_or_create(title=f"Pasta {i}", defaults={"price": 10 + i, "inventory": 50})
+
+
+def start_server(worker_class, workers, threads, port):
+    """Start gunicorn and wait until /health/ answers"""
+    import requests
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=worker_class, GUNICORN_WORKERS=str(workers),
+               GUNICORN_THREADS=str(threads), GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_LOG_LEVEL="warning")
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], cwd=ROOT, env=env)
+    for _ in range(100):
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health/", timeout=1)
+            return process
+        except requests.ConnectionError:
+            if process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+            sleep(0.1)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def run_load(base_url, total, concurrency):
+    """Send total requests from concurrency threads, return (seconds, latencies, errors)"""
+    import requests
+
+    def client(count):
+        session = requests.Session()
+        latencies, errors = [], 0
+        for path in islice(cycle(PATHS), count):
+            started = perf_counter()
+            try:
+                if session.get(base_url + path, timeout=30).status_code >= 400:
+                    errors += 1
+            except requests.RequestException:
+                errors += 1
+            latencies.append(perf_counter() - started)
+        session.close()
+        return latencies, errors
+
+    shares = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+    started = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(client, shares))
+    elapsed = perf_counter() - started
+    return elapsed, [latency for latencies, _ in results for latency in latencies], sum(errors for _, errors in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", nargs="+", default=["sync=sync:3", "gthread=gthread:3:4"])
+    parser.add_argument("--url", help="Load an already running server instead of starting gunicorn")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    options = parser.parse_args()
+
+    if options.url:
+        targets = [(options.url, options.url.rstrip("/"), None)]
+    else:
+        seed()
+        targets = []
+        for config in options.configs:
+            name, _, spec = config.partition("=")
+            worker_class, workers, threads = (spec.split(":") + ["1"])[:3]
+            targets.append((name, f"http://127.0.0.1:{options.port}", (worker_class, int(workers), int(threads))))
+
+    rows, throughput = [], []
+    for name, base_url, server in targets:
+        process = start_server(*server, options.port) if server else None
+        try:
+            run_load(base_url, min(200, options.requests), options.concurrency)  # Warm up every worker
+            elapsed, latencies, errors = run_load(base_url, options.requests, options.concurrency)
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+        rows.append((name, summarize(latencies)))
+        throughput.append((name, options.requests / elapsed, errors))
+
+    print_table(f"Latency, {options.concurrency} concurrent clients", rows)
+    print(f"\n{'case':<40}{'req/s':>12}{'errors':>10}")
+    for name, rate, errors in throughput:
+        print(f"{name:<40}{rate:>12.0f}{errors:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Load test for the public menu page.
+
+Requests GET /menu/ through Django's test client with every cache disabled (the
+previous behaviour), with only the menu card fragments cached (signed-in users),
+with the whole anonymous page cached, and as conditional GETs answered with 304.
+
+    python -m benchmarks.menu_page --items 60 --requests 2000 --concurrency 1 8
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from .common import setup_django, create_database, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    options = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import reverse
+    from Restaurant.models import CustomUser, Menu
+
+    drop_database = create_database()
+    try:
+        Menu.objects.bulk_create(
+            Menu(title=f"Dish {i}", description="Slow cooked with lemon and herbs", price=100 + i, inventory=10)
+            for i in range(options.items)
+        )
+        user = CustomUser.objects.create_user(email="bench@example.com", password="Passkey@123")
+        url = reverse("menu")
+        etag = Client().get(url)["ETag"]
+
+        def client_for(signed_in):
+            client = Client()
+            if signed_in:
+                client.force_login(user)
+            return client
+
+        cases = [
+            ("no cache", {"PAGE_CACHE_SECONDS": 0, "MENU_CARD_CACHE_SECONDS": 0}, False, {}),
+            ("card fragments (signed in)", {}, True, {}),
+            ("whole page (anonymous)", {}, False, {}),
+            ("conditional GET -> 304", {}, False, {"HTTP_IF_NONE_MATCH": etag}),
+        ]
+        for concurrency in options.concurrency:
+            rows = []
+            for label, overrides, signed_in, headers in cases:
+                clients = [client_for(signed_in) for _ in range(concurrency)]
+
+                def get(index):
+                    try:
+                        started = perf_counter()
+                        response = clients[index % concurrency].get(url, **headers)
+                        assert response.status_code in (200, 304)
+                        return perf_counter() - started
+                    finally:
+                        connection.close()
+
+                with override_settings(**overrides):
+                    cache.clear()
+                    get(0)  # Warm up the caches
+                    started = perf_counter()
+                    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                        samples = list(pool.map(get, range(options.requests)))
+                    elapsed = perf_counter() - started
+                rows.append((f"{label}: {len(samples) / elapsed:.0f} req/s", summarize(samples)))
+            print_table(f"GET /menu/ with {options.items} items, concurrency {concurrency}", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of per-item serialization cost of 1k-item menu, restaurant and holiday pages.
+
+Times MenuSerializer/RestuarantSerializer/HolidaySerializer(many=True).data
+over model instances (one reverse() per url) against the ValuesReader of the
+same serializer over values() rows, both including the query, and checks the
+rendered JSON is byte-identical.
+
+    python -m benchmarks.read_serializers --items 1000 --repeat 50
+"""
+import argparse
+
+from .common import setup_django, create_database, measure, summarize, print_table
+
+
+def per_item(summary, items):
+    return {key: value if key == "n" else round(value / items, 2) for key, value in summary.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    options = parser.parse_args()
+
+    setup_django()
+    from datetime import date, time, timedelta
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from Restaurant.models import Holiday, Menu, Restaurant
+    from Restaurant.readers import get_reader
+    from Restaurant.renderers import FastJSONRenderer
+    from Restaurant.serializers import HolidaySerializer, MenuSerializer, RestuarantSerializer
+
+    drop_database = create_database()
+    try:
+        Menu.objects.bulk_create(
+            Menu(title=f"Pasta {i}", description="Fresh pasta with lemon and basil", category="Mains",
+                 price=f"{10 + i % 20}.99", inventory=i) for i in range(options.items)
+        )
+        Restaurant.objects.bulk_create(
+            Restaurant(branch=f"Branch {i}", address="1 Lemon Street", phone="1234567890",
+                       opening_time=time(10, 0), closing_time=time(22, 0)) for i in range(options.items)
+        )
+        Holiday.objects.bulk_create(
+            Holiday(holiday_date=date(2025, 1, 1) + timedelta(days=i), description="Closed") for i in range(options.items)
+        )
+        context = {"request": Request(APIRequestFactory().get("/api/menu")), "format": None}
+        repeat = [()] * options.repeat
+        rows = []
+        for serializer_class, model in ((MenuSerializer, Menu), (RestuarantSerializer, Restaurant), (HolidaySerializer, Holiday)):
+            reader = get_reader(serializer_class)
+            serializer = lambda: serializer_class(model.objects.all(), many=True, context=context).data
+            values = lambda: reader.serialize(model.objects.values(*reader.columns), context)
+            assert FastJSONRenderer().render(serializer()) == FastJSONRenderer().render(values())
+            name = model.__name__.lower()
+            rows += [
+                (f"{name} serializer per item", per_item(summarize(measure(serializer, repeat)), options.items)),
+                (f"{name} values reader per item", per_item(summarize(measure(values, repeat)), options.items)),
+            ]
+        print_table(f"Serialization cost per item of {options.items}-item pages (query included)", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
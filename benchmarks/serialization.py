@@ -0,0 +1,76 @@
+"""
+Microbenchmark of the JSON serialization cost per 100 menu items and bookings.
+
+For each model, times serializer.data (to_representation), rendering that list
+with DRF's stdlib JSONRenderer and with the orjson FastJSONRenderer, rendering
+raw values() rows (Decimal, date and time objects, which both hand to DRF's
+encoder so the output stays identical), and parsing
+the rendered body back with JSONParser and FastJSONParser.
+
+    python -m benchmarks.serialization --repeat 500
+"""
+import argparse
+from io import BytesIO
+
+from .common import setup_django, create_database, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    options = parser.parse_args()
+
+    setup_django()
+    from datetime import date, time, timedelta
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from Restaurant.models import Booking, CustomUser, Menu, Restaurant
+    from Restaurant.renderers import FastJSONParser, FastJSONRenderer, orjson
+    from Restaurant.serializers import BookingSerializer, MenuSerializer
+
+    if orjson is None:
+        print("orjson is not installed, FastJSONRenderer falls back to the stdlib encoder")
+
+    drop_database = create_database()
+    try:
+        user = CustomUser.objects.create_user(email="benchmark@example.com", password="Passkey@123")
+        Restaurant.objects.create(branch="Chennai", opening_time=time(10, 0), closing_time=time(22, 0))
+        Menu.objects.bulk_create(
+            Menu(title=f"Pasta {i}", description="Fresh pasta with lemon and basil", category="Mains",
+                 price=f"{10 + i % 20}.99", inventory=i) for i in range(100)
+        )
+        Booking.objects.bulk_create(
+            Booking(user=user, branch="Chennai", name=f"Guest {i}", phone="1234567890", no_of_guests=2,
+                    booking_date=date.today() + timedelta(days=i), start_time=time(11, 0), end_time=time(12, 0),
+                    message="Window seat, please", status=Booking.Status.BOOKED) for i in range(100)
+        )
+        context = {"request": Request(APIRequestFactory().get("/api/menu"))}
+        cases = {
+            "menu": (lambda: MenuSerializer(Menu.objects.all(), many=True, context=context).data, Menu.objects.values()),
+            "booking": (lambda: BookingSerializer(Booking.objects.all(), many=True, context=context).data, Booking.objects.values()),
+        }
+
+        repeat = [()] * options.repeat
+        rows = []
+        for name, (serialize, values) in cases.items():
+            data = serialize()
+            rows_raw = list(values)
+            body = JSONRenderer().render(data)
+            rows += [
+                (f"{name} serializer.data", summarize(measure(serialize, repeat))),
+                (f"{name} render stdlib", summarize(measure(lambda: JSONRenderer().render(data), repeat))),
+                (f"{name} render orjson", summarize(measure(lambda: FastJSONRenderer().render(data), repeat))),
+                (f"{name} values() stdlib", summarize(measure(lambda: JSONRenderer().render(rows_raw), repeat))),
+                (f"{name} values() orjson", summarize(measure(lambda: FastJSONRenderer().render(rows_raw), repeat))),
+                (f"{name} parse stdlib", summarize(measure(lambda: JSONParser().parse(BytesIO(body)), repeat))),
+                (f"{name} parse orjson", summarize(measure(lambda: FastJSONParser().parse(BytesIO(body)), repeat))),
+            ]
+        print_table("JSON cost per 100 rows", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark of authenticated page latency for each session engine.
+
+Logs a user in with every engine and requests the about page (never served
+from the page cache when logged in) and the working hours API the booking form
+fetches, reporting latency and the session queries per request. Uses the
+configured CACHE_URL (locmem:// by default, a Redis stand-in for the cache
+based engines).
+
+    python -m benchmarks.sessions --requests 2000
+"""
+import argparse
+from time import perf_counter
+
+from .common import setup_django, create_database, summarize, print_table
+
+ENGINES = ["db", "cached_db", "cache", "signed_cookies"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    options = parser.parse_args()
+
+    setup_django()
+    from datetime import time
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from Restaurant.models import CustomUser, Restaurant
+
+    drop_database = create_database()
+    try:
+        user = CustomUser.objects.create_user(email="benchmark@example.com", password="Passkey@123")
+        Restaurant.objects.create(branch="Chennai", opening_time=time(10, 0), closing_time=time(22, 0))
+        rows = []
+        for engine in options.engines:
+            with override_settings(SESSION_ENGINE=f"django.contrib.sessions.backends.{engine}"):
+                client = Client()
+                client.force_login(user)
+                for path in ("/about/", "/api/booking/working_hours?branch=Chennai"):
+                    client.get(path)  # Warm up
+                    samples = []
+                    with CaptureQueriesContext(connection) as queries:
+                        for _ in range(options.requests):
+                            started = perf_counter()
+                            client.get(path)
+                            samples.append(perf_counter() - started)
+                    session_queries = sum("django_session" in query["sql"] for query in queries) / options.requests
+                    label = path.split("?")[0].strip("/").rsplit("/", 1)[-1]
+                    rows.append((f"{engine} {label} ({session_queries:.1f} q)", summarize(samples)))
+        print_table("Authenticated request latency by session engine (session queries per request)", rows)
+    finally:
+        drop_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark of the worker classes under many simultaneous slow clients.
+
+For every configuration (NAME=WORKER_CLASS:WORKERS[:THREADS], as in load_test)
+gunicorn is started, --slow-clients connections are opened that send their
+request headers one byte every --trickle seconds, and while they are held open
+--requests normal requests go to the async endpoints (/health/, /menu/ and
+/api/booking/branches with a JWT). A sync or gthread worker is tied up by every
+slow connection it reads from, an ASGI (uvicorn) worker only parks a coroutine,
+which shows up as latency and timeouts of the normal requests.
+
+    python -m benchmarks.slow_clients --configs gthread=gthread:2:4 uvicorn=uvicorn:2 --slow-clients 200
+"""
+import argparse
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+from time import perf_counter, sleep
+
+from .common import summarize, print_table
+from .load_test import seed, start_server
+
+
+def trickle(port, count, interval, stop):
+    """Hold count connections open, each sending its request headers one byte per interval"""
+    sockets = []
+    for _ in range(count):
+        try:
+            sockets.append(socket.create_connection(("127.0.0.1", port), timeout=5))
+        except OSError:
+            break
+    for sock in sockets:
+        sock.sendall(b"GET /health/ HTTP/1.1\r\nHost: 127.0.0.1\r\n")
+    while not stop.wait(interval):
+        for sock in list(sockets):
+            try:
+                sock.sendall(b"X")
+            except OSError:
+                sockets.remove(sock)  # Timed out by the server
+    for sock in sockets:
+        sock.close()
+
+
+def run_requests(base_url, paths, total, concurrency, headers):
+    """Send total requests, return (seconds, latencies, errors)"""
+    import requests
+
+    def client(count):
+        session = requests.Session()
+        session.headers.update(headers)
+        latencies, errors = [], 0
+        for path in islice(cycle(paths), count):
+            started = perf_counter()
+            try:
+                if session.get(base_url + path, timeout=10).status_code >= 400:
+                    errors += 1
+            except requests.RequestException:
+                errors += 1
+            latencies.append(perf_counter() - started)
+        return latencies, errors
+
+    shares = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+    started = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(client, shares))
+    return perf_counter() - started, [x for latencies, _ in results for x in latencies], sum(e for _, e in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", nargs="+", default=["gthread=gthread:2:4", "uvicorn=uvicorn:2"])
+    parser.add_argument("--slow-clients", type=int, default=200)
+    parser.add_argument("--trickle", type=float, default=1.0, help="Seconds between the bytes of a slow client")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8766)
+    options = parser.parse_args()
+
+    seed()
+    from rest_framework_simplejwt.tokens import AccessToken
+    from Restaurant.models import CustomUser
+    user, _ = CustomUser.objects.get_or_create(email="benchmark@example.com")
+    headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+    paths = ["/health/", "/menu/", "/api/booking/branches"]
+    base_url = f"http://127.0.0.1:{options.port}"
+
+    rows, throughput = [], []
+    for config in options.configs:
+        name, _, spec = config.partition("=")
+        worker_class, workers, threads = (spec.split(":") + ["1"])[:3]
+        process = start_server(worker_class, int(workers), int(threads), options.port)
+        stop = threading.Event()
+        slow = threading.Thread(target=trickle, args=(options.port, options.slow_clients, options.trickle, stop))
+        try:
+            slow.start()
+            sleep(1)  # Let the slow clients connect first
+            elapsed, latencies, errors = run_requests(base_url, paths, options.requests, options.concurrency, headers)
+        finally:
+            stop.set()
+            slow.join()
+            process.terminate()
+            process.wait()
+        rows.append((name, summarize(latencies)))
+        throughput.append((name, options.requests / elapsed, errors))
+
+    print_table(f"Latency with {options.slow_clients} slow clients connected", rows)
+    print(f"\n{'case':<40}{'req/s':>12}{'errors':>10}")
+    for name, rate, errors in throughput:
+        print(f"{name:<40}{rate:>12.0f}{errors:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark of container start time: from process start until /health/ answers.
+
+Replays the start of a container on the benchmark database, already migrated
+(the restart and scale-out case) with the old and the new entrypoint steps,
+each a `python manage.py` process, then starts gunicorn and polls /health/:
+
+- "old": makemigrations, migrate, collectstatic into an empty directory and the
+  superuser `manage.py shell` script
+- "new": migrate_if_pending and ensure_superuser (MIGRATE_ON_START=True)
+- "app": gunicorn only, as started behind the migrate service of docker-compose.yml
+
+Reports the time of every step and the time to healthy of each pipeline.
+
+    python -m benchmarks.startup --runs 3
+    python -m benchmarks.startup --command "docker compose up -d web" --url http://127.0.0.1:8000/health/
+"""
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter, sleep
+
+from .common import ROOT, setup_django
+
+SUPERUSER_SCRIPT = """
+from django.contrib.auth import get_user_model
+User = get_user_model()
+if not User.objects.filter(email="admin@django.com").exists():
+    User.objects.create_superuser(email="admin@django.com", password="admin")
+"""
+
+PIPELINES = {
+    "old": [["makemigrations", "--noinput"], ["migrate", "--noinput"], ["collectstatic", "--noinput"], ["shell"]],
+    "new": [["migrate_if_pending"], ["ensure_superuser"]],
+    "app": [],
+}
+
+
+def wait_healthy(url, process=None, timeout=60):
+    """Poll url until it answers 200, return the seconds waited"""
+    import requests
+    started = perf_counter()
+    while perf_counter() - started < timeout:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return perf_counter() - started
+        except requests.ConnectionError:
+            pass
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}")
+        sleep(0.02)
+    raise RuntimeError(f"{url} not healthy after {timeout} s")
+
+
+def start_pipeline(steps, env, port):
+    """Run the manage.py steps then gunicorn, return ({step: seconds}, seconds to healthy)"""
+    timings = {}
+    started = perf_counter()
+    for step in steps:
+        step_started = perf_counter()
+        subprocess.run([sys.executable, "manage.py", *step], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL,
+                       input=SUPERUSER_SCRIPT if step == ["shell"] else None, text=True)
+        timings[step[0]] = perf_counter() - step_started
+    gunicorn_started = perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], cwd=ROOT, env=env)
+    try:
+        wait_healthy(f"http://127.0.0.1:{port}/health/", process)
+        timings["gunicorn"] = perf_counter() - gunicorn_started
+        return timings, perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--pipelines", nargs="+", default=list(PIPELINES), choices=list(PIPELINES))
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--command", help="Time this command (e.g. starting a container) until --url answers instead")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/health/")
+    options = parser.parse_args()
+
+    if options.command:
+        for run in range(options.runs):
+            started = perf_counter()
+            subprocess.run(shlex.split(options.command), check=True)
+            print(f"run {run + 1}: healthy after {wait_healthy(options.url) + perf_counter() - started:.2f} s", flush=True)
+        return
+
+    setup_django()
+    from django.core.management import call_command
+    from django.db import connection
+    call_command("migrate", verbosity=0, interactive=False)  # The benchmark database, shared with the processes below
+    connection.close()  # SQLite: let the server processes write
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings collecting the static files into tmp instead of the repository's staticfiles/
+        Path(tmp, "startup_settings.py").write_text(
+            f"from Littlelemon.settings import *  # noqa\nSTATIC_ROOT = {str(Path(tmp, 'static'))!r}\n")
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="startup_settings", PYTHONPATH=os.pathsep.join([tmp, str(ROOT)]),
+                   GUNICORN_BIND=f"127.0.0.1:{options.port}", GUNICORN_WORKERS=str(options.workers),
+                   GUNICORN_LOG_LEVEL="warning")
+        results = {name: [] for name in options.pipelines}
+        for run in range(options.runs):
+            for name in options.pipelines:
+                shutil.rmtree(Path(tmp, "static"), ignore_errors=True)  # A fresh container has nothing collected
+                timings, total = start_pipeline(PIPELINES[name], env, options.port)
+                results[name].append(total)
+                steps = "  ".join(f"{step} {seconds:.2f}" for step, seconds in timings.items())
+                print(f"run {run + 1} {name:<4} healthy after {total:.2f} s  ({steps})", flush=True)
+    print("\nTime to healthy (s)")
+    for name, totals in results.items():
+        print(f"{name:<6} min {min(totals):.2f}  mean {sum(totals) / len(totals):.2f}  max {max(totals):.2f}")
+
+
+if __name__ == "__main__":
+    main()
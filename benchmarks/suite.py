@@ -0,0 +1,325 @@
+"""
+Benchmark suite of the booking, menu and authentication hot paths.
+
+Seeds the configured database (benchmarks/.output/benchmark.sqlite3 by default,
+or the PostgreSQL database of the DATABASE_* environment variables) with synthetic
+branches, menu items, users and bookings, then measures throughput and latency
+percentiles of each scenario through Django's test client in this process and
+through real Gunicorn servers:
+
+    booking_create   POST /api/booking (JWT, a new slot per request)
+    menu_api         GET /api/menu
+    menu_page        GET /menu/
+    working_hours    GET /api/booking/working_hours (JWT)
+    login            POST /login/ (session login form)
+    token_obtain     POST /api/token/
+
+Results are written as JSON (benchmarks/.output/benchmark-results.json by default,
+with the commit, database and seed sizes) so two runs can be compared; `compare`
+exits with status 1 when a scenario's p95 latency rose, or its throughput fell,
+by more than the allowed percentage.
+
+    python -m benchmarks.suite run --gunicorn gthread:3:4 --output before.json
+    python -m benchmarks.suite run --gunicorn gthread:3:4 --output after.json
+    python -m benchmarks.suite compare before.json after.json --max-regression 10 --threshold login=25
+
+A database that already holds data is only reseeded with --reset, which flushes it.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import count
+from time import perf_counter
+
+from .common import OUTPUT_DIR, ROOT, setup_django, summarize
+
+SCENARIOS = ["booking_create", "menu_api", "menu_page", "working_hours", "login", "token_obtain"]
+PASSWORD = "Passkey@123"
+SLOTS = [time(hour, minute) for hour in range(10, 21) for minute in (0, 30)]  # Start times, 30 minute bookings
+
+
+class Seed:
+    """The synthetic data the scenarios use: branch names, user emails and their JWT access tokens"""
+
+    def __init__(self, branches, emails, tokens):
+        self.branches = branches
+        self.emails = emails
+        self.tokens = tokens
+        self.bookings = count()  # Shared by every run, so each booking takes a free slot
+
+
+def seed(branches, menu_items, users, bookings, reset=False, random_seed=42):
+    """Migrate the benchmark database, fill it with synthetic data and return its Seed"""
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from Restaurant.models import Booking, CustomUser, Menu, Restaurant
+
+    call_command("migrate", verbosity=0, interactive=False)
+    if Menu.objects.exists() or CustomUser.objects.exists():
+        if not reset:
+            raise SystemExit("The benchmark database is not empty, pass --reset to flush it")
+        call_command("flush", verbosity=0, interactive=False)
+
+    rng = random.Random(random_seed)
+    Restaurant.objects.bulk_create(
+        Restaurant(branch=f"Branch {i}", phone="1234567890", no_of_tables=50,
+                   opening_time=time(10, 0), closing_time=time(22, 0)) for i in range(branches)
+    )
+    Menu.objects.bulk_create(
+        Menu(title=f"Dish {i}", description="Slow cooked with lemon and herbs", category=rng.choice(["Starters", "Mains", "Desserts"]),
+             price=f"{rng.randint(5, 40)}.99", inventory=rng.randint(0, 100)) for i in range(menu_items)
+    )
+    password = make_password(PASSWORD)  # Hashed once, every user shares it
+    CustomUser.objects.bulk_create(
+        CustomUser(email=f"user{i}@example.com", password=password) for i in range(users)
+    )
+    user_list = list(CustomUser.objects.order_by("pk"))
+    today = date.today()
+    Booking.objects.bulk_create(
+        Booking(user=rng.choice(user_list), branch=f"Branch {rng.randrange(branches)}", name="Guest", phone="1234567890",
+                no_of_guests=rng.randint(1, 6), booking_date=today + timedelta(days=rng.randint(-30, 60)),
+                start_time=(start := rng.choice(SLOTS)), end_time=(datetime.combine(today, start) + timedelta(minutes=30)).time(),
+                status=Booking.Status.BOOKED) for _ in range(bookings)
+    )
+    return Seed(
+        [f"Branch {i}" for i in range(branches)],
+        [user.email for user in user_list],
+        [str(RefreshToken.for_user(user).access_token) for user in user_list],
+    )
+
+
+def make_scenarios(data):
+    """Return {name: request(transport, index) -> status code} for the seeded data"""
+    def bearer(index):
+        return {"Authorization": f"Bearer {data.tokens[index % len(data.tokens)]}"}
+
+    def booking_create(transport, index):
+        number = next(data.bookings)
+        branch = data.branches[number % len(data.branches)]
+        start = SLOTS[number // len(data.branches) % len(SLOTS)]
+        booking_date = date.today() + timedelta(days=100 + number // (len(data.branches) * len(SLOTS)))
+        return transport.request("POST", "/api/booking", {
+            "branch": branch, "name": "Guest", "phone": "1234567890", "no_of_guests": 2,
+            "booking_date": booking_date.isoformat(), "start_time": start.isoformat(),
+            "end_time": (datetime.combine(booking_date, start) + timedelta(minutes=30)).time().isoformat(),
+        }, headers=bearer(number))
+
+    def working_hours(transport, index):
+        branch = data.branches[index % len(data.branches)]
+        return transport.request("GET", f"/api/booking/working_hours?branch={branch.replace(' ', '+')}", headers=bearer(index))
+
+    def login(transport, index):
+        email = data.emails[index % len(data.emails)]
+        transport.forget_session()  # Every login is a visitor signing in, not a signed-in user again
+        return transport.form("/login/", {"email": email, "password": PASSWORD})
+
+    def token_obtain(transport, index):
+        email = data.emails[index % len(data.emails)]
+        return transport.request("POST", "/api/token/", {"email": email, "password": PASSWORD})
+
+    return {
+        "booking_create": booking_create,
+        "menu_api": lambda transport, index: transport.request("GET", "/api/menu"),
+        "menu_page": lambda transport, index: transport.request("GET", "/menu/"),
+        "working_hours": working_hours,
+        "login": login,
+        "token_obtain": token_obtain,
+    }
+
+
+class ClientTransport:
+    """Requests through Django's test client, in this process"""
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def request(self, method, path, body=None, headers=None):
+        if body is None:
+            return self.client.generic(method, path, headers=headers).status_code
+        return self.client.generic(method, path, json.dumps(body), "application/json", headers=headers).status_code
+
+    def form(self, path, data):
+        return self.client.post(path, data).status_code
+
+    def forget_session(self):
+        from django.conf import settings
+        self.client.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+
+
+class HTTPTransport:
+    """Requests over a keep-alive HTTP connection to a running server"""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def request(self, method, path, body=None, headers=None):
+        return self.session.request(method, self.base_url + path, json=body, headers=headers, timeout=30).status_code
+
+    def form(self, path, data):
+        if "csrftoken" not in self.session.cookies:
+            self.session.get(self.base_url + path, timeout=30)
+        token = self.session.cookies["csrftoken"]
+        return self.session.post(self.base_url + path, data=dict(data, csrfmiddlewaretoken=token),
+                                 headers={"X-CSRFToken": token, "Referer": self.base_url + path},
+                                 allow_redirects=False, timeout=30).status_code
+
+    def forget_session(self):
+        from django.conf import settings
+        self.session.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+
+
+def run_scenario(request, transports, total, warmup):
+    """Send total requests spread over the transports (one thread each), return the result summary"""
+    indexes = count()
+
+    def client(transport, share):
+        latencies, errors = [], 0
+        for _ in range(share):
+            index = next(indexes)
+            started = perf_counter()
+            try:
+                status = request(transport, index)
+            except Exception:
+                status = 599
+            latencies.append(perf_counter() - started)
+            errors += status >= 400
+        return latencies, errors
+
+    for index in range(warmup):
+        request(transports[0], index)
+    shares = [total // len(transports) + (i < total % len(transports)) for i in range(len(transports))]
+    started = perf_counter()
+    if len(transports) == 1:
+        results = [client(transports[0], total)]
+    else:
+        with ThreadPoolExecutor(len(transports)) as executor:
+            results = list(executor.map(client, transports, shares))
+    elapsed = perf_counter() - started
+    latencies = [latency for result, _ in results for latency in result]
+    return dict(summarize(latencies), throughput_rps=round(total / elapsed, 1), errors=sum(errors for _, errors in results))
+
+
+def run(options):
+    setup_django()
+    import django
+    from django.db import connection
+    from .load_test import start_server
+
+    data = seed(options.branches, options.menu_items, options.users, options.bookings, options.reset)
+    scenarios = make_scenarios(data)
+    selected = options.scenarios
+    results = {}
+
+    def measure_backend(name, make_transport, concurrency):
+        results[name] = {}
+        for scenario in selected:
+            transports = [make_transport() for _ in range(concurrency)]
+            results[name][scenario] = run_scenario(scenarios[scenario], transports, options.requests, options.warmup)
+            result = results[name][scenario]
+            print(f"{name:<28}{scenario:<18}p50 {result['p50_us']:>10} us  p95 {result['p95_us']:>10} us  "
+                  f"{result['throughput_rps']:>8} req/s  {result['errors']} errors", flush=True)
+
+    if not options.no_client:
+        measure_backend("client", ClientTransport, 1)
+    for spec in options.gunicorn:
+        worker_class, workers, threads = (spec.split(":") + ["1", "1"])[:3]
+        connection.close()  # SQLite: let the server processes write
+        process = start_server(worker_class, int(workers), int(threads), options.port)
+        try:
+            base_url = f"http://127.0.0.1:{options.port}"
+            measure_backend(f"gunicorn:{spec}", lambda: HTTPTransport(base_url), options.concurrency)
+        finally:
+            process.terminate()
+            process.wait()
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    report = {
+        "meta": {
+            "commit": commit,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "seed": {"branches": options.branches, "menu_items": options.menu_items, "users": options.users, "bookings": options.bookings},
+            "requests": options.requests,
+            "concurrency": options.concurrency,
+        },
+        "results": results,
+    }
+    with open(options.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"\nResults written to {options.output}")
+
+
+def compare(options):
+    """Print the change of every scenario in both reports, return 1 if any regressed beyond its threshold"""
+    with open(options.baseline) as baseline_file, open(options.current) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+    thresholds = dict(item.split("=", 1) for item in options.threshold)
+    print(f"{baseline['meta']['commit']} -> {current['meta']['commit']}")
+    print(f"{'backend':<28}{'scenario':<18}{'p95 us':>12}{'change':>10}{'req/s':>10}{'change':>10}")
+    regressions = []
+    for backend, scenarios in current["results"].items():
+        for scenario, result in scenarios.items():
+            before = baseline["results"].get(backend, {}).get(scenario)
+            if before is None:
+                continue
+            allowed = float(thresholds.get(scenario, options.max_regression))
+            latency_change = (result["p95_us"] - before["p95_us"]) / before["p95_us"] * 100 if before["p95_us"] else 0.0
+            throughput_change = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100 if before["throughput_rps"] else 0.0
+            regressed = latency_change > allowed or -throughput_change > allowed or result["errors"] > before["errors"]
+            if regressed:
+                regressions.append(f"{backend} {scenario}")
+            print(f"{backend:<28}{scenario:<18}{result['p95_us']:>12.1f}{latency_change:>+9.1f}%{result['throughput_rps']:>10}"
+                  f"{throughput_change:>+9.1f}%{'  REGRESSION' if regressed else ''}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed the database and measure the scenarios")
+    run_parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    run_parser.add_argument("--no-client", action="store_true", help="skip the in-process test client run")
+    run_parser.add_argument("--gunicorn", nargs="*", default=[], metavar="CLASS:WORKERS[:THREADS]",
+                            help="Gunicorn configurations to start and load, e.g. gthread:3:4 sync:3")
+    run_parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario and backend")
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--concurrency", type=int, default=16, help="client threads against Gunicorn")
+    run_parser.add_argument("--port", type=int, default=8766)
+    run_parser.add_argument("--branches", type=int, default=5)
+    run_parser.add_argument("--menu-items", type=int, default=200)
+    run_parser.add_argument("--users", type=int, default=200)
+    run_parser.add_argument("--bookings", type=int, default=2000)
+    run_parser.add_argument("--reset", action="store_true", help="flush a benchmark database that already holds data")
+    run_parser.add_argument("--output", default=str(OUTPUT_DIR / "benchmark-results.json"))
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--max-regression", type=float, default=10.0, help="allowed p95/throughput change in percent")
+    compare_parser.add_argument("--threshold", nargs="*", default=[], metavar="SCENARIO=PERCENT",
+                                help="per-scenario allowed change, e.g. login=25")
+
+    options = parser.parse_args()
+    if options.command == "run":
+        run(options)
+    else:
+        sys.exit(compare(options))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,18 @@
 #!/usr/bin/env bash
 set -e  # Exit on any error
 
-echo "Running Django migrations..."
-python manage.py makemigrations --noinput
-python manage.py migrate --noinput
+# Static files and bytecode are built into the image (see the Dockerfile) and the migrations are committed, so
+# a start only boots Django for the steps below. In docker-compose.yml the one-shot "migrate" service runs them
+# before the app starts and sets MIGRATE_ON_START=False here; a container run on its own runs them itself.
+# migrate_if_pending only waits for the migration lock when migrations are pending, so replicas don't race.
+if [ "${MIGRATE_ON_START:-True}" = "True" ]; then
+    echo "Applying pending migrations..."
+    python manage.py migrate_if_pending
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
-
-echo "Creating superuser..."
-python manage.py shell << EOF
-from django.contrib.auth import get_user_model
-User = get_user_model()
-email = "admin@django.com"
-password = "admin"
-if not User.objects.filter(email=email).exists():
-    User.objects.create_superuser(email=email, password=password)
-EOF
+    echo "Creating superuser..."
+    python manage.py ensure_superuser
+fi
 
 echo "Starting Gunicorn..."
-exec gunicorn Littlelemon.wsgi:application --bind 0.0.0.0:8000 --workers 3
+# Worker class, count, threads and timeouts come from GUNICORN_* variables, see gunicorn.conf.py
+exec gunicorn -c gunicorn.conf.py
@@ -0,0 +1,71 @@
+"""
+Gunicorn configuration, read by `gunicorn -c gunicorn.conf.py` (see entrypoint.prod.sh).
+
+Every setting can be overridden with a GUNICORN_* environment variable:
+
+    GUNICORN_WORKER_CLASS   gthread (default), sync or uvicorn (ASGI, Littlelemon.asgi)
+    GUNICORN_WORKERS        Worker processes, 0 (default) sizes them from the CPU count
+    GUNICORN_THREADS        Threads per gthread worker, so a slow Mailgun call or database wait
+                            blocks one thread instead of a whole worker
+    GUNICORN_MAX_REQUESTS   Requests after which a worker is recycled (plus up to
+                            GUNICORN_MAX_REQUESTS_JITTER, so workers don't restart together)
+
+The app is preloaded in the master so workers share its memory copy-on-write.
+With GUNICORN_TIMING_LOG=True every request is logged with its duration; gunicorn runs
+these hooks for the sync and gthread workers only, uvicorn workers log through uvicorn.
+"""
+import multiprocessing
+import os
+from time import perf_counter
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+
+def default_workers(worker_class, cpus=None):
+    """(2 x cores) + 1 for blocking sync workers, cores + 1 when each worker handles requests concurrently"""
+    cpus = cpus or multiprocessing.cpu_count()
+    return 2 * cpus + 1 if worker_class == "sync" else cpus + 1
+
+
+_worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+wsgi_app = "Littlelemon.asgi:application" if _worker_class == "uvicorn" else "Littlelemon.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = WORKER_CLASSES.get(_worker_class, _worker_class)
+workers = int(os.getenv("GUNICORN_WORKERS", 0)) or default_workers(_worker_class)
+threads = int(os.getenv("GUNICORN_THREADS", 4)) if _worker_class == "gthread" else 1
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))  # Caddy keeps connections to the app open
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+preload_app = (os.getenv("GUNICORN_PRELOAD", "True") == "True")
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None  # "-" logs to stdout
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+timing_log = (os.getenv("GUNICORN_TIMING_LOG") == "True")
+
+
+def pre_fork(server, worker):
+    """Don't hand database connections or pools opened in the master while preloading to the workers"""
+    if server.cfg.preload_app:
+        from django.db import connections
+        for connection in connections.all(initialized_only=True):
+            connection.close()
+            if hasattr(connection, "close_pool"):
+                connection.close_pool()  # Each worker opens its own pool
+
+
+def pre_request(worker, req):
+    req.started_at = perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    if timing_log:
+        elapsed = (perf_counter() - req.started_at) * 1000
+        worker.log.info("%s %s %s %.1fms", req.method, req.path, resp.status_code, elapsed)
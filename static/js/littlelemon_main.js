@@ -76,6 +76,7 @@ document.addEventListener("DOMContentLoaded", function () {
                 selectedStartTime = selectedDates[0];
                 document.getElementById("start_time").value = `${pad(selectedStartTime.getHours())}:${pad(selectedStartTime.getMinutes())}`;
                 updateEndTime();
+                checkSelectedSlot();
             }
         }
     });
@@ -99,6 +100,7 @@ document.addEventListener("DOMContentLoaded", function () {
             btn.classList.add("active");
             updateEndTime();
             updateTimePickerLimits();
+            fetchAvailability();
         });
     });
 
@@ -118,13 +120,46 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // Free tables per start slot ("HH:MM" -> count) for the selected branch, date and duration
+    let slotAvailability = {};
+
+    async function fetchAvailability() {
+        if (!bookingDateInput.value) return;
+        try {
+            const params = new URLSearchParams({
+                branch: branchSelect?.value || branch,
+                date: bookingDateInput.value,
+                duration: selectedDuration,
+            });
+            // The response carries an ETag, so the browser revalidates and unchanged grids come back as 304s
+            const response = await fetch(`/api/booking/availability?${params}`);
+            if (!response.ok) throw new Error("API Error");
+            const data = await response.json();
+            slotAvailability = Object.fromEntries(data.slots.map(slot => [slot.start_time, slot.available_tables]));
+        } catch (err) {
+            console.warn("Failed to fetch availability.", err);
+            slotAvailability = {};
+        } finally {
+            checkSelectedSlot();
+        }
+    }
+
+    function checkSelectedSlot() {
+        const startTime = document.getElementById("start_time").value;
+        const isFull = Boolean(startTime) && slotAvailability[startTime] === 0;
+        startTimeDisplay.setCustomValidity(isFull ? "This time slot is fully booked. Please choose another time." : "");
+        if (isFull) startTimeDisplay.reportValidity();
+    }
+
     // Trigger fetch on page load and branch change
     fetchWorkingHours();
     branchSelect?.addEventListener("change", () => {
         openingTime = defaultWorkingHours.opening_time;
         closingTime = defaultWorkingHours.closing_time;
         fetchWorkingHours();
+        fetchAvailability();
     });
+    bookingDateInput.addEventListener("change", fetchAvailability);
 
     // Handle booking form submission
     bookingForm?.addEventListener("submit", async function (e) {
@@ -155,6 +190,7 @@ document.addEventListener("DOMContentLoaded", function () {
                 endTimeDisplay.value = "";
                 durationButtons.forEach(b => b.classList.remove("active"));
                 fetchBookings();
+                fetchAvailability();
             } else {
                 alert("Booking failed: " + (result.error || "Please try again."));
             }
@@ -164,41 +200,35 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     });
 
-    // Booking list with search and pagination
-    let currentPage = 1;
-    const pageSize = 5;
-    let allBookings = [];
+    // Booking list: search, sorting and pagination happen on the server, one page per request
+    const bookingListUrl = "/api/booking?pagination=cursor&ordering=-booking_date";
+    let bookingsController = null;
 
-    async function fetchBookings(page = 1) {
+    async function fetchBookings(url = null) {
+        if (!url) {
+            const keyword = searchInput?.value.trim() || "";
+            url = keyword ? `${bookingListUrl}&search=${encodeURIComponent(keyword)}` : bookingListUrl;
+        }
+        // Drop the response of a search the user has already typed past
+        bookingsController?.abort();
+        bookingsController = new AbortController();
         try {
-            const res = await fetch("/api/booking");
+            const res = await fetch(url, { signal: bookingsController.signal });
             if (!res.ok) throw new Error("Failed to fetch bookings.");
             const data = await res.json();
-            allBookings = data.results || [];
-            currentPage = page;
-            renderBookings();
+            renderBookings(data.results || []);
+            renderPagination(data.previous, data.next);
         } catch (err) {
+            if (err.name === "AbortError") return;
             console.error("Fetch bookings failed:", err);
             bookingContainer.innerHTML = `<p class="text-danger">Error loading bookings. Please sign in and Try Again</p>`;
         }
     }
 
-    function renderBookings() {
-        const keyword = searchInput.value.trim().toLowerCase();
-        allBookings.sort((a, b) => new Date(b.booking_date) - new Date(a.booking_date));
-        const filtered = allBookings.filter(b =>
-            b.name?.toLowerCase().includes(keyword) ||
-            b.email?.toLowerCase().includes(keyword) ||
-            b.phone?.includes(keyword)
-        );
-
-        const totalPages = Math.ceil(filtered.length / pageSize);
-        const start = (currentPage - 1) * pageSize;
-        const paginated = filtered.slice(start, start + pageSize);
-
-        bookingContainer.innerHTML = paginated.length === 0
+    function renderBookings(bookings) {
+        bookingContainer.innerHTML = bookings.length === 0
             ? `<p>No bookings found.</p>`
-            : paginated.map(b => {
+            : bookings.map(b => {
                 if (!b.booking_date?.includes("-")) return "";
                 const [yyyy, mm, dd] = b.booking_date.split("-");
                 const statusClass = b.status.toLowerCase();
@@ -220,31 +250,28 @@ document.addEventListener("DOMContentLoaded", function () {
                     </div>
                 `;
             }).join("");
-
-        renderPagination(totalPages);
     }
 
-    function renderPagination(totalPages) {
+    function renderPagination(previousUrl, nextUrl) {
         pagination.innerHTML = "";
-        if (totalPages <= 1) return;
+        if (!previousUrl && !nextUrl) return;
 
-        for (let i = 1; i <= totalPages; i++) {
+        [["Previous", previousUrl], ["Next", nextUrl]].forEach(([label, url]) => {
             const li = document.createElement("li");
-            li.className = `page-item ${i === currentPage ? "active" : ""}`;
-            li.innerHTML = `<a class="page-link" href="#">${i}</a>`;
+            li.className = `page-item ${url ? "" : "disabled"}`;
+            li.innerHTML = `<a class="page-link" href="#">${label}</a>`;
             li.addEventListener("click", e => {
                 e.preventDefault();
-                currentPage = i;
-                renderBookings();
+                if (url) fetchBookings(url);
             });
             pagination.appendChild(li);
-        }
+        });
     }
 
     let searchTimeout = null;
     searchInput?.addEventListener("input", () => {
         clearTimeout(searchTimeout);
-        searchTimeout = setTimeout(() => fetchBookings(1), 300);
+        searchTimeout = setTimeout(() => fetchBookings(), 300);
     });
 
     fetchBookings();